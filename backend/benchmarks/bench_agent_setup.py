@@ -0,0 +1,78 @@
+"""
+Benchmark: per-request agent setup cost, rebuilt graph vs. cached role registry.
+
+Uses a stub LLM (no network) whose bind_tools() does the same tool-schema
+conversion a real chat model does, so only graph construction is measured.
+
+Run from the backend directory (needs a generated Prisma client, no database):
+    python -m benchmarks.bench_agent_setup --iterations 200
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-dummy-key")
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.agents import role_based_agent
+
+
+class StubLLM:
+    """Minimal chat model stand-in: converts tool schemas, answers instantly."""
+
+    def bind_tools(self, tools):
+        schemas = [convert_to_openai_tool(t) for t in tools]
+        return RunnableLambda(lambda messages: AIMessage(content=f"ok ({len(schemas)} tools)"))
+
+
+def _time(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"  {label:<22} mean={statistics.mean(samples):8.3f} ms  p95={p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    role_based_agent.llm = StubLLM()
+    role_based_agent.clear_agent_registry()
+
+    for role in role_based_agent.ROLE_TOOLS:
+        print(f"\n{role} ({len(role_based_agent.ROLE_TOOLS[role])} tools), {args.iterations} requests")
+
+        before = _time(
+            lambda: role_based_agent.create_role_based_agent(role, "bench-user", use_checkpointer=True),
+            args.iterations,
+        )
+        role_based_agent.get_role_agent(role)  # one-off build at first use / startup
+        after = _time(
+            lambda: (
+                role_based_agent.get_role_agent(role),
+                role_based_agent.build_agent_config("bench-thread", "bench-user", role),
+            ),
+            args.iterations,
+        )
+
+        _report("rebuild per request", before)
+        _report("cached registry", after)
+        print(f"  speedup: {statistics.mean(before) / max(statistics.mean(after), 1e-9):,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: attendance list reads, fields=full (Prisma includes) vs fields=compact (one projected query).
+
+Uses existing data: the courses and students with the most attendance rows
+are read through AttendanceService in both views, and the time per call and
+the size of the JSON the API would send are reported.
+
+Run from the backend directory against a seeded database (DATABASE_URL):
+    python -m benchmarks.bench_attendance_fields --runs 10 --top 3
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from prisma import Prisma
+
+from src.models.schemas import StudentAttendanceCompact, StudentAttendanceRead
+from src.services.attendance_service import AttendanceService
+
+MODELS = {"compact": StudentAttendanceCompact, "full": StudentAttendanceRead}
+
+
+async def _measure(runs: int, read, fields: str):
+    start = time.perf_counter()
+    for _ in range(runs):
+        records = await read(fields)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+    payload = json.dumps(jsonable_encoder([MODELS[fields].model_validate(r) for r in records]))
+    return len(records), elapsed_ms, len(payload)
+
+
+async def _compare(label: str, runs: int, read):
+    rows, full_ms, full_bytes = await _measure(runs, read, "full")
+    _, compact_ms, compact_bytes = await _measure(runs, read, "compact")
+    print(
+        f"  {label:<24} {rows:6d} rows   full={full_ms:8.1f} ms {full_bytes / 1024:8.1f} KiB   "
+        f"compact={compact_ms:8.1f} ms {compact_bytes / 1024:8.1f} KiB   "
+        f"({full_ms / compact_ms:4.1f}x faster, {full_bytes / max(compact_bytes, 1):4.1f}x smaller)"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=3, help="Number of courses and students to read")
+    args = parser.parse_args()
+
+    db = Prisma()
+    await db.connect()
+    try:
+        courses = await db.query_raw(
+            'SELECT "courseId" AS "id", COUNT(*)::int AS "n" FROM "StudentAttendance" '
+            'GROUP BY "courseId" ORDER BY "n" DESC LIMIT $1',
+            args.top
+        )
+        students = await db.query_raw(
+            'SELECT "studentId" AS "id", COUNT(*)::int AS "n" FROM "StudentAttendance" '
+            'GROUP BY "studentId" ORDER BY "n" DESC LIMIT $1',
+            args.top
+        )
+
+        print("\nCourse attendance")
+        for course in courses:
+            await _compare(
+                f"course {course['id'][:12]}", args.runs,
+                lambda fields, c=course: AttendanceService.get_course_attendance(c['id'], None, db, fields)
+            )
+        print("\nStudent attendance")
+        for student in students:
+            await _compare(
+                f"student {student['id'][:12]}", args.runs,
+                lambda fields, s=student: AttendanceService.get_student_attendance(s['id'], None, db, fields)
+            )
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""
+Benchmark: bulk student attendance marking, per-record loop vs. batched insert.
+
+For each class size a throwaway department, teacher, course and students are
+created, then one session is marked by calling mark_attendance once per
+student (the old bulk path) and another by AttendanceService.bulk_mark_attendance.
+All fixture rows are deleted afterwards.
+
+Run from the backend directory against a migrated database (DATABASE_URL):
+    python -m benchmarks.bench_bulk_attendance --sizes 50 200 1000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+from prisma import Prisma
+
+from src.models.schemas import StudentAttendanceCreate
+from src.services.attendance_service import AttendanceService
+
+STATUSES = ["PRESENT", "PRESENT", "PRESENT", "LATE", "ABSENT"]
+
+
+async def _create_fixture(db: Prisma, size: int, tag: str):
+    department = await db.department.create(data={"code": f"BENCH-{tag}", "name": f"Bench {tag}"})
+    teacher_user = await db.user.create(
+        data={"email": f"bench-teacher-{tag}@example.com", "password": "x", "role": "TEACHER", "name": "Bench Teacher"}
+    )
+    teacher = await db.teacher.create(
+        data={
+            "userId": teacher_user.id,
+            "teacherId": f"BT-{tag}",
+            "department": department.code,
+            "designation": "Lecturer",
+        }
+    )
+    course = await db.course.create(
+        data={
+            "courseCode": f"BN{tag}",
+            "courseName": "Bench Course",
+            "credits": 3,
+            "semester": 1,
+            "departmentId": department.id,
+            "teacherId": teacher.id,
+        }
+    )
+    await db.user.create_many(
+        data=[
+            {"email": f"bench-{tag}-{i}@example.com", "password": "x", "role": "STUDENT", "name": f"Bench {i}"}
+            for i in range(size)
+        ]
+    )
+    users = await db.user.find_many(where={"email": {"startswith": f"bench-{tag}-"}})
+    await db.student.create_many(
+        data=[
+            {"userId": u.id, "studentId": f"BS-{tag}-{i}", "department": department.code, "semester": 1, "batch": "bench"}
+            for i, u in enumerate(users)
+        ]
+    )
+    students = await db.student.find_many(where={"studentId": {"startswith": f"BS-{tag}-"}})
+    return department, teacher, course, students
+
+
+async def _cleanup(db: Prisma, tag: str, department, course):
+    await db.course.delete(where={"id": course.id})
+    await db.user.delete_many(where={"email": {"startswith": f"bench-{tag}-"}})
+    await db.user.delete_many(where={"email": f"bench-teacher-{tag}@example.com"})
+    await db.department.delete(where={"id": department.id})
+
+
+async def _session(db: Prisma, course, teacher, start_time: str):
+    return await db.classsession.create(
+        data={
+            "courseId": course.id,
+            "teacherId": teacher.id,
+            "date": datetime(2000, 1, 1),
+            "startTime": start_time,
+            "endTime": "23:59",
+            "status": "CONDUCTED",
+        }
+    )
+
+
+def _attendance(session, students):
+    return [
+        StudentAttendanceCreate(sessionId=session.id, studentId=s.id, status=STATUSES[i % len(STATUSES)])
+        for i, s in enumerate(students)
+    ]
+
+
+async def _run(db: Prisma, size: int):
+    tag = uuid.uuid4().hex[:8]
+    department, teacher, course, students = await _create_fixture(db, size, tag)
+    try:
+        loop_session = await _session(db, course, teacher, "08:00")
+        start = time.perf_counter()
+        for attendance in _attendance(loop_session, students):
+            await AttendanceService.mark_attendance(attendance, teacher.id, db)
+        loop_ms = (time.perf_counter() - start) * 1000
+
+        bulk_session = await _session(db, course, teacher, "09:00")
+        start = time.perf_counter()
+        records = await AttendanceService.bulk_mark_attendance(_attendance(bulk_session, students), teacher.id, db)
+        bulk_ms = (time.perf_counter() - start) * 1000
+        assert len(records) == size
+    finally:
+        await _cleanup(db, tag, department, course)
+
+    print(
+        f"  {size:5d} students   per-record={loop_ms:9.1f} ms   bulk={bulk_ms:8.1f} ms   "
+        f"speedup={loop_ms / bulk_ms:5.1f}x"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    args = parser.parse_args()
+
+    db = Prisma()
+    await db.connect()
+    try:
+        print("\nBulk attendance marking")
+        for size in args.sizes:
+            await _run(db, size)
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,399 @@
+"""
+Check: attendance summary counters stay equal to a recount of the raw rows.
+
+A throwaway department, admin, two teachers, two courses and a few students
+are created. Attendance is then marked, corrected, upserted, deleted and
+cascaded away (session and teacher deletes) through the services, and a CSV
+register is imported, re-imported and re-imported corrected. After each
+step the AttendanceSummary / TeacherAttendanceSummary rows of the fixture
+courses are compared with what `rebuild()` would compute from the raw
+tables. After the corrections and the teacher delete, the at-risk set
+(refreshed incrementally, as the background job does) and each student's
+attendance overview are also compared with a recomputation from the raw rows,
+and so are the (cached) teacher attendance statistics after every teacher
+attendance change. All fixture rows are deleted afterwards;
+the exit status is 1 when any step drifted.
+
+Run from the backend directory against a migrated database (DATABASE_URL):
+    python -m benchmarks.check_attendance_summaries
+"""
+
+import asyncio
+import sys
+import uuid
+from datetime import datetime
+
+from prisma import Prisma
+
+from src.models.schemas import (
+    StudentAttendanceCreate,
+    StudentAttendanceUpdate,
+    TeacherAttendanceCreate,
+    TeacherAttendanceUpdate
+)
+from src.services.attendance_import_service import IMPORT_COLUMNS, AttendanceImportService
+from src.services.at_risk_service import AtRiskService
+from src.services.attendance_service import AttendanceService
+from src.services.attendance_summary_service import (
+    COUNTER_COLUMNS,
+    GOOD_ATTENDANCE_THRESHOLD,
+    STATUS_COLUMNS,
+    WARNING_ATTENDANCE_THRESHOLD,
+    AttendanceSummaryService
+)
+from src.services.teacher_service import TeacherService
+
+STUDENTS = 4
+
+# Counters a rebuild would produce for the given courses, keyed like the summary rows
+_RECOUNT_SQL = """
+    SELECT a."{owner}" AS "ownerId", a."courseId", COUNT(*)::int AS "total", {counters}
+    FROM "{source}" a
+    WHERE a."{owner}" IS NOT NULL AND a."courseId" = ANY($1::text[])
+    GROUP BY a."{owner}", a."courseId"
+"""
+
+_SUMMARY_SQL = """
+    SELECT sm."{owner}" AS "ownerId", sm."courseId", {columns}
+    FROM "{table}" sm
+    WHERE sm."courseId" = ANY($1::text[])
+"""
+
+# At-risk (student, course) pairs of the courses computed from raw attendance
+_AT_RISK_RECOUNT_SQL = """
+    SELECT a."studentId", a."courseId", COUNT(*)::int AS "total",
+           (COUNT(*) FILTER (WHERE a."status" = 'PRESENT'))::int AS "present"
+    FROM "StudentAttendance" a
+    WHERE a."courseId" = ANY($1::text[])
+    GROUP BY a."studentId", a."courseId"
+"""
+
+# Per-student counters of the courses, as the overview should report them
+_STUDENT_RECOUNT_SQL = """
+    SELECT a."courseId", COUNT(*)::int AS "total", {counters}
+    FROM "StudentAttendance" a
+    WHERE a."studentId" = $1 AND a."courseId" = ANY($2::text[])
+    GROUP BY a."courseId"
+"""
+
+# Classes conducted / attended by each course's teacher, as the teacher statistics should report them
+_TEACHER_STATS_RECOUNT_SQL = """
+    SELECT c."id" AS "courseId", COUNT(ta."id")::int AS "total",
+           (COUNT(*) FILTER (WHERE ta."status" = 'PRESENT'))::int AS "present"
+    FROM "Course" c
+    LEFT JOIN "TeacherAttendance" ta ON ta."courseId" = c."id" AND ta."teacherId" = c."teacherId"
+    WHERE c."id" = ANY($1::text[]) AND c."teacherId" IS NOT NULL
+    GROUP BY c."id"
+"""
+
+TABLES = [
+    ("AttendanceSummary", "studentId", "StudentAttendance"),
+    ("TeacherAttendanceSummary", "teacherId", "TeacherAttendance"),
+]
+
+
+def _key_rows(rows):
+    """(owner, course) -> counters, dropping all-zero rows (a summary may outlive its last record)."""
+    return {
+        (r['ownerId'], r['courseId']): tuple(r[c] for c in COUNTER_COLUMNS)
+        for r in rows
+        if any(r[c] for c in COUNTER_COLUMNS)
+    }
+
+
+def _status_counters() -> str:
+    return ", ".join(
+        f"""(COUNT(*) FILTER (WHERE a."status" = '{status}'))::int AS "{column}\""""
+        for status, column in STATUS_COLUMNS.items()
+    )
+
+
+async def _drift(db: Prisma, course_ids):
+    """Summary rows of the courses that differ from a recount, per table."""
+    counters = _status_counters()
+    columns = ", ".join(f'sm."{c}"' for c in COUNTER_COLUMNS)
+    drift = {}
+    for table, owner, source in TABLES:
+        expected = _key_rows(await db.query_raw(
+            _RECOUNT_SQL.format(owner=owner, source=source, counters=counters), course_ids
+        ))
+        actual = _key_rows(await db.query_raw(
+            _SUMMARY_SQL.format(owner=owner, table=table, columns=columns), course_ids
+        ))
+        diff = {
+            key: {'summary': actual.get(key), 'recount': expected.get(key)}
+            for key in expected.keys() | actual.keys()
+            if expected.get(key) != actual.get(key)
+        }
+        if diff:
+            drift[table] = diff
+    return drift
+
+
+class Checker:
+    def __init__(self, db: Prisma, course_ids):
+        self.db = db
+        self.course_ids = course_ids
+        self.failures = 0
+
+    async def step(self, label: str):
+        drift = await _drift(self.db, self.course_ids)
+        if drift:
+            self.failures += 1
+            print(f"  ❌ {label}")
+            for table, rows in drift.items():
+                print(f"     {table} ({', '.join(COUNTER_COLUMNS)})")
+                for key, row in rows.items():
+                    print(f"       {key}: summary={row['summary']} recount={row['recount']}")
+        else:
+            print(f"  ✅ {label}")
+
+    async def at_risk(self, label: str):
+        """Refresh the at-risk set incrementally and compare it with the raw rows."""
+        for _ in range(10):
+            if await AtRiskService.refresh(self.db) is not None:
+                break
+            await asyncio.sleep(1)  # the app's background refresh holds the lock
+        expected = {}
+        for r in await self.db.query_raw(_AT_RISK_RECOUNT_SQL, self.course_ids):
+            percentage = r['present'] * 100.0 / r['total']
+            if percentage < GOOD_ATTENDANCE_THRESHOLD:
+                status = 'Warning' if percentage >= WARNING_ATTENDANCE_THRESHOLD else 'Critical'
+                expected[(r['studentId'], r['courseId'])] = (r['total'], r['present'], status)
+        actual = {
+            (r.studentId, r.courseId): (r.total, r.present, r.status)
+            for r in await self.db.atriskstudent.find_many(where={'courseId': {'in': self.course_ids}})
+        }
+        self.expect(f"{label}: at-risk set", actual, expected)
+
+    async def overview(self, label: str, students):
+        """Compare each student's attendance overview with the raw rows of the courses."""
+        sql = _STUDENT_RECOUNT_SQL.format(counters=_status_counters())
+        zeros = tuple(0 for _ in COUNTER_COLUMNS)
+        for student in students:
+            overview = await AttendanceSummaryService.get_student_overview(student.id, self.db)
+            recount = {
+                r['courseId']: tuple(r[c] for c in COUNTER_COLUMNS)
+                for r in await self.db.query_raw(sql, student.id, self.course_ids)
+            }
+            actual = {
+                c['courseId']: tuple(c[col] for col in COUNTER_COLUMNS)
+                for c in overview['courses']
+                if c['courseId'] in self.course_ids
+            }
+            expected = {course_id: recount.get(course_id, zeros) for course_id in self.course_ids}
+            self.expect(f"{label}: overview of {student.studentId}", actual, expected)
+            self.expect(
+                f"{label}: overview totals of {student.studentId}",
+                (overview['total'], overview['attended']),
+                (sum(c['total'] for c in overview['courses']), sum(c['attended'] for c in overview['courses']))
+            )
+
+    async def teacher_stats(self, label: str):
+        """Compare the teacher attendance statistics (as served, cache included) with the raw rows."""
+        stats = await AttendanceService.get_all_teachers_attendance(self.db)
+        actual = {
+            course['courseId']: (course['totalClassesConducted'], course['averageAttendancePercentage'])
+            for teacher in stats
+            for course in teacher['courses']
+            if course['courseId'] in self.course_ids
+        }
+        expected = {
+            r['courseId']: (r['total'], round(r['present'] / r['total'] * 100, 2) if r['total'] else 0)
+            for r in await self.db.query_raw(_TEACHER_STATS_RECOUNT_SQL, self.course_ids)
+        }
+        self.expect(f"{label}: teacher statistics", actual, expected)
+
+    def expect(self, label: str, actual, expected):
+        """Compare a service result (e.g. import report counts) besides the summaries."""
+        if actual != expected:
+            self.failures += 1
+            print(f"  ❌ {label}: got {actual}, expected {expected}")
+        else:
+            print(f"  ✅ {label}")
+
+
+async def _create_fixture(db: Prisma, tag: str):
+    department = await db.department.create(data={"code": f"CHK-{tag}", "name": f"Check {tag}"})
+    admin_user = await db.user.create(
+        data={"email": f"check-{tag}-admin@example.com", "password": "x", "role": "ADMIN", "name": "Check Admin"}
+    )
+    admin = await db.admin.create(data={"userId": admin_user.id, "adminId": f"CA-{tag}"})
+
+    teachers, courses = [], []
+    for i in range(2):
+        user = await db.user.create(
+            data={"email": f"check-{tag}-teacher-{i}@example.com", "password": "x", "role": "TEACHER", "name": f"Check Teacher {i}"}
+        )
+        teacher = await db.teacher.create(
+            data={"userId": user.id, "teacherId": f"CT-{tag}-{i}", "department": department.code, "designation": "Lecturer"}
+        )
+        course = await db.course.create(
+            data={
+                "courseCode": f"CK{tag}{i}",
+                "courseName": f"Check Course {i}",
+                "credits": 3,
+                "semester": 1,
+                "departmentId": department.id,
+                "teacherId": teacher.id,
+            }
+        )
+        teachers.append(teacher)
+        courses.append(course)
+
+    students = []
+    for i in range(STUDENTS):
+        user = await db.user.create(
+            data={"email": f"check-{tag}-student-{i}@example.com", "password": "x", "role": "STUDENT", "name": f"Check Student {i}"}
+        )
+        students.append(await db.student.create(
+            data={"userId": user.id, "studentId": f"CS-{tag}-{i}", "department": department.code, "semester": 1, "batch": "check"}
+        ))
+    await db.enrollment.create_many(
+        data=[{"studentId": s.id, "courseId": c.id, "status": "ACTIVE"} for s in students for c in courses]
+    )
+    return department, admin, teachers, courses, students
+
+
+async def _cleanup(db: Prisma, tag: str, department, courses):
+    course_ids = [c.id for c in courses]
+    # TeacherAttendance.course does not cascade
+    await db.teacherattendance.delete_many(where={"courseId": {"in": course_ids}})
+    await db.course.delete_many(where={"id": {"in": course_ids}})
+    await db.user.delete_many(where={"email": {"startswith": f"check-{tag}-"}})
+    await db.department.delete(where={"id": department.id})
+
+
+async def _session(db: Prisma, course, teacher, day: int):
+    return await db.classsession.create(
+        data={
+            "courseId": course.id,
+            "teacherId": teacher.id,
+            "date": datetime(2000, 1, day),
+            "startTime": "09:00",
+            "endTime": "10:00",
+            "status": "CONDUCTED",
+        }
+    )
+
+
+def _register(course, students, statuses):
+    """CSV lines of an offline register for one session of the course."""
+    lines = [",".join(IMPORT_COLUMNS)]
+    lines += [
+        ",".join([course.courseCode, s.studentId, "2000-01-05", "11:00", status])
+        for s, status in zip(students, statuses)
+    ]
+    return lines
+
+
+def _marks(session, students, statuses):
+    return [
+        StudentAttendanceCreate(sessionId=session.id, studentId=s.id, status=status)
+        for s, status in zip(students, statuses)
+    ]
+
+
+async def _run(db: Prisma, checker: Checker, admin, teachers, courses, students):
+    teacher, other_teacher = teachers
+    course, other_course = courses
+
+    s1 = await _session(db, course, teacher, 1)
+    s2 = await _session(db, course, teacher, 2)
+    await AttendanceService.bulk_mark_attendance(
+        _marks(s1, students, ["PRESENT", "PRESENT", "ABSENT", "LATE"]), teacher.id, db
+    )
+    records = await AttendanceService.bulk_mark_attendance(
+        _marks(s2, students, ["PRESENT", "ABSENT", "ABSENT", "PRESENT"]), teacher.id, db
+    )
+    await checker.step("bulk mark")
+
+    absent = next(r for r in records if r.status == "ABSENT")
+    await AttendanceService.update_attendance(absent.id, StudentAttendanceUpdate(status="PRESENT"), teacher.id, db)
+    await checker.step("update status (ABSENT -> PRESENT)")
+
+    await AttendanceService.bulk_upsert_attendance(
+        _marks(s1, students, ["ABSENT", "PRESENT", "PRESENT", "LATE"]), teacher.id, db
+    )
+    await checker.step("bulk upsert with corrections")
+
+    await AttendanceService.delete_attendance(records[-1].id, db)
+    await checker.step("delete attendance")
+
+    t1 = await AttendanceService.mark_teacher_attendance(
+        TeacherAttendanceCreate(sessionId=s1.id, teacherId=teacher.id, status="PRESENT"), admin.id, db
+    )
+    await AttendanceService.mark_teacher_attendance(
+        TeacherAttendanceCreate(sessionId=s2.id, teacherId=teacher.id, status="PRESENT"), admin.id, db
+    )
+    await AttendanceService.update_teacher_attendance(t1.id, TeacherAttendanceUpdate(status="ABSENT"), db)
+    await checker.step("teacher attendance mark + update")
+    await checker.teacher_stats("after teacher attendance update")
+
+    await AttendanceService.delete_teacher_attendance(t1.id, db)
+    await checker.step("delete teacher attendance")
+    await checker.teacher_stats("after teacher attendance delete")
+
+    await AttendanceService.delete_class_session(s2.id, db)
+    await checker.step("delete session")
+
+    register = ["PRESENT", "ABSENT", "PRESENT", "LATE"]
+    report = await AttendanceImportService.import_csv(_register(course, students, register), None, db)
+    checker.expect("import created", report['created'], STUDENTS)
+    await checker.step("import register")
+
+    report = await AttendanceImportService.import_csv(_register(course, students, register), None, db)
+    checker.expect("re-import unchanged", (report['unchanged'], report['created'], report['updated']), (STUDENTS, 0, 0))
+    await checker.step("re-import same register")
+
+    corrected = ["PRESENT", "PRESENT", "ABSENT", "LATE"]
+    report = await AttendanceImportService.import_csv(_register(course, students, corrected), None, db)
+    checker.expect("corrected import updated", (report['updated'], report['unchanged']), (2, STUDENTS - 2))
+    await checker.step("re-import corrected register")
+    await checker.at_risk("after corrections")
+    await checker.overview("after corrections", students)
+
+    # Sessions of the other teacher (in both courses) cascade away with them
+    s3 = await _session(db, other_course, other_teacher, 3)
+    s4 = await _session(db, course, other_teacher, 4)
+    await AttendanceService.bulk_mark_attendance(
+        _marks(s3, students, ["PRESENT", "ABSENT", "PRESENT", "PRESENT"]), other_teacher.id, db
+    )
+    await AttendanceService.bulk_mark_attendance(
+        _marks(s4, students, ["LATE", "PRESENT", "ABSENT", "PRESENT"]), other_teacher.id, db
+    )
+    await AttendanceService.mark_teacher_attendance(
+        TeacherAttendanceCreate(sessionId=s4.id, teacherId=teacher.id, status="PRESENT"), admin.id, db
+    )
+    await checker.step("substitute sessions")
+    await checker.teacher_stats("after substitute sessions")
+
+    await TeacherService(db).delete_teacher(other_teacher.id)
+    await checker.step("delete teacher (sessions cascade)")
+    await checker.at_risk("after teacher delete")
+    await checker.overview("after teacher delete", students)
+    await checker.teacher_stats("after teacher delete")
+
+
+async def main():
+    db = Prisma()
+    await db.connect()
+    tag = uuid.uuid4().hex[:8]
+    try:
+        department, admin, teachers, courses, students = await _create_fixture(db, tag)
+        checker = Checker(db, [c.id for c in courses])
+        try:
+            print("\nAttendance summaries vs. recount")
+            await _run(db, checker, admin, teachers, courses, students)
+        finally:
+            await _cleanup(db, tag, department, courses)
+    finally:
+        await db.disconnect()
+
+    if checker.failures:
+        print(f"\n{checker.failures} step(s) drifted")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Evaluate the ADMIN tool router on a labelled query set.
+
+For each query the label is the set of tool families a correct answer needs.
+A routing is counted as:
+  * correct  - the routed families cover the label (a fallback to all tools also covers it)
+  * narrowed - correct without falling back
+  * miss     - a needed family was left out (the model could not answer)
+
+Also reports bound tool counts and tool-schema size (a proxy for prompt tokens)
+against binding every ADMIN tool.
+
+Run from the backend directory (needs a generated Prisma client, no database):
+    python -m benchmarks.eval_tool_router [--verbose]
+"""
+
+import argparse
+import json
+import os
+import statistics
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-dummy-key")
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.agents.role_based_agent import ROLE_TOOLS
+from src.agents.tool_router import route_query, select_tools
+
+LABELLED_QUERIES = [
+    ("List all departments", {"departments"}),
+    ("Create a new department called Mechanical Engineering with code ME", {"departments"}),
+    ("Rename the CSE department to Computer Science and Engineering", {"departments"}),
+    ("Show me every student", {"students"}),
+    ("Get the details of student S001", {"students"}),
+    ("Add a new student John Doe in semester 3", {"students"}),
+    ("Delete student S045", {"students"}),
+    ("Which teachers do we have?", {"teachers"}),
+    ("Update the designation of teacher T003 to Associate Professor", {"teachers"}),
+    ("What courses does professor T002 teach?", {"teachers", "courses"}),
+    ("Which students are in T001's CS101 course?", {"teachers", "students", "courses"}),
+    ("List all courses", {"courses"}),
+    ("Show course CS301 details", {"courses"}),
+    ("Create a course Data Structures, code CS201, 4 credits", {"courses"}),
+    ("Deactivate the course MA101", {"courses"}),
+    ("Which subjects are offered in semester 5?", {"courses"}),
+    ("Enroll student S010 in CS101", {"enrollments", "students", "courses"}),
+    ("Show the enrollments for student S003", {"enrollments", "students"}),
+    ("Remove the registration of S020 from PH102", {"enrollments", "students", "courses"}),
+    ("Show the full timetable", {"schedules"}),
+    ("What is the schedule for CS101?", {"schedules", "courses"}),
+    ("Which room is used on Monday period 3?", {"schedules"}),
+    ("Save this timetable for semester 3", {"schedules"}),
+    ("Show teacher T004's timetable", {"schedules", "teachers"}),
+    ("Mark S001 present for CS101 today", {"attendance", "students", "courses"}),
+    ("Create a class session for CS102 tomorrow at 10am", {"attendance", "courses"}),
+    ("Show attendance stats for all students", {"attendance", "students"}),
+    ("Which students were absent in CS101 yesterday?", {"attendance", "students", "courses"}),
+    ("Show teacher attendance statistics", {"attendance", "teachers"}),
+    ("List the sessions of course EE201", {"attendance", "courses"}),
+    ("Which students are at risk of low attendance?", {"attendance", "students"}),
+    ("What is my profile?", {"self"}),
+    ("Show my schedule", {"self"}),
+    ("What courses do I teach?", {"self"}),
+    ("Show my attendance", {"self"}),
+    ("How many departments and teachers are there?", {"departments", "teachers"}),
+    ("Thanks!", set()),
+    ("Can you help me?", set()),
+    ("Yes, go ahead and do that", set()),
+    ("Give me an overview of everything: departments, students, teachers, courses and attendance", set()),
+]
+
+
+def _schema_chars(tools):
+    return sum(len(json.dumps(convert_to_openai_tool(t))) for t in tools)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--verbose", action="store_true", help="print every routing decision")
+    args = parser.parse_args()
+
+    all_tools = ROLE_TOOLS["ADMIN"]
+    full_chars = _schema_chars(all_tools)
+    correct = narrowed = fallbacks = 0
+    bound_counts, bound_chars, misses = [], [], []
+
+    for query, label in LABELLED_QUERIES:
+        families = route_query(query)
+        if families is None:
+            fallbacks += 1
+            correct += 1
+            tools = all_tools
+        else:
+            tools = select_tools(all_tools, families)
+            if label <= families:
+                correct += 1
+                narrowed += 1
+            else:
+                misses.append((query, sorted(label - families)))
+        bound_counts.append(len(tools))
+        bound_chars.append(_schema_chars(tools))
+        if args.verbose:
+            routed = "ALL" if families is None else ",".join(sorted(families))
+            print(f"  {len(tools):3d} tools  [{routed}]  {query}")
+
+    total = len(LABELLED_QUERIES)
+    print(f"\nADMIN tool router on {total} labelled queries")
+    print(f"  accuracy (label covered):   {correct / total:6.1%}")
+    print(f"  narrowed without fallback:  {narrowed / total:6.1%}")
+    print(f"  fallback to all tools:      {fallbacks / total:6.1%}")
+    print(f"  tools bound:   mean {statistics.mean(bound_counts):5.1f} vs {len(all_tools)} (all)")
+    print(
+        f"  schema chars:  mean {statistics.mean(bound_chars):8,.0f} vs {full_chars:,} (all), "
+        f"~{(1 - statistics.mean(bound_chars) / full_chars):.0%} smaller prompts"
+    )
+    for query, missing in misses:
+        print(f"  MISS {query!r}: missing {missing}")
+
+
+if __name__ == "__main__":
+    main()
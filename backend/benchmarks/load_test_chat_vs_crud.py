@@ -0,0 +1,103 @@
+"""
+Load test: CRUD endpoint latency with and without concurrent chat traffic.
+
+Measures GET /api/departments/ latency on its own, then again while N clients
+keep /api/agent/query busy. With non-blocking model calls the two CRUD
+distributions should be close; a blocking LLM call shows up as a p95 spike.
+
+Run against a live server (single worker makes the effect easiest to see):
+    uvicorn src.main:app --workers 1
+    python -m benchmarks.load_test_chat_vs_crud --token <JWT> --chat-clients 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(0, int(len(ordered) * pct) - 1)]
+
+
+def _report(label, samples):
+    print(
+        f"  {label:<18} n={len(samples):4d}  p50={_percentile(samples, 0.50):8.1f} ms  "
+        f"p95={_percentile(samples, 0.95):8.1f} ms  max={max(samples):8.1f} ms"
+    )
+
+
+async def _crud_probe(client, duration, interval):
+    samples = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/api/departments/")
+        response.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def _chat_client(client, stop, latencies, errors):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/api/agent/query",
+                json={"query": "List all departments and all courses"},
+                timeout=120,
+            )
+            if response.status_code == 200:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", required=True, help="Bearer token of any user")
+    parser.add_argument("--chat-clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.05, help="pause between CRUD probes")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"}
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=30) as client:
+        print(f"Phase 1: CRUD only ({args.duration:.0f}s)")
+        baseline = await _crud_probe(client, args.duration, args.interval)
+
+        print(f"Phase 2: CRUD with {args.chat_clients} concurrent chat clients ({args.duration:.0f}s)")
+        stop = asyncio.Event()
+        chat_latencies, chat_errors = [], []
+        chat_tasks = [
+            asyncio.create_task(_chat_client(client, stop, chat_latencies, chat_errors))
+            for _ in range(args.chat_clients)
+        ]
+        await asyncio.sleep(1.0)  # let the chat requests reach the model
+        under_load = await _crud_probe(client, args.duration, args.interval)
+        stop.set()
+        await asyncio.gather(*chat_tasks)
+
+        metrics = await client.get("/api/agent/metrics")
+
+    print("\nCRUD latency (GET /api/departments/)")
+    _report("baseline", baseline)
+    _report("with chat load", under_load)
+    print(f"  p95 ratio: {_percentile(under_load, 0.95) / _percentile(baseline, 0.95):.2f}x")
+    if chat_latencies:
+        print(f"\nChat: {len(chat_latencies)} completed, mean {statistics.mean(chat_latencies):.0f} ms")
+    if chat_errors:
+        print(f"Chat errors/backpressure responses: {len(chat_errors)} ({sorted(set(map(str, chat_errors)))})")
+    if metrics.status_code == 200:
+        print(f"\nLLM limiter: {metrics.json()['llm_limiter']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
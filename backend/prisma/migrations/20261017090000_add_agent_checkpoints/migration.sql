@@ -0,0 +1,45 @@
+-- CreateTable
+CREATE TABLE "AgentCheckpoint" (
+    "id" TEXT NOT NULL,
+    "threadId" TEXT NOT NULL,
+    "checkpointNs" TEXT NOT NULL DEFAULT '',
+    "checkpointId" TEXT NOT NULL,
+    "parentCheckpointId" TEXT,
+    "type" TEXT NOT NULL,
+    "checkpoint" TEXT NOT NULL,
+    "metadataType" TEXT NOT NULL,
+    "metadata" TEXT NOT NULL,
+    "sizeBytes" INTEGER NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "AgentCheckpoint_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "AgentCheckpointWrite" (
+    "id" TEXT NOT NULL,
+    "threadId" TEXT NOT NULL,
+    "checkpointNs" TEXT NOT NULL DEFAULT '',
+    "checkpointId" TEXT NOT NULL,
+    "taskId" TEXT NOT NULL,
+    "taskPath" TEXT NOT NULL DEFAULT '',
+    "idx" INTEGER NOT NULL,
+    "channel" TEXT NOT NULL,
+    "type" TEXT NOT NULL,
+    "value" TEXT NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "AgentCheckpointWrite_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "AgentCheckpoint_threadId_idx" ON "AgentCheckpoint"("threadId");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "AgentCheckpoint_threadId_checkpointNs_checkpointId_key" ON "AgentCheckpoint"("threadId", "checkpointNs", "checkpointId");
+
+-- CreateIndex
+CREATE INDEX "AgentCheckpointWrite_threadId_idx" ON "AgentCheckpointWrite"("threadId");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "AgentCheckpointWrite_task_write_key" ON "AgentCheckpointWrite"("threadId", "checkpointNs", "checkpointId", "taskId", "idx");
@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "StudentAttendance_studentId_courseId_idx" ON "StudentAttendance"("studentId", "courseId");
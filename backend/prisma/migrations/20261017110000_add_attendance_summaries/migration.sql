@@ -0,0 +1,83 @@
+-- CreateTable
+CREATE TABLE "AttendanceSummary" (
+    "id" TEXT NOT NULL,
+    "studentId" TEXT NOT NULL,
+    "courseId" TEXT NOT NULL,
+    "total" INTEGER NOT NULL DEFAULT 0,
+    "present" INTEGER NOT NULL DEFAULT 0,
+    "late" INTEGER NOT NULL DEFAULT 0,
+    "excused" INTEGER NOT NULL DEFAULT 0,
+    "absent" INTEGER NOT NULL DEFAULT 0,
+    "medicalLeave" INTEGER NOT NULL DEFAULT 0,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "AttendanceSummary_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "TeacherAttendanceSummary" (
+    "id" TEXT NOT NULL,
+    "teacherId" TEXT NOT NULL,
+    "courseId" TEXT NOT NULL,
+    "total" INTEGER NOT NULL DEFAULT 0,
+    "present" INTEGER NOT NULL DEFAULT 0,
+    "late" INTEGER NOT NULL DEFAULT 0,
+    "excused" INTEGER NOT NULL DEFAULT 0,
+    "absent" INTEGER NOT NULL DEFAULT 0,
+    "medicalLeave" INTEGER NOT NULL DEFAULT 0,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "TeacherAttendanceSummary_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "AttendanceSummary_courseId_idx" ON "AttendanceSummary"("courseId");
+
+-- CreateIndex
+CREATE INDEX "AttendanceSummary_updatedAt_idx" ON "AttendanceSummary"("updatedAt");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "AttendanceSummary_studentId_courseId_key" ON "AttendanceSummary"("studentId", "courseId");
+
+-- CreateIndex
+CREATE INDEX "TeacherAttendanceSummary_courseId_idx" ON "TeacherAttendanceSummary"("courseId");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "TeacherAttendanceSummary_teacherId_courseId_key" ON "TeacherAttendanceSummary"("teacherId", "courseId");
+
+-- AddForeignKey
+ALTER TABLE "AttendanceSummary" ADD CONSTRAINT "AttendanceSummary_studentId_fkey" FOREIGN KEY ("studentId") REFERENCES "Student"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "AttendanceSummary" ADD CONSTRAINT "AttendanceSummary_courseId_fkey" FOREIGN KEY ("courseId") REFERENCES "Course"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "TeacherAttendanceSummary" ADD CONSTRAINT "TeacherAttendanceSummary_teacherId_fkey" FOREIGN KEY ("teacherId") REFERENCES "Teacher"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "TeacherAttendanceSummary" ADD CONSTRAINT "TeacherAttendanceSummary_courseId_fkey" FOREIGN KEY ("courseId") REFERENCES "Course"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- Backfill from existing attendance rows
+INSERT INTO "AttendanceSummary" ("id", "studentId", "courseId", "total", "present", "late", "excused", "absent", "medicalLeave", "updatedAt")
+SELECT gen_random_uuid()::text, a."studentId", a."courseId", COUNT(*)::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'PRESENT'))::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'LATE'))::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'EXCUSED'))::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'ABSENT'))::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'MEDICAL_LEAVE'))::int,
+    CURRENT_TIMESTAMP
+FROM "StudentAttendance" a
+WHERE a."studentId" IS NOT NULL
+GROUP BY a."studentId", a."courseId";
+
+INSERT INTO "TeacherAttendanceSummary" ("id", "teacherId", "courseId", "total", "present", "late", "excused", "absent", "medicalLeave", "updatedAt")
+SELECT gen_random_uuid()::text, a."teacherId", a."courseId", COUNT(*)::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'PRESENT'))::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'LATE'))::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'EXCUSED'))::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'ABSENT'))::int,
+    (COUNT(*) FILTER (WHERE a."status" = 'MEDICAL_LEAVE'))::int,
+    CURRENT_TIMESTAMP
+FROM "TeacherAttendance" a
+WHERE a."teacherId" IS NOT NULL
+GROUP BY a."teacherId", a."courseId";
@@ -0,0 +1,37 @@
+-- CreateTable
+CREATE TABLE "AtRiskStudent" (
+    "id" TEXT NOT NULL,
+    "studentId" TEXT NOT NULL,
+    "courseId" TEXT NOT NULL,
+    "total" INTEGER NOT NULL,
+    "present" INTEGER NOT NULL,
+    "attendancePercentage" DOUBLE PRECISION NOT NULL,
+    "status" TEXT NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "AtRiskStudent_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "JobState" (
+    "name" TEXT NOT NULL,
+    "watermark" TIMESTAMP(3) NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "JobState_pkey" PRIMARY KEY ("name")
+);
+
+-- CreateIndex
+CREATE INDEX "AtRiskStudent_courseId_idx" ON "AtRiskStudent"("courseId");
+
+-- CreateIndex
+CREATE INDEX "AtRiskStudent_status_attendancePercentage_idx" ON "AtRiskStudent"("status", "attendancePercentage");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "AtRiskStudent_studentId_courseId_key" ON "AtRiskStudent"("studentId", "courseId");
+
+-- AddForeignKey
+ALTER TABLE "AtRiskStudent" ADD CONSTRAINT "AtRiskStudent_studentId_fkey" FOREIGN KEY ("studentId") REFERENCES "Student"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "AtRiskStudent" ADD CONSTRAINT "AtRiskStudent_courseId_fkey" FOREIGN KEY ("courseId") REFERENCES "Course"("id") ON DELETE CASCADE ON UPDATE CASCADE;
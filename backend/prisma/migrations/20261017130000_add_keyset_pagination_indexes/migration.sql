@@ -0,0 +1,32 @@
+-- CreateIndex
+CREATE INDEX "User_createdAt_id_idx" ON "User"("createdAt", "id");
+
+-- CreateIndex
+CREATE INDEX "Student_createdAt_id_idx" ON "Student"("createdAt", "id");
+
+-- CreateIndex
+CREATE INDEX "Teacher_createdAt_id_idx" ON "Teacher"("createdAt", "id");
+
+-- CreateIndex
+CREATE INDEX "Department_createdAt_id_idx" ON "Department"("createdAt", "id");
+
+-- CreateIndex
+CREATE INDEX "Course_createdAt_id_idx" ON "Course"("createdAt", "id");
+
+-- CreateIndex
+CREATE INDEX "Enrollment_createdAt_id_idx" ON "Enrollment"("createdAt", "id");
+
+-- CreateIndex
+CREATE INDEX "Schedule_createdAt_id_idx" ON "Schedule"("createdAt", "id");
+
+-- CreateIndex
+CREATE INDEX "ClassSession_courseId_date_id_idx" ON "ClassSession"("courseId", "date", "id");
+
+-- CreateIndex
+CREATE INDEX "StudentAttendance_courseId_markedAt_id_idx" ON "StudentAttendance"("courseId", "markedAt", "id");
+
+-- CreateIndex
+CREATE INDEX "StudentAttendance_studentId_markedAt_id_idx" ON "StudentAttendance"("studentId", "markedAt", "id");
+
+-- CreateIndex
+CREATE INDEX "TeacherAttendance_teacherId_markedAt_id_idx" ON "TeacherAttendance"("teacherId", "markedAt", "id");
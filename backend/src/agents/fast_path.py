@@ -0,0 +1,190 @@
+"""
+Deterministic fast path for the most common "about me" chat questions.
+
+Queries such as "show my schedule", "what is my attendance?", "my courses" or
+"who am I" are answered by calling the matching context-aware tool directly
+and rendering its result from a template - no LLM round trips.
+
+Matching is deliberately strict: the whole (normalised) query must match one
+intent pattern. Anything with extra qualifiers ("today", a course code,
+"compared to last month", ...) or matching several intents returns None and
+goes to the agent as usual, as do tool errors.
+"""
+
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from src.tools.context_aware_tools import (
+    get_my_attendance,
+    get_my_courses,
+    get_my_profile,
+    get_my_schedule,
+)
+from src.utils.metrics import increment, record_latency
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+# Matches the period slots used by ScheduleService._parse_time_to_period
+PERIODS = [
+    "9:00-10:00", "10:00-11:00", "11:00-11:30", "11:30-12:30",
+    "12:30-13:30", "13:30-14:30", "14:30-15:30", "15:30-16:30",
+]
+
+_LEAD = r"(?:(?:can you|could you|please|pls|kindly)\s+)*(?:(?:show|display|view|get|see|give|tell|check|list|fetch)\s+(?:me\s+)?)?"
+_WHAT = r"(?:what(?:'s| is| are)|how(?:'s| is))\s+"
+
+
+def _intent(*patterns: str) -> List[Pattern]:
+    return [re.compile(rf"^{_LEAD}{p}(?:\s+please)?$") for p in patterns]
+
+
+INTENT_PATTERNS: Dict[str, List[Pattern]] = {
+    "get_my_schedule": _intent(
+        rf"(?:{_WHAT})?my\s+(?:weekly\s+|class\s+|teaching\s+)?(?:schedules?|timetables?|time\s+tables?)",
+        r"what\s+classes\s+do\s+i\s+have(?:\s+this\s+week)?",
+        r"when\s+are\s+my\s+classes",
+    ),
+    "get_my_attendance": _intent(
+        rf"(?:{_WHAT})?my\s+(?:overall\s+)?attendance(?:\s+(?:percentage|record|records|stats|statistics))?",
+        r"how\s+many\s+classes\s+have\s+i\s+attended",
+    ),
+    "get_my_courses": _intent(
+        rf"(?:{_WHAT})?my\s+(?:courses|subjects)",
+        r"(?:what|which)\s+(?:courses|subjects)\s+(?:do\s+i\s+(?:teach|take|have)|am\s+i\s+(?:taking|teaching|enrolled\s+in))",
+        r"what\s+am\s+i\s+enrolled\s+in",
+    ),
+    "get_my_profile": _intent(
+        rf"(?:{_WHAT})?my\s+(?:profile|details|info|information|account\s+details)",
+        r"who\s+am\s+i",
+        r"tell\s+me\s+about\s+myself",
+    ),
+}
+
+# Intents that only make sense for a linked student/teacher profile
+PROFILE_ROLES = {"STUDENT", "TEACHER"}
+ROLE_INTENTS = {
+    "get_my_schedule": PROFILE_ROLES,
+    "get_my_attendance": PROFILE_ROLES,
+    "get_my_courses": PROFILE_ROLES,
+    "get_my_profile": {"STUDENT", "TEACHER", "ADMIN"},
+}
+
+TOOLS = {
+    "get_my_schedule": get_my_schedule,
+    "get_my_attendance": get_my_attendance,
+    "get_my_courses": get_my_courses,
+    "get_my_profile": get_my_profile,
+}
+
+
+def _normalise(query: str) -> str:
+    text = query.lower().strip()
+    text = re.sub(r"[?!.,]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def match_intent(query: str, user_role: str) -> Optional[str]:
+    """Name of the single context tool that answers `query`, or None."""
+    text = _normalise(query)
+    matches = [
+        name for name, patterns in INTENT_PATTERNS.items()
+        if any(p.match(text) for p in patterns)
+    ]
+    if len(matches) != 1 or user_role not in ROLE_INTENTS[matches[0]]:
+        return None
+    return matches[0]
+
+
+# ==================== TEMPLATES ====================
+
+def _render_schedule(result: Dict[str, Any]) -> str:
+    lines = [f"**{result.get('message', 'Your weekly schedule')}**", ""]
+    any_class = False
+    for day_idx, periods in enumerate(result.get("timetable") or []):
+        slots = [
+            f"- {PERIODS[p] if p < len(PERIODS) else f'Period {p + 1}'}: "
+            f"{cell[1]} ({'with ' + cell[0] + ', ' if result.get('role') == 'STUDENT' else ''}room {cell[2]})"
+            for p, cell in enumerate(periods) if cell
+        ]
+        if slots:
+            any_class = True
+            lines.append(f"**{DAYS[day_idx] if day_idx < len(DAYS) else f'Day {day_idx + 1}'}**")
+            lines.extend(slots)
+            lines.append("")
+    if not any_class:
+        return "You have no classes scheduled this week."
+    return "\n".join(lines).strip()
+
+
+def _render_attendance(result: Dict[str, Any]) -> str:
+    courses = [c for c in result.get("courses") or [] if c.get("total")]
+    if not courses:
+        return "No attendance has been recorded for you yet."
+
+    lines = [f"**{result.get('message', '')}**", "", "**By course:**"]
+    for course in courses:
+        label = f"{course.get('courseCode') or ''} {course.get('courseName') or ''}".strip() or course["courseId"]
+        lines.append(
+            f"- {label}: {course['present']}/{course['total']} present ({course['attendancePercentage']:.1f}%)"
+        )
+    return "\n".join(lines)
+
+
+def _render_courses(result: Dict[str, Any]) -> str:
+    if result.get("role") == "TEACHER":
+        courses = result.get("courses") or []
+        header = f"**{result.get('message')}**"
+        items = [
+            f"- {c['courseCode']} {c['courseName']} ({c['credits']} credits, semester {c['semester']})"
+            for c in courses
+        ]
+    else:
+        courses = result.get("enrollments") or []
+        header = f"**{result.get('message')}**"
+        items = [
+            f"- {e['courseCode']} {e['courseName']} ({e['credits']} credits, semester {e['semester']}) "
+            f"with {e['teacher']} · {e['status']}"
+            for e in courses
+        ]
+    if not courses:
+        return "You don't have any courses yet."
+    return "\n".join([header, "", *items])
+
+
+def _render_profile(result: Dict[str, Any]) -> str:
+    return result.get("message", "").strip()
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "get_my_schedule": _render_schedule,
+    "get_my_attendance": _render_attendance,
+    "get_my_courses": _render_courses,
+    "get_my_profile": _render_profile,
+}
+
+
+async def try_fast_path(query: str, user_id: str, user_role: str) -> Optional[Tuple[str, str]]:
+    """
+    Answer `query` without the LLM when it is an unambiguous "about me" question.
+
+    Returns (tool_name, answer) or None to hand the query to the agent.
+    """
+    tool_name = match_intent(query, user_role)
+    if tool_name is None:
+        return None
+
+    start = time.perf_counter()
+    try:
+        result = await TOOLS[tool_name].ainvoke({"user_id": user_id, "user_role": user_role})
+        answer = RENDERERS[tool_name](result) if isinstance(result, dict) and "error" not in result else None
+    except Exception as e:
+        print(f"⚠️ Fast path {tool_name} failed, using the agent: {str(e)}")
+        answer = None
+    if not answer:
+        increment("agent.fast_path.fallback")
+        return None
+
+    record_latency(f"agent.fast_path.{tool_name}", (time.perf_counter() - start) * 1000)
+    increment("agent.fast_path.hit")
+    print(f"⚡ Answered via fast path: {tool_name}")
+    return tool_name, answer
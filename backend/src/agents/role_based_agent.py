@@ -2,15 +2,36 @@
 Role-based agent that dynamically binds tools based on user role.
 Supports ADMIN, TEACHER, and STUDENT roles with appropriate tools and prompts.
 Enhanced with conversation memory and proper tool calling.
+
+Compiled graphs are cached per role (see get_role_agent); the current user is
+passed per request through the LangGraph config (see build_agent_config).
 """
 
-from typing import List, Dict, Any
+import asyncio
+import os
+import time
+from typing import List, Dict, Any, Optional, FrozenSet
 from langgraph.graph import StateGraph, END
-from langchain_core.messages import SystemMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from langchain_core.messages import SystemMessage, AIMessage, ToolMessage, RemoveMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import ToolNode
 from langgraph.checkpoint.memory import MemorySaver
 from src.graph.agent_state import AgentState
+from src.graph.checkpointer import get_checkpointer
+from src.graph.history import (
+    AGENT_HISTORY_TOKEN_BUDGET,
+    AGENT_HISTORY_KEEP_TOKENS,
+    content_text,
+    history_tokens,
+    split_for_budget,
+    summary_request,
+)
 from src.config.llm import llm
+from src.utils.metrics import record_latency, increment
+from src.utils.tool_output import compact_tool_output
+from src.agents.tool_router import route_query, families_of, select_tools
+from src.utils.llm_limiter import ainvoke_llm, LLMOverloadedError
 
 # Import all available tools
 from src.tools.department_tools import (
@@ -86,12 +107,14 @@ from src.tools.attendance_tool import (
     update_student_attendance,
     delete_student_attendance,
     get_all_students_attendance_stats,
+    get_at_risk_students,
     mark_teacher_attendance,
     get_teacher_attendance_record,
     get_teacher_attendance_records,
     update_teacher_attendance,
     delete_teacher_attendance,
-    get_all_teachers_attendance_stats
+    get_all_teachers_attendance_stats,
+    get_teacher_attendance_trends
 )
 
 
@@ -169,12 +192,14 @@ ROLE_TOOLS: Dict[str, List[Any]] = {
         update_student_attendance,
         delete_student_attendance,
         get_all_students_attendance_stats,
+        get_at_risk_students,
         mark_teacher_attendance,
         get_teacher_attendance_record,
         get_teacher_attendance_records,
         update_teacher_attendance,
         delete_teacher_attendance,
         get_all_teachers_attendance_stats,
+        get_teacher_attendance_trends,
     ],
     
     "TEACHER": [
@@ -229,6 +254,7 @@ ROLE_TOOLS: Dict[str, List[Any]] = {
         get_student_attendance_records,
         update_student_attendance,
         get_all_students_attendance_stats,
+        get_at_risk_students,
         mark_teacher_attendance,
         get_teacher_attendance_record,
         get_teacher_attendance_records,
@@ -382,30 +408,32 @@ Always:
 }
 
 
-def create_role_based_agent(user_role: str = "STUDENT", user_id: str = None, use_checkpointer: bool = True):
-    """
-    Create an agent with tools and prompts based on user role.
-    
-    Args:
-        user_role: User's role (ADMIN, TEACHER, STUDENT)
-        user_id: User's ID for personalized queries (automatically used in tools)
-        use_checkpointer: Whether to use memory checkpointer for conversation persistence
-    
-    Returns:
-        Compiled LangGraph workflow with optional memory
-    """
-    # Normalize role
-    role = user_role.upper()
-    
-    # Get tools for this role
-    tools = ROLE_TOOLS.get(role, ROLE_TOOLS["STUDENT"])  # Default to STUDENT if unknown
-    
-    # Get system prompt for this role
-    system_prompt = ROLE_PROMPTS.get(role, ROLE_PROMPTS["STUDENT"])
-    
-    # Enhanced system prompt with user context and natural language guidance
-    if user_id:
-        system_prompt += f"""
+# Maximum tool calls from one model turn that run at the same time
+AGENT_TOOL_CONCURRENCY = int(os.getenv("AGENT_TOOL_CONCURRENCY", "4"))
+# Per-tool timeout; a timed-out call is reported back to the model as an error
+AGENT_TOOL_TIMEOUT_SECONDS = float(os.getenv("AGENT_TOOL_TIMEOUT_SECONDS", "30"))
+
+# Roles whose model calls bind only the tool families routed from the query
+AGENT_TOOL_ROUTING_ROLES = {
+    r.strip().upper() for r in os.getenv("AGENT_TOOL_ROUTING_ROLES", "ADMIN").split(",") if r.strip()
+}
+
+# Tools that receive the current user's identity from the run config
+CONTEXT_AWARE_TOOLS = [
+    'get_my_schedule', 'get_my_attendance', 'get_my_courses',
+    'get_my_profile', 'get_my_teacher_profile'
+]
+
+
+def _normalize_role(user_role: Optional[str]) -> str:
+    """Map a user role onto one of the configured ROLE_TOOLS keys."""
+    role = (user_role or "STUDENT").upper()
+    return role if role in ROLE_TOOLS else "STUDENT"
+
+
+def _user_context_prompt(user_id: str, role: str) -> str:
+    """Per-user suffix appended to the role system prompt at call time."""
+    return f"""
 
 **Important Context:**
 - Your current user ID: {user_id}
@@ -418,13 +446,118 @@ def create_role_based_agent(user_role: str = "STUDENT", user_id: str = None, use
 - "Show my profile" → Use get_my_profile
 
 These tools automatically use the current user's ID ({user_id}), so you don't need to ask for IDs when users ask about themselves."""
+
+
+def build_agent_config(thread_id: str, user_id: str, user_role: str) -> Dict[str, Any]:
+    """
+    Build the LangGraph run config for a shared role agent.
+
+    The compiled graphs are shared by every user of a role, so the caller's
+    identity travels through `configurable` instead of being baked into the graph.
+    """
+    return {
+        "configurable": {
+            "thread_id": thread_id,
+            "user_id": user_id,
+            "user_role": _normalize_role(user_role),
+        }
+    }
+
+
+def build_role_graph(user_role: str = "STUDENT", checkpointer=None):
+    """
+    Build and compile the agent graph for a role.
+
+    Nothing user-specific is captured here: `user_id` is read from
+    `config["configurable"]` on every node call (see build_agent_config).
+
+    Args:
+        user_role: User's role (ADMIN, TEACHER, STUDENT)
+        checkpointer: Optional LangGraph checkpointer to compile with
+
+    Returns:
+        Compiled LangGraph workflow
+    """
+    role = _normalize_role(user_role)
+    
+    # Get tools and system prompt for this role
+    tools = ROLE_TOOLS[role]
+    tools_by_name = {t.name: t for t in tools}
+    system_prompt = ROLE_PROMPTS[role]
     
-    # Bind tools to LLM
+    # Bind tools to LLM once per role - this serializes every tool schema
     llm_with_tools = llm.bind_tools(tools)
+    # Routed subsets, bound once per family set
+    bound_by_families: Dict[FrozenSet[str], Any] = {}
+    route_tools = role in AGENT_TOOL_ROUTING_ROLES
+    
+    def model_for_turn(messages: List[Any]):
+        """Pick the tool-bound model for this turn: a routed subset or the full set."""
+        if not route_tools:
+            return llm_with_tools
+        last_human = next((i for i in range(len(messages) - 1, -1, -1) if messages[i].type == "human"), None)
+        if last_human is None:
+            return llm_with_tools
+        query = messages[last_human].content
+        families = route_query(query if isinstance(query, str) else str(query))
+        if families is None:
+            increment("tool_router.fallback")
+            print(f"🧭 Tool router unsure, binding all {len(tools)} tools")
+            return llm_with_tools
+        
+        # Keep tools already called in this turn available to the follow-up call
+        called = [tc["name"] for m in messages[last_human + 1:] for tc in getattr(m, "tool_calls", None) or []]
+        families = families | families_of(called)
+        bound = bound_by_families.get(families)
+        if bound is None:
+            subset = select_tools(tools, families)
+            bound = llm.bind_tools(subset)
+            bound_by_families[families] = bound
+            print(f"🧭 Bound {len(subset)} of {len(tools)} tools for {sorted(families)}")
+        increment("tool_router.routed")
+        return bound
+    
+    # Plain model (no tools) used to fold old turns into the rolling summary
+    summarizer = llm
     
-    def call_model(state: AgentState):
+    async def compact_history(state: AgentState):
+        """Fold the oldest turns into the thread summary once history outgrows its budget."""
+        messages = state["messages"]
+        if history_tokens(messages) <= AGENT_HISTORY_TOKEN_BUDGET:
+            return {}
+        older, recent = split_for_budget(messages, AGENT_HISTORY_KEEP_TOKENS)
+        if not older:
+            return {}
+        
+        start = time.perf_counter()
+        try:
+            response = await ainvoke_llm(summarizer, summary_request(state.get("summary", ""), older))
+        except Exception as e:
+            # call_model still windows the prompt, so the turn can proceed
+            print(f"⚠️ History summarization failed, keeping full history: {str(e)}")
+            return {}
+        record_latency("agent.history.summarize", (time.perf_counter() - start) * 1000)
+        increment("agent.history.folded_messages", len(older))
+        print(f"🗜️ Folded {len(older)} messages into the thread summary, kept {len(recent)}")
+        return {
+            "summary": content_text(response.content),
+            "messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *recent],
+        }
+    
+    async def call_model(state: AgentState, config: RunnableConfig):
         """Call the LLM with tools and conversation context."""
         messages = state["messages"]
+        user_id = config.get("configurable", {}).get("user_id")
+        
+        prompt = system_prompt
+        if user_id:
+            prompt += _user_context_prompt(user_id, role)
+        if state.get("summary"):
+            prompt += f"\n\n**Summary of the earlier conversation:**\n{state['summary']}"
+        
+        # Safety net when summarization was skipped: send only the newest turns that fit
+        if history_tokens(messages) > AGENT_HISTORY_TOKEN_BUDGET:
+            _, messages = split_for_budget(messages, AGENT_HISTORY_TOKEN_BUDGET)
         
         # Always ensure system message is present at the start
         # Check if first message is a system message
@@ -432,27 +565,88 @@ These tools automatically use the current user's ID ({user_id}), so you don't ne
         
         if not has_system_msg:
             # Add system message at the beginning
-            system_msg = SystemMessage(content=system_prompt)
+            system_msg = SystemMessage(content=prompt)
             messages = [system_msg] + messages
         else:
             # Update existing system message with current context
             messages = list(messages)
-            messages[0] = SystemMessage(content=system_prompt)
+            messages[0] = SystemMessage(content=prompt)
         
-        # Invoke LLM with tools
+        # Invoke LLM with tools without blocking the event loop
         try:
-            response = llm_with_tools.invoke(messages)
+            response = await ainvoke_llm(model_for_turn(messages), messages)
             return {"messages": [response]}
+        except LLMOverloadedError:
+            raise
         except Exception as e:
             print(f"❌ Error calling model: {str(e)}")
             # Return error message instead of crashing
-            from langchain_core.messages import AIMessage
             error_msg = AIMessage(content=f"I encountered an error: {str(e)}. Please try rephrasing your question.")
             return {"messages": [error_msg]}
     
-    async def call_tools(state: AgentState):
-        """Custom tool executor that injects user context and handles errors gracefully."""
+    async def run_tool_call(tool_call: Dict[str, Any], user_id: Optional[str], semaphore: asyncio.Semaphore) -> ToolMessage:
+        """Execute one tool call under the concurrency cap and timeout."""
+        tool_name = tool_call["name"]
+        tool_args = tool_call["args"].copy()
+        
+        print(f"  ├─ Tool: {tool_name}")
+        print(f"  │  Args: {tool_args}")
+        
+        # Auto-inject user_id and user_role for context-aware tools
+        if tool_name in CONTEXT_AWARE_TOOLS:
+            # Inject user context if not already provided
+            if 'user_id' not in tool_args and user_id:
+                tool_args['user_id'] = user_id
+                print(f"  │  Auto-injected user_id: {user_id}")
+            if 'user_role' not in tool_args:
+                tool_args['user_role'] = role
+                print(f"  │  Auto-injected user_role: {role}")
+        
+        # Find the tool
+        tool_to_execute = tools_by_name.get(tool_name)
+        if not tool_to_execute:
+            error_msg = f"Tool {tool_name} not found. Available tools: {[t.name for t in tools[:5]]}..."
+            print(f"  ✗ {error_msg}")
+            return ToolMessage(content=error_msg, tool_call_id=tool_call["id"])
+        
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(
+                    tool_to_execute.ainvoke(tool_args),
+                    timeout=AGENT_TOOL_TIMEOUT_SECONDS
+                )
+                content, raw_tokens, tokens = compact_tool_output(tool_name, result)
+                increment("tool_output.raw_tokens", raw_tokens)
+                increment("tool_output.tokens", tokens)
+                increment("tool_output.tokens_saved", raw_tokens - tokens)
+                print(f"  ✓ {tool_name} succeeded: {content[:100]}...")
+                print(f"  │  Output ~{tokens} tokens (raw ~{raw_tokens}, saved ~{raw_tokens - tokens})")
+            except asyncio.TimeoutError:
+                content = f"Error executing {tool_name}: timed out after {AGENT_TOOL_TIMEOUT_SECONDS}s"
+                print(f"  ✗ Error: {content}")
+            except Exception as e:
+                content = f"Error executing {tool_name}: {str(e)}"
+                print(f"  ✗ Error: {content}")
+            latency_ms = (time.perf_counter() - start) * 1000
+        
+        record_latency(f"tool.{tool_name}", latency_ms)
+        print(f"  │  {tool_name} took {latency_ms:.0f} ms")
+        return ToolMessage(
+            content=content,
+            tool_call_id=tool_call["id"],
+            additional_kwargs={"latency_ms": round(latency_ms, 2)}
+        )
+    
+    async def call_tools(state: AgentState, config: RunnableConfig):
+        """
+        Custom tool executor that injects user context and handles errors gracefully.
+
+        Independent tool calls from one model turn run concurrently (capped by
+        AGENT_TOOL_CONCURRENCY); ToolMessages are returned in the original call order.
+        """
         last_message = state['messages'][-1]
+        user_id = config.get("configurable", {}).get("user_id")
         
         # Get tool calls from the message
         tool_calls = last_message.tool_calls if hasattr(last_message, 'tool_calls') else []
@@ -460,68 +654,16 @@ These tools automatically use the current user's ID ({user_id}), so you don't ne
         if not tool_calls:
             return {"messages": []}
         
-        # Execute tools with automatic user_id and user_role injection
-        from langchain_core.messages import ToolMessage
-        tool_messages = []
-        
         print(f"\n🔧 Executing {len(tool_calls)} tool call(s)...")
         
-        for tool_call in tool_calls:
-            tool_name = tool_call["name"]
-            tool_args = tool_call["args"].copy()
-            
-            print(f"  ├─ Tool: {tool_name}")
-            print(f"  │  Args: {tool_args}")
-            
-            # Auto-inject user_id and user_role for context-aware tools
-            context_aware_tools = [
-                'get_my_schedule', 'get_my_attendance', 'get_my_courses', 
-                'get_my_profile', 'get_my_teacher_profile'
-            ]
-            
-            if tool_name in context_aware_tools:
-                # Inject user context if not already provided
-                if 'user_id' not in tool_args and user_id:
-                    tool_args['user_id'] = user_id
-                    print(f"  │  Auto-injected user_id: {user_id}")
-                if 'user_role' not in tool_args:
-                    tool_args['user_role'] = role
-                    print(f"  │  Auto-injected user_role: {role}")
-            
-            # Find and execute the tool
-            tool_to_execute = next((t for t in tools if t.name == tool_name), None)
-            
-            if tool_to_execute:
-                try:
-                    result = await tool_to_execute.ainvoke(tool_args)
-                    print(f"  ✓ Success: {str(result)[:100]}...")
-                    tool_messages.append(
-                        ToolMessage(
-                            content=str(result),
-                            tool_call_id=tool_call["id"]
-                        )
-                    )
-                except Exception as e:
-                    error_msg = f"Error executing {tool_name}: {str(e)}"
-                    print(f"  ✗ Error: {error_msg}")
-                    tool_messages.append(
-                        ToolMessage(
-                            content=error_msg,
-                            tool_call_id=tool_call["id"]
-                        )
-                    )
-            else:
-                error_msg = f"Tool {tool_name} not found. Available tools: {[t.name for t in tools[:5]]}..."
-                print(f"  ✗ {error_msg}")
-                tool_messages.append(
-                    ToolMessage(
-                        content=error_msg,
-                        tool_call_id=tool_call["id"]
-                    )
-                )
+        semaphore = asyncio.Semaphore(AGENT_TOOL_CONCURRENCY)
+        start = time.perf_counter()
+        tool_messages = await asyncio.gather(
+            *(run_tool_call(tool_call, user_id, semaphore) for tool_call in tool_calls)
+        )
         
-        print(f"\n✓ Completed tool execution\n")
-        return {"messages": tool_messages}
+        print(f"\n✓ Completed tool execution in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+        return {"messages": list(tool_messages)}
     
     def should_continue(state: AgentState):
         """Determine if we should continue to tools or end."""
@@ -533,10 +675,12 @@ These tools automatically use the current user's ID ({user_id}), so you don't ne
     # Build workflow
     workflow = StateGraph(AgentState)
     
+    workflow.add_node("history", compact_history)  # Once per turn, before the first model call
     workflow.add_node("agent", call_model)
     workflow.add_node("tools", call_tools)  # Use custom tool executor
     
-    workflow.set_entry_point("agent")
+    workflow.set_entry_point("history")
+    workflow.add_edge("history", "agent")
     
     workflow.add_conditional_edges(
         "agent",
@@ -546,19 +690,56 @@ These tools automatically use the current user's ID ({user_id}), so you don't ne
     
     workflow.add_edge("tools", "agent")
     
-    # Compile with or without checkpointer
-    if use_checkpointer:
-        # Use in-memory checkpointer for conversation persistence
-        memory = MemorySaver()
-        compiled_graph = workflow.compile(checkpointer=memory)
-        print(f"✓ Agent compiled with memory checkpointer for role: {role}")
-    else:
-        compiled_graph = workflow.compile()
-        print(f"✓ Agent compiled without memory for role: {role}")
-    
+    compiled_graph = workflow.compile(checkpointer=checkpointer)
+    print(f"✓ Agent compiled for role: {role}")
     return compiled_graph
 
 
+# Process-wide registry of compiled graphs, one per role
+_AGENT_REGISTRY: Dict[str, Any] = {}
+
+
+def get_role_agent(user_role: str = "STUDENT"):
+    """
+    Get the shared compiled agent for a role, building it on first use.
+
+    The agent persists conversation state per thread_id in the shared database
+    checkpointer. Pass the per-request context with build_agent_config().
+    """
+    role = _normalize_role(user_role)
+    agent = _AGENT_REGISTRY.get(role)
+    if agent is None:
+        agent = build_role_graph(role, checkpointer=get_checkpointer())
+        _AGENT_REGISTRY[role] = agent
+    return agent
+
+
+def clear_agent_registry():
+    """Drop all cached role agents (e.g. after swapping the LLM)."""
+    _AGENT_REGISTRY.clear()
+
+
+def create_role_based_agent(user_role: str = "STUDENT", user_id: str = None, use_checkpointer: bool = True):
+    """
+    Create a fresh agent with tools and prompts based on user role.
+
+    Prefer get_role_agent() in request handlers; this builds a new graph on
+    every call and pins user_id/user_role onto it.
+    
+    Args:
+        user_role: User's role (ADMIN, TEACHER, STUDENT)
+        user_id: User's ID for personalized queries (automatically used in tools)
+        use_checkpointer: Whether to use memory checkpointer for conversation persistence
+    
+    Returns:
+        Compiled LangGraph workflow with optional memory
+    """
+    role = _normalize_role(user_role)
+    checkpointer = MemorySaver() if use_checkpointer else None
+    graph = build_role_graph(role, checkpointer=checkpointer)
+    return graph.with_config(configurable={"user_id": user_id, "user_role": role})
+
+
 # Convenience functions for specific roles
 def create_admin_agent(user_id: str = None, use_checkpointer: bool = True):
     """Create an agent with admin privileges"""
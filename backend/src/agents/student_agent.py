@@ -5,6 +5,7 @@ from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import ToolNode
 from src.graph.agent_state import AgentState
 from src.config.llm import llm
+from src.utils.llm_limiter import ainvoke_llm
 
 
 def create_students_agent():
@@ -13,7 +14,7 @@ def create_students_agent():
     
     llm_with_tools=llm.bind_tools(tools)
 
-    def call_model(state:AgentState):
+    async def call_model(state:AgentState):
         messages=state["messages"]
 
         if(len(messages)==1):
@@ -22,7 +23,7 @@ def create_students_agent():
                 Always provide clear and concise responses to the user.""")
             messages=[system_msg]+messages
 
-        response=llm_with_tools.invoke(messages)
+        response=await ainvoke_llm(llm_with_tools,messages)
         return {"messages":[response]}
     
     def should_continue(state:AgentState):
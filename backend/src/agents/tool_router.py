@@ -0,0 +1,109 @@
+"""
+Keyword router that narrows a role's tool list to the families a query needs.
+
+Binding every ADMIN tool sends ~60 function schemas with each model request.
+`route_query` matches the user's message against per-family regexes and
+returns the families to bind (plus closely related ones), or None when it is
+unsure - no family matched, or so many matched that narrowing would not help -
+in which case the caller binds the full tool set.
+
+Routing accuracy is measured by benchmarks/eval_tool_router.py.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern
+
+# Family -> tool names. Tools not listed in any family are always bound.
+TOOL_FAMILIES: Dict[str, FrozenSet[str]] = {
+    "self": frozenset({
+        "get_my_profile", "get_my_schedule", "get_my_attendance", "get_my_courses",
+        "get_my_teacher_profile",
+    }),
+    "departments": frozenset({
+        "list_all_departments", "get_department_by_id", "create_new_department",
+        "update_existing_department", "delete_existing_department",
+    }),
+    "students": frozenset({
+        "list_all_students", "get_student_by_id", "create_new_student",
+        "update_existing_student", "delete_existing_student",
+    }),
+    "teachers": frozenset({
+        "list_all_teachers", "get_teacher_by_id", "create_new_teacher", "update_existing_teacher",
+        "delete_existing_teacher", "get_teacher_courses", "get_teacher_courses_with_students",
+        "get_students_in_course",
+    }),
+    "courses": frozenset({
+        "list_all_courses", "get_course_by_id", "create_new_course", "update_existing_course",
+        "delete_existing_course",
+    }),
+    "enrollments": frozenset({
+        "list_all_enrollments", "get_enrollment_by_id", "get_student_enrollments_with_details",
+        "create_new_enrollment", "update_existing_enrollment", "delete_existing_enrollment",
+    }),
+    "schedules": frozenset({
+        "list_all_schedules", "get_schedule_by_details", "get_teacher_schedule",
+        "get_course_schedule", "create_new_schedule", "update_existing_schedule",
+        "delete_existing_schedule", "get_full_timetable", "get_subjects_details", "save_timetable",
+        "get_teacher_timetable_grid", "get_student_timetable_grid",
+    }),
+    "attendance": frozenset({
+        "create_class_session", "get_class_session", "get_course_sessions", "update_class_session",
+        "delete_class_session", "mark_student_attendance", "bulk_mark_student_attendance",
+        "get_student_attendance_record", "get_course_attendance_records",
+        "get_student_attendance_records", "update_student_attendance", "delete_student_attendance",
+        "get_all_students_attendance_stats", "get_at_risk_students", "mark_teacher_attendance",
+        "get_teacher_attendance_record", "get_teacher_attendance_records",
+        "update_teacher_attendance", "delete_teacher_attendance",
+        "get_all_teachers_attendance_stats", "get_teacher_attendance_trends",
+    }),
+}
+
+FAMILY_PATTERNS: Dict[str, Pattern] = {
+    family: re.compile(pattern, re.IGNORECASE)
+    for family, pattern in {
+        "self": r"\b(my|mine|myself)\b|\bi\s+(teach|take|have|am)\b",
+        "departments": r"\bdep(ar)?t(ment)?s?\b|\bfacult(y|ies)\b",
+        "students": r"\bstudents?\b|\bpupils?\b|\bS\d{2,}\b|\broll\s*(no|number)\b",
+        "teachers": r"\bteachers?\b|\bprofessors?\b|\blecturers?\b|\binstructors?\b|\bfaculty members?\b|\bT\d{2,}\b|\bwho teaches\b",
+        "courses": r"\bcourses?\b|\bsubjects?\b|\bclass(es)?\b|\bsyllabus\b|\bcredits?\b|\b[A-Z]{2,4}\s?\d{3}\b",
+        "enrollments": r"\benrol+(ment|ments|ed|ing)?\b|\bregist(er|ered|ration)\b|\bsign(ed)? up\b",
+        "schedules": r"\bschedules?\b|\btime\s?tables?\b|\bperiods?\b|\bslots?\b|\brooms?\b|\blectures? times?\b"
+                     r"|\b(monday|tuesday|wednesday|thursday|friday)\b",
+        "attendance": r"\battend(ance|ed|ing)?\b|\babsent\b|\bpresent\b|\babsences?\b|\bsessions?\b|\bmark(ed)?\b|\bat[- ]risk\b|\bdefaulters?\b",
+    }.items()
+}
+
+# Families whose tools are commonly needed to resolve IDs for another family
+RELATED_FAMILIES: Dict[str, FrozenSet[str]] = {
+    "enrollments": frozenset({"students", "courses"}),
+    "schedules": frozenset({"courses"}),
+    "attendance": frozenset({"courses"}),
+    "teachers": frozenset({"courses"}),
+}
+
+# Routing more than this many families saves too little to risk a miss
+MAX_ROUTED_FAMILIES = 4
+
+
+def route_query(text: str) -> Optional[FrozenSet[str]]:
+    """Families relevant to `text`, or None to fall back to every tool."""
+    matched = {family for family, pattern in FAMILY_PATTERNS.items() if pattern.search(text or "")}
+    if not matched or len(matched) > MAX_ROUTED_FAMILIES:
+        return None
+    families = set(matched)
+    for family in matched:
+        families |= RELATED_FAMILIES.get(family, frozenset())
+    return frozenset(families)
+
+
+def families_of(tool_names: Iterable[str]) -> FrozenSet[str]:
+    """Families that contain any of `tool_names`."""
+    names = set(tool_names)
+    return frozenset(family for family, members in TOOL_FAMILIES.items() if members & names)
+
+
+def select_tools(tools: List, families: FrozenSet[str]) -> List:
+    """Tools of `families`, plus any tool that belongs to no family."""
+    grouped = set().union(*TOOL_FAMILIES.values())
+    wanted = set().union(*(TOOL_FAMILIES.get(family, frozenset()) for family in families))
+    return [t for t in tools if t.name in wanted or t.name not in grouped]
@@ -1,12 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from src.agents.role_based_agent import create_role_based_agent
+from src.agents.role_based_agent import get_role_agent, build_agent_config
+from src.agents.fast_path import try_fast_path
+from src.graph.checkpointer import get_checkpointer
+from src.graph.history import content_text as _content_text
 from src.api.dependencies import get_current_user
 from src.models.schemas import UserResponse
 from src.services.chat_services import ChatService
 from src.config.database import prisma
-from typing import Optional
+from src.utils import metrics
+from src.utils.llm_limiter import llm_limiter, LLMOverloadedError
+from src.utils.cache import tool_cache
+from typing import Optional, List, Any
+import json
+import time
 import uuid
 
 router = APIRouter()
@@ -19,6 +28,92 @@ class QueryResponse(BaseModel):
     answer: str
     thread_id: str  # Return thread_id for session continuity
 
+
+async def _start_turn(request: QueryRequest, current_user: UserResponse, chat_service: ChatService):
+    """
+    Resolve the thread, build the graph input and persist the user message.
+
+    Returns (thread_id, input messages, run config).
+    """
+    # Extract user information from UserResponse object
+    user_id = current_user.id
+    user_role = current_user.role  # role is a property of UserResponse
+
+    # Get or create thread_id for conversation continuity
+    thread_id = request.thread_id or str(uuid.uuid4())
+
+    print(f"\n{'='*60}")
+    print(f"AGENT QUERY")
+    print(f"{'='*60}")
+    print(f"User ID: {user_id}")
+    print(f"User Role: {user_role}")
+    print(f"User Name: {current_user.name}")
+    print(f"Thread ID: {thread_id}")
+    print(f"Query: {request.query}")
+    print(f"{'='*60}\n")
+
+    current_message = HumanMessage(content=request.query)
+
+    # Threads with a stored checkpoint resume from graph state directly;
+    # only threads that predate the checkpointer are rebuilt from ChatMessage rows
+    conversation_history: List[Any] = []
+    if request.thread_id and not await get_checkpointer().has_thread(thread_id):
+        db_messages = await chat_service.get_recent_messages(thread_id, limit=10)
+        for msg in db_messages:
+            if msg.role == 'USER':
+                conversation_history.append(HumanMessage(content=msg.content))
+            elif msg.role == 'ASSISTANT':
+                conversation_history.append(AIMessage(content=msg.content))
+        print(f"📚 Seeded {len(conversation_history)} messages from conversation history")
+
+    # Add current user message
+    conversation_history.append(current_message)
+
+    # Save user message to database
+    await chat_service.create_message(
+        user_id=user_id,
+        role='USER',
+        content=request.query,
+        thread_id=thread_id
+    )
+
+    # Per-request context (thread, user) travels through the run config
+    config = build_agent_config(thread_id, user_id, user_role)
+    return thread_id, conversation_history, config
+
+
+async def _finish_turn(chat_service: ChatService, user_id: str, thread_id: str, answer: str):
+    """Persist the assistant's final answer for the thread."""
+    await chat_service.create_message(
+        user_id=user_id,
+        role='ASSISTANT',
+        content=answer,
+        thread_id=thread_id
+    )
+    print(f"Agent Response: {answer[:200]}...")  # Log first 200 chars
+    print(f"💾 Saved conversation to thread: {thread_id}\n")
+
+
+async def _answer_fast_path(request: QueryRequest, current_user: UserResponse, agent, messages: List[Any], config: dict) -> Optional[str]:
+    """
+    Answer deterministic "about me" queries without the LLM.
+
+    The turn is still appended to the thread's graph state, so follow-up
+    questions handled by the agent see it.
+    """
+    fast = await try_fast_path(request.query, current_user.id, config["configurable"]["user_role"])
+    if fast is None:
+        return None
+    _, answer = fast
+    await agent.aupdate_state(config, {"messages": [*messages, AIMessage(content=answer)]}, as_node="agent")
+    return answer
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 @router.post("/query", response_model=QueryResponse)
 async def query_with_agent(
     request: QueryRequest,
@@ -30,89 +125,108 @@ async def query_with_agent(
     Maintains conversation history across requests using thread_id.
     """
     try:
-        # Extract user information from UserResponse object
-        user_id = current_user.id
-        user_role = current_user.role  # role is a property of UserResponse
-        
-        # Get or create thread_id for conversation continuity
-        thread_id = request.thread_id or str(uuid.uuid4())
-        
-        print(f"\n{'='*60}")
-        print(f"AGENT QUERY")
-        print(f"{'='*60}")
-        print(f"User ID: {user_id}")
-        print(f"User Role: {user_role}")
-        print(f"User Name: {current_user.name}")
-        print(f"Thread ID: {thread_id}")
-        print(f"Query: {request.query}")
-        print(f"{'='*60}\n")
-        
         # Initialize chat service
         chat_service = ChatService(prisma)
-        
-        # Load conversation history if thread_id exists (limited to keep context focused)
-        conversation_history = []
-        if request.thread_id:
-            db_messages = await chat_service.get_messages(thread_id, limit=10)
-            for msg in db_messages:
-                if msg.role == 'USER':
-                    conversation_history.append(HumanMessage(content=msg.content))
-                elif msg.role == 'ASSISTANT':
-                    conversation_history.append(AIMessage(content=msg.content))
-            print(f"📚 Loaded {len(conversation_history)} messages from conversation history")
-        
-        # Add current user message to history
-        current_message = HumanMessage(content=request.query)
-        conversation_history.append(current_message)
-        
-        # Save user message to database
-        await chat_service.create_message(
-            user_id=user_id,
-            role='USER',
-            content=request.query,
-            thread_id=thread_id
-        )
-        
-        # Create role-based agent with memory checkpointer
-        agent = create_role_based_agent(user_role=user_role, user_id=user_id, use_checkpointer=True)
-        
-        # Configure the agent with thread_id for conversation persistence
-        config = {
-            "configurable": {
-                "thread_id": thread_id
-            }
-        }
-        
-        # Execute the query with full conversation history and config for checkpointer
-        result = await agent.ainvoke(
-            {"messages": conversation_history},
-            config=config
-        )
-        
-        # Extract the final response
-        final_message = result["messages"][-1]
-        
-        answer = (
-            final_message.content
-            if isinstance(final_message.content, str)
-            else final_message.content[0]["text"]
-        )
-        
-        # Save assistant response to database
-        await chat_service.create_message(
-            user_id=user_id,
-            role='ASSISTANT',
-            content=answer,
-            thread_id=thread_id
-        )
-
-        print(f"Agent Response: {answer[:200]}...")  # Log first 200 chars
-        print(f"💾 Saved conversation to thread: {thread_id}\n")
-        
+        thread_id, messages, config = await _start_turn(request, current_user, chat_service)
+
+        # Shared compiled agent for this role (built once per process)
+        agent = get_role_agent(current_user.role)
+
+        answer = await _answer_fast_path(request, current_user, agent, messages, config)
+        if answer is None:
+            # Execute the query; the checkpointer appends it to the thread's saved state
+            result = await agent.ainvoke({"messages": messages}, config=config)
+
+            # Extract the final response
+            answer = _content_text(result["messages"][-1].content)
+
+        await _finish_turn(chat_service, current_user.id, thread_id, answer)
         return QueryResponse(answer=answer, thread_id=thread_id)
-        
+
+    except LLMOverloadedError as e:
+        print(f"⚠️ Assistant overloaded: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         print(f"❌ Error processing query: {str(e)}")
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
+
+
+@router.post("/query/stream")
+async def stream_query_with_agent(
+    request: QueryRequest,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Streaming variant of /query using server-sent events.
+
+    Events: `thread` (thread_id, sent first), `tool_start` / `tool_end`,
+    `token` (incremental answer text), `done` (final answer) and `error`.
+    The final answer is persisted exactly like /query.
+    """
+    chat_service = ChatService(prisma)
+    thread_id, messages, config = await _start_turn(request, current_user, chat_service)
+    agent = get_role_agent(current_user.role)
+
+    async def event_stream():
+        started = time.perf_counter()
+        first_token_ms = None
+        yield _sse("thread", {"thread_id": thread_id})
+
+        final_message = None
+        try:
+            answer = await _answer_fast_path(request, current_user, agent, messages, config)
+            if answer is not None:
+                yield _sse("token", {"content": answer})
+                await _finish_turn(chat_service, current_user.id, thread_id, answer)
+                yield _sse("done", {"answer": answer, "thread_id": thread_id})
+                return
+
+            async for event in agent.astream_events({"messages": messages}, config=config, version="v2"):
+                kind = event["event"]
+                if kind == "on_chat_model_stream" and event["metadata"].get("langgraph_node") == "agent":
+                    text = _content_text(event["data"]["chunk"].content)
+                    if text:
+                        if first_token_ms is None:
+                            first_token_ms = (time.perf_counter() - started) * 1000
+                            metrics.record_latency("agent.stream.first_token", first_token_ms)
+                        yield _sse("token", {"content": text})
+                elif kind == "on_tool_start":
+                    yield _sse("tool_start", {"name": event["name"], "run_id": event["run_id"]})
+                elif kind == "on_tool_end":
+                    yield _sse("tool_end", {"name": event["name"], "run_id": event["run_id"]})
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    output = event["data"].get("output") or {}
+                    if isinstance(output, dict) and output.get("messages"):
+                        final_message = output["messages"][-1]
+
+            answer = _content_text(final_message.content) if final_message is not None else ""
+            await _finish_turn(chat_service, current_user.id, thread_id, answer)
+            yield _sse("done", {"answer": answer, "thread_id": thread_id})
+        except LLMOverloadedError as e:
+            print(f"⚠️ Assistant overloaded: {str(e)}")
+            yield _sse("error", {"status": 503, "detail": str(e)})
+        except Exception as e:
+            print(f"❌ Error streaming query: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            yield _sse("error", {"status": 500, "detail": f"Error processing query: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/metrics")
+async def get_agent_metrics(current_user: UserResponse = Depends(get_current_user)):
+    """Per-worker agent metrics: LLM backpressure, tool cache, latencies and counters (Admin only)."""
+    if current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return {
+        "llm_limiter": llm_limiter.snapshot(),
+        "tool_cache": tool_cache.snapshot(),
+        **metrics.snapshot(),
+    }
@@ -1,5 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional
+import hashlib
+import io
+import json
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional, Union
 from datetime import datetime
 from src.models.schemas import (
     ClassSessionCreate,
@@ -7,18 +12,44 @@ from src.models.schemas import (
     ClassSessionOut,
     StudentAttendanceCreate, 
     StudentAttendanceRead, 
+    StudentAttendanceCompact,
     StudentAttendanceUpdate,
+    StudentAttendanceUpsertResult,
+    StudentAttendanceBulkUpsertResult,
     TeacherAttendanceCreate,
     TeacherAttendanceRead,
+    TeacherAttendanceCompact,
     TeacherAttendanceUpdate
 )
 from src.services.attendance_service import AttendanceService
+from src.services.session_generation_service import SessionGenerationService
+from src.services.attendance_export_service import AttendanceExportService
+from src.services.attendance_import_service import AttendanceImportService
+from src.services.at_risk_service import AtRiskService
+from src.services.attendance_summary_service import RECENT_SESSIONS, AttendanceSummaryService
 from src.api.dependencies import get_current_user, get_db
+from src.utils.pagination import MAX_PAGE_SIZE, set_page_headers
 from src.models.schemas import UserOut
 from prisma import Prisma
 
 router = APIRouter()
 
+# `fields` query parameter of the attendance read routes
+FIELDS_PATTERN = "^(compact|full)$"
+
+# Paging query parameters shared by the session/attendance list routes
+LIMIT_QUERY = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all records if omitted")
+CURSOR_QUERY = Query(None, description="X-Next-Cursor of the previous page")
+INCLUDE_TOTAL_QUERY = Query(False, description="Also send the matching row count as X-Total-Count")
+
+
+def _view(records, fields: str, compact_model, full_model):
+    """Validate service results into the model of the requested view."""
+    model = compact_model if fields == "compact" else full_model
+    if isinstance(records, list):
+        return [model.model_validate(r) for r in records]
+    return model.model_validate(records)
+
 # ==================== CLASS SESSION ROUTES ====================
 
 @router.post("/sessions", response_model=ClassSessionOut)
@@ -33,6 +64,37 @@ async def create_class_session(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.put("/sessions", response_model=ClassSessionOut)
+async def find_or_create_class_session(
+    session: ClassSessionCreate,
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Return the course's session for that day and start time, creating it if needed (Teacher/Admin only)."""
+    try:
+        return await AttendanceService.find_or_create_class_session(session, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/sessions/materialize")
+async def materialize_class_sessions(
+    start: Optional[datetime] = Query(None, description="First day; defaults to the day after the last generated session"),
+    end: Optional[datetime] = Query(None, description="Last day (inclusive); defaults to start + weeks"),
+    weeks: int = Query(1, ge=1, le=52),
+    course_id: Optional[str] = Query(None),
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Generate ClassSessions from active schedules for a date range (Admin only)."""
+    try:
+        if current_user.role != "ADMIN":
+            raise HTTPException(status_code=403, detail="Admin access required")
+        return await SessionGenerationService.extend(db, weeks, start, end, course_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/sessions/{session_id}", response_model=ClassSessionOut)
 async def get_class_session(
     session_id: str,
@@ -53,13 +115,42 @@ async def get_class_session(
 @router.get("/sessions/course/{course_id}", response_model=List[ClassSessionOut])
 async def get_course_sessions(
     course_id: str,
+    response: Response,
     date: Optional[datetime] = Query(None),
+    limit: Optional[int] = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    include_total: bool = INCLUDE_TOTAL_QUERY,
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Get the sessions of a course, newest first."""
+    try:
+        page = await AttendanceService.page_course_sessions(course_id, date, db, cursor, limit, include_total)
+        set_page_headers(response, page)
+        return page.items
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/sessions/teacher/{teacher_id}")
+async def get_teacher_sessions(
+    teacher_id: str,
+    date_from: Optional[datetime] = Query(None, description="First session date (inclusive)"),
+    date_to: Optional[datetime] = Query(None, description="Last session date (exclusive)"),
+    status: Optional[str] = Query(None, pattern="^(SCHEDULED|CONDUCTED|CANCELLED|POSTPONED)$"),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
-    """Get all sessions for a course."""
+    """Sessions of all the teacher's courses with attendance counts, grouped by course (Teacher/Admin only)."""
     try:
-        return await AttendanceService.get_course_sessions(course_id, date, db)
+        if current_user.role != "ADMIN":
+            teacher = await db.teacher.find_unique(
+                where={'userId': current_user.id}
+            )
+            if not teacher or teacher.id != teacher_id:
+                raise HTTPException(status_code=403, detail="You can only view your own sessions")
+        return await AttendanceService.get_teacher_sessions(teacher_id, db, date_from, date_to, status)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -142,16 +233,91 @@ async def bulk_mark_attendance(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/course/{course_id}", response_model=List[StudentAttendanceRead])
+@router.put("/", response_model=StudentAttendanceUpsertResult)
+async def upsert_attendance(
+    attendance: StudentAttendanceCreate,
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Mark or overwrite a student's attendance for a session (Teacher only)."""
+    try:
+        # Get teacher record from current user
+        teacher = await db.teacher.find_unique(
+            where={'userId': current_user.id}
+        )
+        if not teacher:
+            raise HTTPException(status_code=403, detail="Only teachers can mark attendance")
+        
+        return await AttendanceService.upsert_attendance(attendance, teacher.id, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/bulk", response_model=StudentAttendanceBulkUpsertResult)
+async def bulk_upsert_attendance(
+    attendance_list: List[StudentAttendanceCreate],
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Mark or overwrite attendance for multiple students; safe to re-submit (Teacher only)."""
+    try:
+        # Get teacher record from current user
+        teacher = await db.teacher.find_unique(
+            where={'userId': current_user.id}
+        )
+        if not teacher:
+            raise HTTPException(status_code=403, detail="Only teachers can mark attendance")
+        
+        return await AttendanceService.bulk_upsert_attendance(attendance_list, teacher.id, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/import")
+async def import_attendance(
+    file: UploadFile = File(..., description="CSV with courseCode, studentId, date, startTime, status[, endTime]"),
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Import attendance from a CSV register; safe to re-run (Teacher/Admin only)."""
+    try:
+        marked_by_id = None
+        if current_user.role != "ADMIN":
+            teacher = await db.teacher.find_unique(
+                where={'userId': current_user.id}
+            )
+            if not teacher:
+                raise HTTPException(status_code=403, detail="Only teachers and admins can import attendance")
+            marked_by_id = teacher.id
+
+        lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        return await AttendanceImportService.import_csv(lines, marked_by_id, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/course/{course_id}", response_model=Union[List[StudentAttendanceCompact], List[StudentAttendanceRead]])
 async def get_course_attendance(
     course_id: str,
+    response: Response,
     date: Optional[datetime] = Query(None),
+    fields: str = Query("compact", pattern=FIELDS_PATTERN, description="compact: flat rows; full: nested student/course/session"),
+    limit: Optional[int] = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    include_total: bool = INCLUDE_TOTAL_QUERY,
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
     """Get attendance records for a course (Teacher view)."""
     try:
-        return await AttendanceService.get_course_attendance(course_id, date, db)
+        page = await AttendanceService.page_course_attendance(
+            course_id, date, db, fields, cursor, limit, include_total
+        )
+        set_page_headers(response, page)
+        return _view(page.items, fields, StudentAttendanceCompact, StudentAttendanceRead)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -197,10 +363,15 @@ async def delete_attendance(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/student/{student_id}", response_model=List[StudentAttendanceRead])
+@router.get("/student/{student_id}", response_model=Union[List[StudentAttendanceCompact], List[StudentAttendanceRead]])
 async def get_student_attendance(
     student_id: str,
+    response: Response,
     course_id: Optional[str] = Query(None),
+    fields: str = Query("compact", pattern=FIELDS_PATTERN, description="compact: flat rows; full: nested student/course/session"),
+    limit: Optional[int] = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    include_total: bool = INCLUDE_TOTAL_QUERY,
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
@@ -213,24 +384,144 @@ async def get_student_attendance(
         if student and student.id != student_id and current_user.role not in ["TEACHER", "ADMIN"]:
             raise HTTPException(status_code=403, detail="You can only view your own attendance")
         
-        return await AttendanceService.get_student_attendance(student_id, course_id, db)
+        page = await AttendanceService.page_student_attendance(
+            student_id, course_id, db, fields, cursor, limit, include_total
+        )
+        set_page_headers(response, page)
+        return _view(page.items, fields, StudentAttendanceCompact, StudentAttendanceRead)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/student/{student_id}/summary")
+async def get_student_attendance_summary(
+    student_id: str,
+    request: Request,
+    recent: int = Query(RECENT_SESSIONS, ge=0, le=100, description="Number of latest sessions to include"),
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """
+    Per-course attendance counters and the latest sessions for a student in
+    one response; `me` resolves to the caller's own student record.
+
+    Sends an ETag and answers 304 Not Modified when If-None-Match matches.
+    """
+    try:
+        student = await db.student.find_unique(
+            where={'userId': current_user.id}
+        )
+        if student_id == "me":
+            if not student:
+                raise HTTPException(status_code=404, detail="Student profile not found")
+            student_id = student.id
+        # Authorization: student can only view their own records
+        elif student and student.id != student_id and current_user.role not in ["TEACHER", "ADMIN"]:
+            raise HTTPException(status_code=403, detail="You can only view your own attendance")
+
+        summary = jsonable_encoder(await AttendanceSummaryService.get_student_overview(student_id, db, recent))
+        etag = '"' + hashlib.sha1(json.dumps(summary, sort_keys=True).encode()).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if_none_match = [t.strip().removeprefix("W/") for t in request.headers.get("if-none-match", "").split(",")]
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(content=summary, headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/export")
+async def export_attendance(
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    course_id: Optional[str] = Query(None),
+    department: Optional[str] = Query(None),
+    semester: Optional[int] = Query(None, description="Course semester"),
+    date_from: Optional[datetime] = Query(None, description="First session date (inclusive)"),
+    date_to: Optional[datetime] = Query(None, description="Last session date (exclusive)"),
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Stream flat student attendance rows as CSV or Parquet (Admin only)."""
+    if current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if format == "parquet" and not AttendanceExportService.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow on the server")
+
+    pages = AttendanceExportService.iter_pages(db, course_id, department, semester, date_from, date_to)
+    filename = f"attendance-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "parquet":
+        return StreamingResponse(
+            AttendanceExportService.stream_parquet(pages),
+            media_type="application/vnd.apache.parquet",
+            headers=headers
+        )
+    return StreamingResponse(AttendanceExportService.stream_csv(pages), media_type="text/csv", headers=headers)
+
+@router.get("/at-risk")
+async def get_at_risk_students(
+    status: Optional[str] = Query(None, pattern="^(Warning|Critical)$"),
+    department: Optional[str] = Query(None),
+    course_id: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Students below the attendance threshold per course, lowest first (Admin, or Teacher for own courses)."""
+    try:
+        teacher_id = None
+        if current_user.role != "ADMIN":
+            teacher = await db.teacher.find_unique(
+                where={'userId': current_user.id}
+            )
+            if not teacher:
+                raise HTTPException(status_code=403, detail="Only teachers and admins can view at-risk students")
+            teacher_id = teacher.id
+
+        return await AtRiskService.list_at_risk(
+            db, status=status, department=department, course_id=course_id,
+            teacher_id=teacher_id, skip=skip, limit=limit
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/at-risk/refresh")
+async def refresh_at_risk_students(
+    full: bool = Query(False, description="Rescan every summary instead of only those changed since the last run"),
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Recompute the at-risk set now (Admin only)."""
+    try:
+        if current_user.role != "ADMIN":
+            raise HTTPException(status_code=403, detail="Admin access required")
+        result = await AtRiskService.refresh(db, full=full)
+        if result is None:
+            raise HTTPException(status_code=409, detail="An at-risk refresh is already running")
+        return result
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/{attendance_id}", response_model=StudentAttendanceRead)
+@router.get("/{attendance_id}", response_model=Union[StudentAttendanceRead, StudentAttendanceCompact])
 async def get_attendance(
     attendance_id: str,
+    fields: str = Query("full", pattern=FIELDS_PATTERN),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
     """Get a specific attendance record by ID."""
     try:
-        record = await AttendanceService.get_attendance_by_id(attendance_id, db)
+        record = await AttendanceService.get_attendance_by_id(attendance_id, db, fields)
         if not record:
             raise HTTPException(status_code=404, detail="Attendance record not found")
-        return record
+        return _view(record, fields, StudentAttendanceCompact, StudentAttendanceRead)
     except HTTPException:
         raise
     except Exception as e:
@@ -238,14 +529,20 @@ async def get_attendance(
 
 @router.get("/statistics/students")
 async def get_all_students_attendance(
+    department: Optional[str] = Query(None, description="Filter by department"),
+    semester: Optional[int] = Query(None, description="Filter by semester"),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (all students if omitted)"),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
-    """Get attendance statistics for all students (Admin only)."""
+    """Get attendance statistics for all students, paginated by student ID (Admin only)."""
     try:
         if current_user.role != "ADMIN":
             raise HTTPException(status_code=403, detail="Admin access required")
-        return await AttendanceService.get_all_students_attendance(db)
+        return await AttendanceService.get_all_students_attendance(
+            db, department=department, semester=semester, skip=skip, limit=limit
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -277,10 +574,15 @@ async def mark_teacher_attendance(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/teacher/{teacher_id}", response_model=List[TeacherAttendanceRead])
+@router.get("/teacher/{teacher_id}", response_model=Union[List[TeacherAttendanceCompact], List[TeacherAttendanceRead]])
 async def get_teacher_attendance(
     teacher_id: str,
+    response: Response,
     course_id: Optional[str] = Query(None),
+    fields: str = Query("compact", pattern=FIELDS_PATTERN, description="compact: flat rows; full: nested teacher/course/session"),
+    limit: Optional[int] = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    include_total: bool = INCLUDE_TOTAL_QUERY,
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
@@ -293,7 +595,11 @@ async def get_teacher_attendance(
         if teacher and teacher.id != teacher_id and current_user.role != "ADMIN":
             raise HTTPException(status_code=403, detail="You can only view your own attendance")
         
-        return await AttendanceService.get_teacher_attendance(teacher_id, course_id, db)
+        page = await AttendanceService.page_teacher_attendance(
+            teacher_id, course_id, db, fields, cursor, limit, include_total
+        )
+        set_page_headers(response, page)
+        return _view(page.items, fields, TeacherAttendanceCompact, TeacherAttendanceRead)
     except HTTPException:
         raise
     except Exception as e:
@@ -353,4 +659,24 @@ async def get_all_teachers_attendance(
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+@router.get("/statistics/teachers/trends")
+async def get_teacher_attendance_trends(
+    period: str = Query("week", pattern="^(week|month)$"),
+    periods: int = Query(12, ge=1, le=104, description="Number of periods up to and including the current one"),
+    teacher_id: Optional[str] = Query(None),
+    department: Optional[str] = Query(None),
+    current_user: UserOut = Depends(get_current_user),
+    db: Prisma = Depends(get_db)
+):
+    """Conducted vs missed sessions per teacher per week or month (Admin only)."""
+    try:
+        if current_user.role != "ADMIN":
+            raise HTTPException(status_code=403, detail="Admin access required")
+        return await AttendanceService.get_teacher_attendance_trends(
+            db, period=period, periods=periods, teacher_id=teacher_id, department=department
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
 from src.models.schemas import CourseCreate, CourseUpdate, CourseOut
 from prisma.models import Course
 from src.services.course_service import CourseService
 from src.config.database import prisma
+from src.utils.pagination import MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
@@ -16,9 +17,19 @@ async def create_course(course: CourseCreate):
     return complete_course
 
 @router.get("/", response_model=List[Course])
-async def get_courses():
+async def get_courses(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all courses if omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Also send the matching row count as X-Total-Count")
+):
     course_service = CourseService(prisma)
-    return await course_service.get_all_courses()
+    try:
+        page = await course_service.page_courses(cursor, limit, include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_headers(response, page)
+    return page.items
 
 @router.get("/{course_id}", response_model=Course)
 async def get_course(course_id: str):
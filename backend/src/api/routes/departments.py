@@ -1,15 +1,26 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Optional
 from src.services.department_service import DepartmentService
 from src.models.schemas import DepartmentSchema, DepartmentCreate, DepartmentUpdate
 from src.config.database import prisma
+from src.utils.pagination import MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
 @router.get("", response_model=list[DepartmentSchema])
-async def get_departments():
+async def get_departments(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all departments if omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Also send the matching row count as X-Total-Count")
+):
     department_service = DepartmentService(prisma)
-    departments = await department_service.list_departments()
-    return departments
+    try:
+        page = await department_service.page_departments(cursor, limit, include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_headers(response, page)
+    return page.items
 
 @router.get("/{department_id}", response_model=DepartmentSchema)
 async def get_department(department_id: str):
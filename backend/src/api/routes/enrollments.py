@@ -1,19 +1,28 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import List, Optional
 from src.models.schemas import EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse, EnrollmentOut
 from src.services.enrollment_service import EnrollmentService
 from src.api.dependencies import get_current_user
 from src.config.database import prisma
+from src.utils.pagination import MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
 @router.get("/", response_model=List[EnrollmentOut])
-async def get_all_enrollments(skip: int = 0, limit: int = 100, current_user: str = Depends(get_current_user)):
-    """Get all enrollments with student and course details"""
+async def get_all_enrollments(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Also send the matching row count as X-Total-Count"),
+    current_user: str = Depends(get_current_user)
+):
+    """Get all enrollments with student and course details, newest first"""
     enrollment_service = EnrollmentService(prisma)
     try:
-        enrollments = await enrollment_service.list_enrollments_with_details(skip, limit)
-        return enrollments
+        page = await enrollment_service.list_enrollments_with_details(skip, limit, cursor, include_total)
+        set_page_headers(response, page)
+        return page.items
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
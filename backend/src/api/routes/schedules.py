@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import List, Optional
 from src.models.schemas import (
     ScheduleCreate, 
@@ -9,6 +9,7 @@ from src.models.schemas import (
 from src.services.schedule_service import ScheduleService
 from src.api.dependencies import get_current_user
 from src.config.database import prisma
+from src.utils.pagination import MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
@@ -118,12 +119,23 @@ async def create_schedule(schedule: ScheduleCreate, current_user: str = Depends(
 
 @router.get("/", response_model=List[ScheduleResponse])
 async def get_schedules(
+    response: Response,
     courseId: Optional[str] = None,
     teacherId: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all schedules in timetable order if omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Also send the matching row count as X-Total-Count"),
     current_user: str = Depends(get_current_user)
 ):
     schedule_service = ScheduleService(prisma)
-    return await schedule_service.get_schedules(course_id=courseId, teacher_id=teacherId)
+    if limit is None and cursor is None and not include_total:
+        return await schedule_service.get_schedules(course_id=courseId, teacher_id=teacherId)
+    try:
+        page = await schedule_service.page_schedules(courseId, teacherId, cursor, limit, include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_headers(response, page)
+    return page.items
 
 @router.get("/{schedule_id}", response_model=ScheduleResponse)
 async def get_schedule(schedule_id: str, current_user: str = Depends(get_current_user)):
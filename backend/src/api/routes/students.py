@@ -1,17 +1,29 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import Optional
 from src.models.schemas import StudentCreate,StudentResponse, StudentUpdate, StudentOut, StudentUserCreate,UserCreate
 from src.services.student_service import StudentService
 from src.api.dependencies import get_current_user
 from src.config.database import prisma
 from src.services.user_service import UserService
+from src.utils.pagination import MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
 @router.get("/", response_model=list[StudentOut])
-async def get_students(skip: int = 0, limit: int = 10):
+async def get_students(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Also send the matching row count as X-Total-Count")
+):
     student_service = StudentService(prisma)
-    students = await student_service.list_students()
-    return students[skip:skip+limit]
+    try:
+        page = await student_service.page_students(cursor, limit, skip, include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_headers(response, page)
+    return page.items
 
 @router.get("/id/{id}", response_model=StudentOut)
 async def get_student_by_uuid(id: str):
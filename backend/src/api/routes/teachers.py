@@ -1,23 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from src.models.schemas import TeacherCreate, TeacherUpdate, TeacherResponse,UserResponse,TeacherOut,UserCreate,TeacherCreateWithUser
 from src.services.teacher_service import TeacherService
 from src.services.user_service import UserService
 from src.api.dependencies import get_current_user
 from src.config.database import prisma
-from typing import List
+from typing import List, Optional
 from prisma.models import Course
+from src.utils.pagination import MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
 @router.get("/", response_model=list[TeacherOut])
 async def get_all_teachers(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all teachers if omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Also send the matching row count as X-Total-Count"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     teacher_service = TeacherService(prisma)
-    teachers = await teacher_service.list_teachers()
-    return teachers
+    try:
+        page = await teacher_service.page_teachers(cursor, limit, skip, include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_headers(response, page)
+    return page.items
 
 @router.post("/", response_model=TeacherResponse)
 async def create_teacher(teacher: TeacherCreateWithUser, current_user: UserResponse = Depends(get_current_user)):
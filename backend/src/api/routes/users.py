@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import Optional
 from src.models.schemas import UserResponse, UserCreate, UserUpdate
 from src.services.user_service import UserService
 from src.api.dependencies import get_current_user
 from src.config.database import prisma
+from src.utils.pagination import MAX_PAGE_SIZE, set_page_headers
 
 router = APIRouter()
 
@@ -25,10 +27,20 @@ async def update_current_user_profile(
         raise HTTPException(status_code=400, detail=f"Failed to update profile: {str(e)}")
 
 @router.get("/", response_model=list[UserResponse])
-async def get_users(skip: int = 0, limit: int = 10):
+async def get_users(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Also send the matching row count as X-Total-Count")
+):
     user_service = UserService(prisma)
-    users = await user_service.list_users()
-    return users[skip:skip+limit]
+    try:
+        page = await user_service.page_users(cursor, limit, skip, include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_headers(response, page)
+    return page.items
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(user_id: str):
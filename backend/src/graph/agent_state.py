@@ -1,6 +1,8 @@
 from langchain_core.messages import BaseMessage
-import operator
+from langgraph.graph.message import add_messages
 from typing import TypedDict,Annotated
 
 class AgentState(TypedDict):
-    messages:Annotated[list[BaseMessage],operator.add]
\ No newline at end of file
+    messages:Annotated[list[BaseMessage],add_messages]
+    # Rolling summary of turns folded out of `messages` (see src/graph/history.py)
+    summary:str
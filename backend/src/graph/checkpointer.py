@@ -0,0 +1,292 @@
+"""
+Durable LangGraph checkpointer backed by the application's Postgres database.
+
+Checkpoints are stored through Prisma (AgentCheckpoint / AgentCheckpointWrite),
+so every uvicorn worker sees the same conversation state for a thread_id.
+Each put prunes the thread down to the newest AGENT_CHECKPOINT_KEEP checkpoints
+and to at most AGENT_CHECKPOINT_MAX_BYTES of serialized state (the newest
+checkpoint is always kept).
+"""
+
+import base64
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from prisma import Prisma
+
+load_dotenv()
+
+# Checkpoints retained per thread (the graph only needs the latest one to resume)
+AGENT_CHECKPOINT_KEEP = int(os.getenv("AGENT_CHECKPOINT_KEEP", "5"))
+# Upper bound on serialized checkpoint bytes kept per thread
+AGENT_CHECKPOINT_MAX_BYTES = int(os.getenv("AGENT_CHECKPOINT_MAX_BYTES", str(2 * 1024 * 1024)))
+
+
+def _encode(typed: Tuple[str, bytes]) -> Tuple[str, str]:
+    type_, data = typed
+    return type_, base64.b64encode(data).decode("ascii")
+
+
+def _decode(type_: str, data: str) -> Tuple[str, bytes]:
+    return type_, base64.b64decode(data)
+
+
+class PrismaCheckpointSaver(BaseCheckpointSaver):
+    """Async-only checkpoint saver storing LangGraph checkpoints via Prisma."""
+
+    def __init__(
+        self,
+        db: Prisma,
+        keep_per_thread: int = AGENT_CHECKPOINT_KEEP,
+        max_bytes_per_thread: int = AGENT_CHECKPOINT_MAX_BYTES,
+    ):
+        super().__init__()
+        self.db = db
+        self.keep_per_thread = max(1, keep_per_thread)
+        self.max_bytes_per_thread = max_bytes_per_thread
+
+    # ==================== READ ====================
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Load a specific checkpoint, or the latest one for the thread."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        where = {"threadId": thread_id, "checkpointNs": checkpoint_ns}
+        if checkpoint_id := get_checkpoint_id(config):
+            where["checkpointId"] = checkpoint_id
+
+        row = await self.db.agentcheckpoint.find_first(
+            where=where,
+            order={"checkpointId": "desc"}
+        )
+        if not row:
+            return None
+        return await self._to_tuple(row)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """List checkpoints newest first, optionally filtered by metadata."""
+        where: Dict[str, Any] = {}
+        if config:
+            where["threadId"] = config["configurable"]["thread_id"]
+            if config["configurable"].get("checkpoint_ns") is not None:
+                where["checkpointNs"] = config["configurable"]["checkpoint_ns"]
+            if checkpoint_id := get_checkpoint_id(config):
+                where["checkpointId"] = checkpoint_id
+        if before and (before_id := get_checkpoint_id(before)):
+            where["checkpointId"] = {"lt": before_id}
+
+        rows = await self.db.agentcheckpoint.find_many(
+            where=where,
+            order={"checkpointId": "desc"}
+        )
+        yielded = 0
+        for row in rows:
+            if limit is not None and yielded >= limit:
+                break
+            item = await self._to_tuple(row)
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            yielded += 1
+            yield item
+
+    async def has_thread(self, thread_id: str) -> bool:
+        """Cheap existence check that does not load checkpoint payloads."""
+        count = await self.db.agentcheckpoint.count(where={"threadId": thread_id})
+        return count > 0
+
+    # ==================== WRITE ====================
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a full checkpoint (including channel values) and prune the thread."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_type, checkpoint_data = _encode(self.serde.dumps_typed(checkpoint))
+        metadata_type, metadata_data = _encode(
+            self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        )
+        data = {
+            "parentCheckpointId": config["configurable"].get("checkpoint_id"),
+            "type": checkpoint_type,
+            "checkpoint": checkpoint_data,
+            "metadataType": metadata_type,
+            "metadata": metadata_data,
+            "sizeBytes": len(checkpoint_data) + len(metadata_data),
+        }
+        await self.db.agentcheckpoint.upsert(
+            where={
+                "threadId_checkpointNs_checkpointId": {
+                    "threadId": thread_id,
+                    "checkpointNs": checkpoint_ns,
+                    "checkpointId": checkpoint["id"],
+                }
+            },
+            data={
+                "create": {
+                    "threadId": thread_id,
+                    "checkpointNs": checkpoint_ns,
+                    "checkpointId": checkpoint["id"],
+                    **data,
+                },
+                "update": data,
+            }
+        )
+        await self._prune(thread_id, checkpoint_ns)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store pending writes for a checkpoint; special writes overwrite in place."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        regular: List[Dict[str, Any]] = []
+        for idx, (channel, value) in enumerate(writes):
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            value_type, value_data = _encode(self.serde.dumps_typed(value))
+            row = {
+                "threadId": thread_id,
+                "checkpointNs": checkpoint_ns,
+                "checkpointId": checkpoint_id,
+                "taskId": task_id,
+                "taskPath": task_path,
+                "idx": write_idx,
+                "channel": channel,
+                "type": value_type,
+                "value": value_data,
+            }
+            if write_idx >= 0:
+                regular.append(row)
+            else:
+                await self.db.agentcheckpointwrite.upsert(
+                    where={
+                        "threadId_checkpointNs_checkpointId_taskId_idx": {
+                            "threadId": thread_id,
+                            "checkpointNs": checkpoint_ns,
+                            "checkpointId": checkpoint_id,
+                            "taskId": task_id,
+                            "idx": write_idx,
+                        }
+                    },
+                    data={
+                        "create": row,
+                        "update": {"channel": channel, "type": value_type, "value": value_data},
+                    }
+                )
+        if regular:
+            await self.db.agentcheckpointwrite.create_many(data=regular, skip_duplicates=True)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes for a thread."""
+        await self.db.agentcheckpointwrite.delete_many(where={"threadId": thread_id})
+        await self.db.agentcheckpoint.delete_many(where={"threadId": thread_id})
+
+    # ==================== HELPERS ====================
+
+    async def _to_tuple(self, row) -> CheckpointTuple:
+        writes = await self.db.agentcheckpointwrite.find_many(
+            where={
+                "threadId": row.threadId,
+                "checkpointNs": row.checkpointNs,
+                "checkpointId": row.checkpointId,
+            }
+        )
+        writes.sort(key=lambda w: (w.taskPath, w.taskId, w.idx))
+        config = {
+            "configurable": {
+                "thread_id": row.threadId,
+                "checkpoint_ns": row.checkpointNs,
+                "checkpoint_id": row.checkpointId,
+            }
+        }
+        parent_config = None
+        if row.parentCheckpointId:
+            parent_config = {
+                "configurable": {
+                    "thread_id": row.threadId,
+                    "checkpoint_ns": row.checkpointNs,
+                    "checkpoint_id": row.parentCheckpointId,
+                }
+            }
+        return CheckpointTuple(
+            config=config,
+            checkpoint=self.serde.loads_typed(_decode(row.type, row.checkpoint)),
+            metadata=self.serde.loads_typed(_decode(row.metadataType, row.metadata)),
+            parent_config=parent_config,
+            pending_writes=[
+                (w.taskId, w.channel, self.serde.loads_typed(_decode(w.type, w.value)))
+                for w in writes
+            ],
+        )
+
+    async def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Drop checkpoints beyond the per-thread count and size caps."""
+        rows = await self.db.query_raw(
+            'SELECT "checkpointId", "sizeBytes" FROM "AgentCheckpoint" '
+            'WHERE "threadId" = $1 AND "checkpointNs" = $2 '
+            'ORDER BY "checkpointId" DESC',
+            thread_id,
+            checkpoint_ns,
+        )
+        stale: List[str] = []
+        total_bytes = 0
+        for position, row in enumerate(rows):
+            total_bytes += row["sizeBytes"]
+            if position == 0:
+                continue
+            if position >= self.keep_per_thread or total_bytes > self.max_bytes_per_thread:
+                stale.append(row["checkpointId"])
+        if not stale:
+            return
+
+        where = {"threadId": thread_id, "checkpointNs": checkpoint_ns, "checkpointId": {"in": stale}}
+        await self.db.agentcheckpointwrite.delete_many(where=where)
+        await self.db.agentcheckpoint.delete_many(where=where)
+
+
+_checkpointer: Optional[PrismaCheckpointSaver] = None
+
+
+def get_checkpointer() -> PrismaCheckpointSaver:
+    """Shared checkpointer bound to the application's Prisma client."""
+    global _checkpointer
+    if _checkpointer is None:
+        from src.config.database import prisma
+        _checkpointer = PrismaCheckpointSaver(prisma)
+    return _checkpointer
@@ -0,0 +1,122 @@
+"""
+Token-budgeted conversation history with a rolling summary.
+
+Graph state keeps the recent turns verbatim. When they grow past
+AGENT_HISTORY_TOKEN_BUDGET, the oldest whole turns (a user message plus the
+tool calls and answers that followed it) are folded into `summary` and removed
+from state, keeping roughly AGENT_HISTORY_KEEP_TOKENS of recent turns. The
+summary is part of the checkpointed state, so it is computed once and reused
+on every later turn; per-turn prompt size stays bounded however long the
+thread gets.
+"""
+
+import os
+from typing import Any, List, Tuple
+
+from dotenv import load_dotenv
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from src.utils.tool_output import estimate_tokens
+
+load_dotenv()
+
+# Recent history (excluding system prompt and summary) allowed before folding
+AGENT_HISTORY_TOKEN_BUDGET = int(os.getenv("AGENT_HISTORY_TOKEN_BUDGET", "4000"))
+# Recent history kept verbatim after folding; the gap avoids re-summarizing every turn
+AGENT_HISTORY_KEEP_TOKENS = int(os.getenv("AGENT_HISTORY_KEEP_TOKENS", "2000"))
+AGENT_SUMMARY_MAX_WORDS = int(os.getenv("AGENT_SUMMARY_MAX_WORDS", "150"))
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an academic assistant.
+Update the summary with the new messages below. Keep names, IDs (student, teacher, course codes),
+dates, decisions and anything the user asked to be remembered. Drop greetings and raw tool output.
+Write at most {max_words} words of plain text.
+
+Current summary:
+{summary}
+
+New messages:
+{transcript}"""
+
+
+def content_text(content: Any) -> str:
+    """Flatten LangChain message content (str or list of parts) to text."""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for part in content or []:
+        if isinstance(part, str):
+            parts.append(part)
+        elif isinstance(part, dict) and part.get("type", "text") == "text":
+            parts.append(part.get("text", ""))
+    return "".join(parts)
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """Rough token count of a message, including tool call arguments."""
+    tokens = estimate_tokens(content_text(message.content))
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_tokens(f"{tool_call['name']}{tool_call['args']}")
+    return tokens + 4
+
+
+def split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+    """Group messages into turns, each starting at a user message."""
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, SystemMessage):
+            continue
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def history_tokens(messages: List[BaseMessage]) -> int:
+    return sum(message_tokens(m) for m in messages if not isinstance(m, SystemMessage))
+
+
+def split_for_budget(messages: List[BaseMessage], keep_tokens: int) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+    """
+    Split history into (older, recent) on turn boundaries.
+
+    `recent` holds the newest turns that fit in `keep_tokens`; the latest turn
+    is always kept, even when it alone exceeds the budget.
+    """
+    turns = split_turns(messages)
+    recent: List[List[BaseMessage]] = []
+    used = 0
+    for turn in reversed(turns):
+        cost = sum(message_tokens(m) for m in turn)
+        if recent and used + cost > keep_tokens:
+            break
+        recent.insert(0, turn)
+        used += cost
+    older = turns[: len(turns) - len(recent)]
+    return [m for t in older for m in t], [m for t in recent for m in t]
+
+
+def transcript(messages: List[BaseMessage]) -> str:
+    """Plain-text transcript for the summarizer (tool output abbreviated)."""
+    lines = []
+    for message in messages:
+        content = content_text(message.content)
+        if message.type == "tool":
+            lines.append(f"[tool result] {content[:300]}")
+        elif message.type == "ai":
+            calls = ", ".join(tc["name"] for tc in getattr(message, "tool_calls", None) or [])
+            if calls:
+                lines.append(f"assistant called: {calls}")
+            if content:
+                lines.append(f"assistant: {content}")
+        else:
+            lines.append(f"user: {content}")
+    return "\n".join(lines)
+
+
+def summary_request(summary: str, older: List[BaseMessage]) -> List[Any]:
+    """Messages asking the model to fold `older` into `summary`."""
+    return [HumanMessage(content=SUMMARY_PROMPT.format(
+        max_words=AGENT_SUMMARY_MAX_WORDS,
+        summary=summary or "(none)",
+        transcript=transcript(older),
+    ))]
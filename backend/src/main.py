@@ -1,7 +1,8 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from src.config.database import connect_db, disconnect_db
+from src.config.database import connect_db, disconnect_db, prisma
 from src.api.routes import (
     admin,
     attendance,
@@ -18,12 +19,26 @@ from src.api.routes import (
     conversations
 )
 from src.middleware.error_handler import error_handler
+from src.agents.role_based_agent import ROLE_TOOLS, get_role_agent
+from src.services.at_risk_service import AT_RISK_REFRESH_SECONDS, AtRiskService
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan - startup and shutdown"""
     await connect_db()
+    # Compile the shared role agents up front instead of on the first chat
+    for role in ROLE_TOOLS:
+        get_role_agent(role)
+    at_risk_job = None
+    if AT_RISK_REFRESH_SECONDS > 0:
+        at_risk_job = asyncio.create_task(AtRiskService.run_forever(prisma, AT_RISK_REFRESH_SECONDS))
     yield
+    if at_risk_job:
+        at_risk_job.cancel()
+        try:
+            await at_risk_job
+        except asyncio.CancelledError:
+            pass
     await disconnect_db()
 
 # Initialize FastAPI app
@@ -46,6 +61,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paging metadata of list routes and the ETag of cacheable reads
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
 )
 
 
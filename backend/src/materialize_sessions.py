@@ -0,0 +1,43 @@
+"""
+Generate ClassSessions from active Schedules.
+
+With no arguments, extends the generated sessions by one week starting the day
+after the last generated one (or today). Safe to re-run: existing
+(course, date, start time) sessions are skipped.
+
+    cd backend
+    python -m src.materialize_sessions                      # next week
+    python -m src.materialize_sessions --weeks 4
+    python -m src.materialize_sessions --from 2026-01-05 --to 2026-05-01
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from prisma import Prisma
+
+from src.services.session_generation_service import SessionGenerationService
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--from", dest="start", type=datetime.fromisoformat, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=datetime.fromisoformat, help="last day, inclusive (YYYY-MM-DD)")
+    parser.add_argument("--weeks", type=int, default=1, help="weeks to generate when --to is not given")
+    parser.add_argument("--course", dest="course_id", help="only this course (internal ID)")
+    args = parser.parse_args()
+
+    prisma = Prisma()
+    await prisma.connect()
+    try:
+        result = await SessionGenerationService.extend(prisma, args.weeks, args.start, args.end, args.course_id)
+        print(
+            f"✅ {result['from'].date()}..{result['to'].date()}: {result['created']} sessions created, "
+            f"{result['existing']} already existed, {result['skippedNoTeacher']} slots without a teacher"
+        )
+    finally:
+        await prisma.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -467,7 +467,7 @@ class StudentAttendanceRead(BaseModel):
     studentId: str
     courseId: str
     status: str
-    markedById: str
+    markedById: Optional[str] = None  # null for admin imports
     remarks: Optional[str] = None
     markedAt: datetime
     updatedAt: datetime
@@ -478,6 +478,25 @@ class StudentAttendanceRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+# Flat row for list views (fields=compact): names and session slot instead of nested objects
+class StudentAttendanceCompact(BaseModel):
+    id: str
+    sessionId: str
+    studentId: str
+    courseId: str
+    status: str
+    markedById: Optional[str] = None
+    remarks: Optional[str] = None
+    markedAt: datetime
+    updatedAt: datetime
+    studentIdNumber: str
+    studentName: str
+    courseCode: str
+    courseName: str
+    sessionDate: datetime
+    startTime: str
+    endTime: str
 class StudentAttendanceCreate(BaseModel):
     sessionId: str
     studentId: str
@@ -488,6 +507,18 @@ class StudentAttendanceUpdate(BaseModel):
     status: Optional[str] = None
     remarks: Optional[str] = None
 
+class StudentAttendanceUpsertResult(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
+    record: StudentAttendanceRead
+
+class StudentAttendanceBulkUpsertResult(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
+    records: List[StudentAttendanceRead]
+
 class StudentAttendanceResponse(StudentAttendanceBase):
     id: str
     markedById: str
@@ -533,6 +564,24 @@ class TeacherAttendanceRead(BaseModel):
     class Config:
         from_attributes = True
 
+class TeacherAttendanceCompact(BaseModel):
+    id: str
+    sessionId: str
+    teacherId: Optional[str] = None
+    courseId: str
+    status: str
+    markedById: str
+    remarks: Optional[str] = None
+    markedAt: datetime
+    updatedAt: datetime
+    teacherIdNumber: Optional[str] = None
+    teacherName: Optional[str] = None
+    courseCode: str
+    courseName: str
+    sessionDate: datetime
+    startTime: str
+    endTime: str
+
 class TeacherAttendanceResponse(TeacherAttendanceBase):
     id: str
     markedById: str
@@ -0,0 +1,39 @@
+"""
+Recompute AttendanceSummary / TeacherAttendanceSummary from the raw attendance tables.
+
+The summaries are kept up to date by AttendanceService writes; run this after
+seeding or bulk-loading attendance directly into the database. The at-risk
+list is recomputed from the rebuilt summaries afterwards:
+
+    cd backend
+    python -m src.rebuild_attendance_summary
+"""
+
+import asyncio
+from prisma import Prisma
+
+from src.services.at_risk_service import AtRiskService
+from src.services.attendance_summary_service import AttendanceSummaryService
+
+
+async def main():
+    prisma = Prisma()
+    await prisma.connect()
+    try:
+        counts = await AttendanceSummaryService.rebuild(prisma)
+        print(
+            f"✅ Rebuilt attendance summaries: {counts['studentSummaries']} student rows, "
+            f"{counts['teacherSummaries']} teacher rows"
+        )
+        # Full run: summaries dropped by the rebuild leave no changed row for the incremental job
+        at_risk = await AtRiskService.refresh(prisma, full=True)
+        if at_risk is None:
+            print("⚠️ At-risk refresh already running elsewhere; run POST /api/attendance/at-risk/refresh?full=true")
+        else:
+            print(f"🚩 At-risk students recomputed: {at_risk['upserted']} upserted, {at_risk['removed']} removed")
+    finally:
+        await prisma.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from prisma import Prisma
+
+from src.services.attendance_summary_service import GOOD_ATTENDANCE_THRESHOLD, WARNING_ATTENDANCE_THRESHOLD
+
+load_dotenv()
+
+# Seconds between refreshes of the at-risk set; 0 disables the background job
+AT_RISK_REFRESH_SECONDS = float(os.getenv("AT_RISK_REFRESH_SECONDS", "300"))
+
+JOB_NAME = "at_risk_students"
+
+# Summaries changed since the last run (minus a margin for transactions that
+# were still open when it read), or all of them on the first run
+_CHANGED = """
+    sm."updatedAt" > COALESCE(
+        (SELECT "watermark" - INTERVAL '1 minute' FROM "JobState" WHERE "name" = $1),
+        '-infinity'::timestamp
+    )
+"""
+
+_UPSERT_SQL = f"""
+    INSERT INTO "AtRiskStudent" ("id", "studentId", "courseId", "total", "present", "attendancePercentage", "status", "updatedAt")
+    SELECT gen_random_uuid()::text, sm."studentId", sm."courseId", sm."total", sm."present",
+           ROUND(sm."present" * 100.0 / sm."total", 2)::float8,
+           CASE WHEN sm."present" * 100.0 / sm."total" >= $2 THEN 'Warning' ELSE 'Critical' END,
+           CURRENT_TIMESTAMP
+    FROM "AttendanceSummary" sm
+    WHERE {_CHANGED}
+      AND sm."total" > 0 AND sm."present" * 100.0 / sm."total" < $3
+    ON CONFLICT ("studentId", "courseId") DO UPDATE
+    SET "total" = EXCLUDED."total", "present" = EXCLUDED."present",
+        "attendancePercentage" = EXCLUDED."attendancePercentage", "status" = EXCLUDED."status",
+        "updatedAt" = CURRENT_TIMESTAMP
+"""
+
+_DELETE_RECOVERED_SQL = f"""
+    DELETE FROM "AtRiskStudent" r
+    USING "AttendanceSummary" sm
+    WHERE sm."studentId" = r."studentId" AND sm."courseId" = r."courseId"
+      AND {_CHANGED}
+      AND (sm."total" = 0 OR sm."present" * 100.0 / sm."total" >= $2)
+"""
+
+# Only needed on full runs: summaries removed by a rebuild leave no changed row behind
+_DELETE_ORPHANS_SQL = """
+    DELETE FROM "AtRiskStudent" r
+    WHERE NOT EXISTS (
+        SELECT 1 FROM "AttendanceSummary" sm
+        WHERE sm."studentId" = r."studentId" AND sm."courseId" = r."courseId"
+    )
+"""
+
+_SAVE_WATERMARK_SQL = """
+    INSERT INTO "JobState" ("name", "watermark", "updatedAt")
+    VALUES ($1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT ("name") DO UPDATE SET "watermark" = CURRENT_TIMESTAMP, "updatedAt" = CURRENT_TIMESTAMP
+"""
+
+
+class AtRiskService:
+    """
+    Maintains AtRiskStudent: (student, course) pairs whose attendance is
+    below GOOD_ATTENDANCE_THRESHOLD, with their Warning/Critical band.
+
+    Each refresh only looks at AttendanceSummary rows updated since the
+    previous run (indexed on updatedAt), so readers get a precomputed list
+    and the job's cost follows the write rate, not the table size.
+    """
+
+    @staticmethod
+    async def refresh(db: Prisma, full: bool = False) -> Optional[Dict[str, int]]:
+        """
+        Bring the at-risk set up to date; `full` rescans every summary.
+
+        Returns the number of rows upserted/removed, or None when another
+        worker is already running the refresh.
+        """
+        async with db.tx() as tx:
+            locked = await tx.query_raw(
+                'SELECT pg_try_advisory_xact_lock(hashtext($1)) AS "locked"', JOB_NAME
+            )
+            if not locked[0]['locked']:
+                return None
+
+            orphans = 0
+            if full:
+                await tx.execute_raw('DELETE FROM "JobState" WHERE "name" = $1', JOB_NAME)
+                orphans = await tx.execute_raw(_DELETE_ORPHANS_SQL)
+            upserted = await tx.execute_raw(
+                _UPSERT_SQL, JOB_NAME, WARNING_ATTENDANCE_THRESHOLD, GOOD_ATTENDANCE_THRESHOLD
+            )
+            removed = await tx.execute_raw(_DELETE_RECOVERED_SQL, JOB_NAME, GOOD_ATTENDANCE_THRESHOLD)
+            # CURRENT_TIMESTAMP is the transaction start, so nothing committed later is skipped
+            await tx.execute_raw(_SAVE_WATERMARK_SQL, JOB_NAME)
+
+        return {'upserted': upserted, 'removed': removed + orphans}
+
+    @staticmethod
+    async def run_forever(db: Prisma, interval: float = AT_RISK_REFRESH_SECONDS):
+        """Background loop started from the app lifespan; errors are logged and retried next tick."""
+        while True:
+            try:
+                result = await AtRiskService.refresh(db)
+                if result and (result['upserted'] or result['removed']):
+                    print(f"🚩 At-risk students refreshed: {result['upserted']} upserted, {result['removed']} removed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ At-risk refresh failed: {str(e)}")
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    async def list_at_risk(
+        db: Prisma,
+        status: Optional[str] = None,
+        department: Optional[str] = None,
+        course_id: Optional[str] = None,
+        teacher_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Dict]:
+        """Current at-risk (student, course) pairs, lowest attendance first."""
+        where: Dict = {}
+        if status:
+            where['status'] = status
+        if department:
+            where['student'] = {'is': {'department': department}}
+        if course_id:
+            where['courseId'] = course_id
+        if teacher_id:
+            where['course'] = {'is': {'teacherId': teacher_id}}
+
+        rows = await db.atriskstudent.find_many(
+            where=where,
+            include={'student': {'include': {'user': True}}, 'course': True},
+            order={'attendancePercentage': 'asc'},
+            skip=skip,
+            take=limit
+        )
+        return [
+            {
+                'studentId': r.studentId,
+                'studentIdNumber': r.student.studentId if r.student else None,
+                'studentName': r.student.user.name if r.student and r.student.user else None,
+                'department': r.student.department if r.student else None,
+                'courseId': r.courseId,
+                'courseCode': r.course.courseCode if r.course else None,
+                'courseName': r.course.courseName if r.course else None,
+                'totalClasses': r.total,
+                'presentClasses': r.present,
+                'attendancePercentage': r.attendancePercentage,
+                'status': r.status,
+                'updatedAt': r.updatedAt,
+            }
+            for r in rows
+        ]
@@ -0,0 +1,158 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from prisma import Prisma
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+EXPORT_PAGE_SIZE = 5000
+
+# Flat export columns, in file order
+EXPORT_COLUMNS = [
+    'attendanceId', 'sessionDate', 'startTime', 'courseCode', 'courseName', 'courseSemester',
+    'studentId', 'studentName', 'department', 'studentSemester', 'status', 'remarks', 'markedAt',
+]
+
+# Keyset page over StudentAttendance.id; NULL filters are ignored
+_PAGE_SQL = """
+    SELECT
+        a."id" AS "attendanceId",
+        cs."date" AS "sessionDate",
+        cs."startTime",
+        c."courseCode",
+        c."courseName",
+        c."semester" AS "courseSemester",
+        s."studentId",
+        u."name" AS "studentName",
+        s."department",
+        s."semester" AS "studentSemester",
+        a."status"::text AS "status",
+        a."remarks",
+        a."markedAt"
+    FROM "StudentAttendance" a
+    JOIN "ClassSession" cs ON cs."id" = a."sessionId"
+    JOIN "Course" c ON c."id" = a."courseId"
+    JOIN "Student" s ON s."id" = a."studentId"
+    JOIN "User" u ON u."id" = s."userId"
+    WHERE a."id" > $1
+      AND ($2::text IS NULL OR a."courseId" = $2)
+      AND ($3::text IS NULL OR s."department" = $3)
+      AND ($4::int IS NULL OR c."semester" = $4)
+      AND ($5::timestamp IS NULL OR cs."date" >= $5)
+      AND ($6::timestamp IS NULL OR cs."date" < $6)
+    ORDER BY a."id"
+    LIMIT $7
+"""
+
+
+class _ChunkSink:
+    """Write-only file object that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class AttendanceExportService:
+    """
+    Streams flat student attendance rows as CSV or Parquet.
+
+    Rows are read in keyset-paginated pages (WHERE id > last id ORDER BY id),
+    so each page is an index range scan and memory stays at one page no
+    matter how large the export is.
+    """
+
+    @staticmethod
+    def parquet_available() -> bool:
+        return pq is not None
+
+    @staticmethod
+    async def iter_pages(
+        db: Prisma,
+        course_id: Optional[str] = None,
+        department: Optional[str] = None,
+        semester: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        page_size: int = EXPORT_PAGE_SIZE
+    ) -> AsyncIterator[List[Dict]]:
+        """Yield pages of flat rows; `date_to` is exclusive."""
+        last_id = ''
+        while True:
+            rows = await db.query_raw(
+                _PAGE_SQL, last_id, course_id, department, semester, date_from, date_to, page_size
+            )
+            if not rows:
+                return
+            yield rows
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]['attendanceId']
+
+    @staticmethod
+    async def stream_csv(pages: AsyncIterator[List[Dict]]) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        yield buffer.getvalue()
+        async for rows in pages:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(rows)
+            yield buffer.getvalue()
+
+    @staticmethod
+    async def stream_parquet(pages: AsyncIterator[List[Dict]]) -> AsyncIterator[bytes]:
+        """One Parquet row group per page, emitted as soon as it is written."""
+        if pq is None:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        schema = pa.schema([
+            ('attendanceId', pa.string()), ('sessionDate', pa.string()), ('startTime', pa.string()),
+            ('courseCode', pa.string()), ('courseName', pa.string()), ('courseSemester', pa.int32()),
+            ('studentId', pa.string()), ('studentName', pa.string()), ('department', pa.string()),
+            ('studentSemester', pa.int32()), ('status', pa.string()), ('remarks', pa.string()),
+            ('markedAt', pa.string()),
+        ])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+
+        try:
+            async for rows in pages:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        finally:
+            writer.close()
+        yield sink.drain()
@@ -0,0 +1,211 @@
+import csv
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from prisma import Prisma
+
+from src.services.attendance_summary_service import STATUS_COLUMNS, AttendanceSummaryService
+from src.utils.cache import invalidates
+
+# Required columns; an optional endTime column sets the end of newly created sessions
+IMPORT_COLUMNS = ['courseCode', 'studentId', 'date', 'startTime', 'status']
+IMPORT_CHUNK_SIZE = 5000
+# Rows listed individually in the error report; the total is always counted
+MAX_REPORTED_ERRORS = 1000
+
+# Upsert a JSON batch, skipping rows whose status is unchanged. `old` reads the
+# pre-statement snapshot (and locks existing rows), so each returned row
+# carries the status it replaced - NULL for inserts.
+_UPSERT_SQL = """
+    WITH d AS (
+        SELECT * FROM jsonb_to_recordset($1::jsonb)
+            AS d("sessionId" TEXT, "studentId" TEXT, "courseId" TEXT, "status" TEXT)
+    ),
+    old AS (
+        SELECT a."sessionId", a."studentId", a."status"::text AS "status"
+        FROM "StudentAttendance" a
+        JOIN d ON d."sessionId" = a."sessionId" AND d."studentId" = a."studentId"
+        FOR UPDATE OF a
+    ),
+    up AS (
+        INSERT INTO "StudentAttendance" ("id", "sessionId", "studentId", "courseId", "status", "markedById", "markedAt", "updatedAt")
+        SELECT gen_random_uuid()::text, d."sessionId", d."studentId", d."courseId",
+               d."status"::"AttendanceStatus", $2, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM d
+        ON CONFLICT ("sessionId", "studentId") DO UPDATE
+        SET "status" = EXCLUDED."status", "markedById" = EXCLUDED."markedById", "updatedAt" = CURRENT_TIMESTAMP
+        WHERE "StudentAttendance"."status" IS DISTINCT FROM EXCLUDED."status"
+        RETURNING "sessionId", "studentId", "courseId", "status"::text AS "status"
+    )
+    SELECT up."studentId", up."courseId", up."status", old."status" AS "oldStatus"
+    FROM up
+    LEFT JOIN old ON old."sessionId" = up."sessionId" AND old."studentId" = up."studentId"
+"""
+
+
+def _session_day(value) -> date:
+    """Calendar day of a session date as returned by Prisma (aware) or built here (naive UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+class AttendanceImportService:
+    """
+    Imports offline attendance registers from CSV.
+
+    The file is parsed as a stream; courses and students are resolved from
+    in-memory maps built with one query each. Rows are then processed in
+    chunks, each in its own transaction: look up the chunk's sessions in one
+    query, create missing ones with create_many, and upsert attendance with
+    a single INSERT ... ON CONFLICT statement that also feeds the summary
+    counters. Re-importing the same file changes nothing.
+    """
+
+    @staticmethod
+    def _error(report: Dict, line: int, message: str, row: Optional[Dict] = None):
+        report['errorCount'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'line': line, 'error': message, 'row': row})
+
+    @staticmethod
+    @invalidates("teacher_attendance")
+    async def import_csv(
+        lines: Iterable[str],
+        marked_by_id: Optional[str],
+        db: Prisma,
+        chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> Dict:
+        """
+        Import (courseCode, studentId, date, startTime, status[, endTime]) rows.
+
+        Returns row/created/updated/unchanged/sessionsCreated counts and a
+        per-row error report (line numbers include the header).
+        """
+        report = {
+            'rows': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'sessionsCreated': 0,
+            'errorCount': 0, 'errors': []
+        }
+        reader = csv.DictReader(lines)
+        missing_columns = [c for c in IMPORT_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing_columns:
+            raise ValueError(f"Missing CSV columns: {', '.join(missing_columns)}")
+
+        courses = {
+            c.courseCode.lower(): c for c in await db.course.find_many()
+        }
+        students = {
+            s.studentId.lower(): s.id for s in await db.student.find_many()
+        }
+
+        chunk: List[Tuple[int, Dict]] = []
+        for line, row in enumerate(reader, start=2):
+            report['rows'] += 1
+            course = courses.get((row.get('courseCode') or '').strip().lower())
+            student_id = students.get((row.get('studentId') or '').strip().lower())
+            status = (row.get('status') or '').strip().upper()
+            start_time = (row.get('startTime') or '').strip()
+            try:
+                day = datetime.fromisoformat((row.get('date') or '').strip()).date()
+            except ValueError:
+                day = None
+
+            if not course:
+                AttendanceImportService._error(report, line, f"Unknown course code: {row.get('courseCode')}", row)
+            elif not student_id:
+                AttendanceImportService._error(report, line, f"Unknown student ID: {row.get('studentId')}", row)
+            elif day is None:
+                AttendanceImportService._error(report, line, f"Invalid date: {row.get('date')}", row)
+            elif not start_time:
+                AttendanceImportService._error(report, line, "Missing start time", row)
+            elif status not in STATUS_COLUMNS:
+                AttendanceImportService._error(report, line, f"Invalid status: {row.get('status')}", row)
+            else:
+                chunk.append((line, {
+                    'course': course, 'studentId': student_id, 'day': day,
+                    'startTime': start_time, 'endTime': (row.get('endTime') or '').strip() or start_time,
+                    'status': status, 'raw': row
+                }))
+
+            if len(chunk) >= chunk_size:
+                await AttendanceImportService._import_chunk(chunk, marked_by_id, db, report)
+                chunk = []
+
+        if chunk:
+            await AttendanceImportService._import_chunk(chunk, marked_by_id, db, report)
+
+        report['errors'].sort(key=lambda e: e['line'])
+        print(
+            f"📥 Attendance import: {report['rows']} rows, {report['created']} created, "
+            f"{report['updated']} updated, {report['unchanged']} unchanged, {report['errorCount']} errors"
+        )
+        return report
+
+    @staticmethod
+    async def _import_chunk(chunk: List[Tuple[int, Dict]], marked_by_id: Optional[str], db: Prisma, report: Dict):
+        course_ids = list({item['course'].id for _, item in chunk})
+        first_day = min(item['day'] for _, item in chunk)
+        last_day = max(item['day'] for _, item in chunk)
+        day_range = {
+            'gte': datetime.combine(first_day, datetime.min.time()),
+            'lt': datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+        }
+
+        async with db.tx(timeout=timedelta(seconds=60)) as tx:
+            async def load_sessions() -> Dict[Tuple[str, date, str], str]:
+                sessions = await tx.classsession.find_many(
+                    where={'courseId': {'in': course_ids}, 'date': day_range}
+                )
+                return {(s.courseId, _session_day(s.date), s.startTime): s.id for s in sessions}
+
+            session_ids = await load_sessions()
+            to_create = {}
+            for line, item in chunk:
+                key = (item['course'].id, item['day'], item['startTime'])
+                if key in session_ids or key in to_create:
+                    continue
+                if not item['course'].teacherId:
+                    continue
+                to_create[key] = {
+                    'courseId': item['course'].id,
+                    'teacherId': item['course'].teacherId,
+                    'date': datetime.combine(item['day'], datetime.min.time()),
+                    'startTime': item['startTime'],
+                    'endTime': item['endTime'],
+                    'status': 'CONDUCTED'
+                }
+            if to_create:
+                report['sessionsCreated'] += await tx.classsession.create_many(
+                    data=list(to_create.values()), skip_duplicates=True
+                )
+                session_ids = await load_sessions()
+
+            # Last row wins when a student appears twice for the same session
+            rows = {}
+            for line, item in chunk:
+                session_id = session_ids.get((item['course'].id, item['day'], item['startTime']))
+                if not session_id:
+                    AttendanceImportService._error(
+                        report, line, "No session for this slot and the course has no teacher to create one",
+                        item['raw']
+                    )
+                    continue
+                rows[(session_id, item['studentId'])] = {
+                    'sessionId': session_id,
+                    'studentId': item['studentId'],
+                    'courseId': item['course'].id,
+                    'status': item['status']
+                }
+
+            changed = await tx.query_raw(_UPSERT_SQL, json.dumps(list(rows.values())), marked_by_id) if rows else []
+            deltas = []
+            for r in changed:
+                if r['oldStatus']:
+                    deltas.append((r['studentId'], r['courseId'], r['oldStatus'], -1))
+                deltas.append((r['studentId'], r['courseId'], r['status'], 1))
+            await AttendanceSummaryService.apply_student_deltas(tx, deltas)
+
+        created = sum(1 for r in changed if not r['oldStatus'])
+        report['created'] += created
+        report['updated'] += len(changed) - created
+        report['unchanged'] += len(rows) - len(changed)
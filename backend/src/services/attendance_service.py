@@ -1,6 +1,8 @@
-from datetime import datetime
-from typing import List, Optional
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from prisma import Prisma
+from prisma.errors import UniqueViolationError
 from src.models.schemas import (
     ClassSessionCreate, 
     ClassSessionUpdate,
@@ -9,6 +11,113 @@ from src.models.schemas import (
     TeacherAttendanceCreate,
     TeacherAttendanceUpdate
 )
+from src.services.attendance_summary_service import (
+    GOOD_ATTENDANCE_THRESHOLD,
+    STATUS_COLUMNS,
+    WARNING_ATTENDANCE_THRESHOLD,
+    AttendanceSummaryService
+)
+from src.utils.cache import cached, invalidates
+from src.utils.pagination import Page, decode_cursor, make_page, paginate
+
+WEEKDAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY', 'SUNDAY']
+# Slot used for sessions created on a day the course has no schedule entry
+DEFAULT_SESSION_SLOT = ("09:00 AM", "10:00 AM")
+# Views accepted by the attendance read methods: flat raw-SQL rows or Prisma models with includes
+ATTENDANCE_FIELDS = ("compact", "full")
+
+# Flat student attendance rows for list views; {where} is filled in per method
+_STUDENT_ATTENDANCE_COMPACT_SQL = """
+    SELECT
+        a."id", a."sessionId", a."studentId", a."courseId", a."status"::text AS "status",
+        a."markedById", a."remarks", a."markedAt", a."updatedAt",
+        s."studentId" AS "studentIdNumber", u."name" AS "studentName",
+        c."courseCode", c."courseName",
+        cs."date" AS "sessionDate", cs."startTime", cs."endTime"
+    FROM "StudentAttendance" a
+    JOIN "Student" s ON s."id" = a."studentId"
+    JOIN "User" u ON u."id" = s."userId"
+    JOIN "Course" c ON c."id" = a."courseId"
+    JOIN "ClassSession" cs ON cs."id" = a."sessionId"
+    WHERE {where}
+    ORDER BY a."markedAt" DESC, a."id" DESC
+"""
+
+_TEACHER_ATTENDANCE_COMPACT_SQL = """
+    SELECT
+        ta."id", ta."sessionId", ta."teacherId", ta."courseId", ta."status"::text AS "status",
+        ta."markedById", ta."remarks", ta."markedAt", ta."updatedAt",
+        t."teacherId" AS "teacherIdNumber", u."name" AS "teacherName",
+        c."courseCode", c."courseName",
+        cs."date" AS "sessionDate", cs."startTime", cs."endTime"
+    FROM "TeacherAttendance" ta
+    LEFT JOIN "Teacher" t ON t."id" = ta."teacherId"
+    LEFT JOIN "User" u ON u."id" = t."userId"
+    JOIN "Course" c ON c."id" = ta."courseId"
+    JOIN "ClassSession" cs ON cs."id" = ta."sessionId"
+    WHERE {where}
+    ORDER BY ta."markedAt" DESC, ta."id" DESC
+"""
+
+# Relations loaded by the fields="full" attendance reads
+_STUDENT_ATTENDANCE_INCLUDE = {
+    'student': {
+        'include': {
+            'user': True
+        }
+    },
+    'course': True,
+    'markedBy': {
+        'include': {
+            'user': True
+        }
+    },
+    'session': True
+}
+
+_TEACHER_ATTENDANCE_INCLUDE = {
+    'teacher': {
+        'include': {
+            'user': True
+        }
+    },
+    'course': True,
+    'session': True
+}
+
+# Per-status student attendance counts of a session, one column per summary counter
+_STATUS_COUNTS = ", ".join(
+    f'COUNT(a."id") FILTER (WHERE a."status"::text = \'{value}\')::int AS "{column}"'
+    for value, column in STATUS_COLUMNS.items()
+)
+
+# Sessions of a teacher's courses with per-session attendance counts; NULL filters are ignored
+_TEACHER_SESSIONS_SQL = f"""
+    SELECT
+        c."id" AS "courseId", c."courseCode", c."courseName",
+        cs."id", cs."date", cs."startTime", cs."endTime", cs."room", cs."topic",
+        cs."status"::text AS "status",
+        COUNT(a."id")::int AS "total",
+        {_STATUS_COUNTS}
+    FROM "Course" c
+    LEFT JOIN "ClassSession" cs ON cs."courseId" = c."id"
+        AND ($2::timestamp IS NULL OR cs."date" >= $2)
+        AND ($3::timestamp IS NULL OR cs."date" < $3)
+        AND ($4::text IS NULL OR cs."status"::text = $4)
+    LEFT JOIN "StudentAttendance" a ON a."sessionId" = cs."id"
+    WHERE c."teacherId" = $1
+    GROUP BY c."id", cs."id"
+    ORDER BY c."courseCode", cs."date" DESC, cs."startTime"
+"""
+# Bucket sizes accepted by get_teacher_attendance_trends (date_trunc fields)
+TREND_PERIODS = ("week", "month")
+
+
+def _day_range(date: datetime) -> Tuple[datetime, datetime]:
+    """[start, end) of the calendar day containing `date` (timezone kept as given)."""
+    start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=1)
+
 
 class AttendanceService:
     """Service for managing class sessions and attendance (both student and teacher)."""
@@ -16,6 +125,7 @@ class AttendanceService:
     # ==================== CLASS SESSION METHODS ====================
     
     @staticmethod
+    @invalidates("teacher_attendance")
     async def create_class_session(session: ClassSessionCreate, db: Prisma):
         """Create a new class session."""
         # Build data dictionary conditionally
@@ -66,10 +176,11 @@ class AttendanceService:
 
     @staticmethod
     async def get_course_sessions(course_id: str, date: Optional[datetime], db: Prisma):
-        """Get all sessions for a course, optionally filtered by date."""
+        """Get all sessions for a course, optionally filtered to the calendar day of `date`."""
         where_clause = {'courseId': course_id}
         if date:
-            where_clause['date'] = date
+            start, end = _day_range(date)
+            where_clause['date'] = {'gte': start, 'lt': end}
             
         return await db.classsession.find_many(
             where=where_clause,
@@ -85,6 +196,166 @@ class AttendanceService:
         )
 
     @staticmethod
+    async def page_course_sessions(
+        course_id: str,
+        date: Optional[datetime],
+        db: Prisma,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        include_total: bool = False
+    ) -> Page:
+        """One page of a course's sessions, newest first, keyed on (date, id)."""
+        where_clause = {'courseId': course_id}
+        if date:
+            start, end = _day_range(date)
+            where_clause['date'] = {'gte': start, 'lt': end}
+
+        return await paginate(
+            db.classsession,
+            where=where_clause,
+            include={
+                'course': True,
+                'teacher': {
+                    'include': {
+                        'user': True
+                    }
+                }
+            },
+            cursor=cursor,
+            limit=limit,
+            field='date',
+            descending=True,
+            include_total=include_total
+        )
+
+    @staticmethod
+    async def get_teacher_sessions(
+        teacher_id: str,
+        db: Prisma,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        status: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Sessions of every course the teacher teaches, grouped by course.
+
+        One query with flat session rows (no nested course/teacher objects)
+        carrying per-session student attendance counts. `date_to` is
+        exclusive; courses without matching sessions are listed empty.
+        """
+        rows = await db.query_raw(_TEACHER_SESSIONS_SQL, teacher_id, date_from, date_to, status)
+
+        courses = []
+        by_course = {}
+        for row in rows:
+            course = by_course.get(row['courseId'])
+            if course is None:
+                course = {
+                    'courseId': row['courseId'],
+                    'courseCode': row['courseCode'],
+                    'courseName': row['courseName'],
+                    'sessions': []
+                }
+                by_course[row['courseId']] = course
+                courses.append(course)
+            if row['id'] is None:
+                continue  # course without matching sessions
+            course['sessions'].append({
+                key: row[key] for key in row if key not in ('courseId', 'courseCode', 'courseName')
+            })
+        return courses
+
+    @staticmethod
+    async def find_session_on_day(course_id: str, date: datetime, db: Prisma, start_time: Optional[str] = None):
+        """
+        The course's session on the calendar day of `date` (and at `start_time`,
+        when given), earliest slot first. One query on the
+        (courseId, date, startTime) unique index.
+        """
+        start, end = _day_range(date)
+        where_clause = {'courseId': course_id, 'date': {'gte': start, 'lt': end}}
+        if start_time:
+            where_clause['startTime'] = start_time
+        return await db.classsession.find_first(
+            where=where_clause,
+            include={
+                'course': True,
+                'teacher': {
+                    'include': {
+                        'user': True
+                    }
+                }
+            },
+            order={'startTime': 'asc'}
+        )
+
+    @staticmethod
+    @invalidates("teacher_attendance")
+    async def find_or_create_class_session(session: ClassSessionCreate, db: Prisma):
+        """
+        Return the course's session for that day and start time, creating it if missing.
+
+        New sessions are stored with the date at midnight, so two concurrent
+        requests for the same slot collide on @@unique([courseId, date, startTime]);
+        the loser re-reads the winner's row instead of failing.
+        """
+        existing = await AttendanceService.find_session_on_day(
+            session.courseId, session.date, db, session.startTime
+        )
+        if existing:
+            return existing
+
+        day_start, _ = _day_range(session.date)
+        try:
+            return await AttendanceService.create_class_session(
+                session.model_copy(update={'date': day_start}), db
+            )
+        except UniqueViolationError:
+            return await AttendanceService.find_session_on_day(
+                session.courseId, session.date, db, session.startTime
+            )
+
+    @staticmethod
+    async def resolve_session_for_day(
+        course_id: str,
+        date: datetime,
+        teacher_id: Optional[str],
+        db: Prisma,
+        topic: Optional[str] = None
+    ):
+        """
+        Session to mark attendance against for a course on a calendar day.
+
+        Reuses any session already held that day; otherwise creates one in the
+        course's scheduled slot for that weekday (DEFAULT_SESSION_SLOT when the
+        course has none).
+        """
+        existing = await AttendanceService.find_session_on_day(course_id, date, db)
+        if existing:
+            return existing
+
+        schedule = await db.schedule.find_first(
+            where={'courseId': course_id, 'dayOfWeek': WEEKDAYS[date.weekday()], 'isActive': True},
+            order={'startTime': 'asc'}
+        )
+        start_time, end_time = (schedule.startTime, schedule.endTime) if schedule else DEFAULT_SESSION_SLOT
+        return await AttendanceService.find_or_create_class_session(
+            ClassSessionCreate(
+                courseId=course_id,
+                scheduleId=schedule.id if schedule else None,
+                teacherId=(schedule.teacherId if schedule and schedule.teacherId else teacher_id),
+                date=date,
+                startTime=start_time,
+                endTime=end_time,
+                room=schedule.room if schedule else None,
+                status="CONDUCTED",
+                topic=topic
+            ),
+            db
+        )
+
+    @staticmethod
+    @invalidates("teacher_attendance")
     async def update_class_session(session_id: str, session: ClassSessionUpdate, db: Prisma):
         """Update a class session."""
         update_data = {}
@@ -121,33 +392,136 @@ class AttendanceService:
         )
 
     @staticmethod
+    @invalidates("teacher_attendance")
     async def delete_class_session(session_id: str, db: Prisma):
-        """Delete a class session."""
-        return await db.classsession.delete(
-            where={'id': session_id}
-        )
+        """Delete a class session; its attendance rows cascade, so their summary counts are removed too."""
+        async with db.tx() as tx:
+            student_rows = await tx.studentattendance.find_many(where={'sessionId': session_id})
+            teacher_row = await tx.teacherattendance.find_unique(where={'sessionId': session_id})
+            session = await tx.classsession.delete(
+                where={'id': session_id}
+            )
+            await AttendanceSummaryService.apply_student_deltas(
+                tx, [(r.studentId, r.courseId, r.status, -1) for r in student_rows]
+            )
+            if teacher_row:
+                await AttendanceSummaryService.apply_teacher_deltas(
+                    tx, [(teacher_row.teacherId, teacher_row.courseId, teacher_row.status, -1)]
+                )
+        return session
 
     # ==================== STUDENT ATTENDANCE METHODS ====================
     
     @staticmethod
     async def mark_attendance(attendance: StudentAttendanceCreate, marked_by_id: str, db: Prisma):
         """Mark attendance for a student in a session."""
-        # Get the session to find the course
-        session = await db.classsession.find_unique(
-            where={'id': attendance.sessionId}
-        )
-        
-        if not session:
-            raise ValueError("Class session not found")
-        
-        attendance_record = await db.studentattendance.create(
-            data={
-                'session': {'connect': {'id': attendance.sessionId}},
-                'student': {'connect': {'id': attendance.studentId}},
-                'course': {'connect': {'id': session.courseId}},
-                'markedBy': {'connect': {'id': marked_by_id}},
-                'status': attendance.status,
-                'remarks': attendance.remarks
+        async with db.tx() as tx:
+            # Get the session to find the course
+            session = await tx.classsession.find_unique(
+                where={'id': attendance.sessionId}
+            )
+            
+            if not session:
+                raise ValueError("Class session not found")
+            
+            attendance_record = await tx.studentattendance.create(
+                data={
+                    'session': {'connect': {'id': attendance.sessionId}},
+                    'student': {'connect': {'id': attendance.studentId}},
+                    'course': {'connect': {'id': session.courseId}},
+                    'markedBy': {'connect': {'id': marked_by_id}},
+                    'status': attendance.status,
+                    'remarks': attendance.remarks
+                },
+                include={
+                    'student': {
+                        'include': {
+                            'user': True
+                        }
+                    },
+                    'course': True,
+                    'markedBy': {
+                        'include': {
+                            'user': True
+                        }
+                    },
+                    'session': True
+                }
+            )
+            # Keep the per-course counters in the same transaction
+            await AttendanceSummaryService.apply_student_deltas(
+                tx, [(attendance_record.studentId, attendance_record.courseId, attendance_record.status, 1)]
+            )
+        return attendance_record
+
+    @staticmethod
+    async def bulk_mark_attendance(attendance_list: List[StudentAttendanceCreate], marked_by_id: str, db: Prisma):
+        """
+        Mark attendance for multiple students at once.
+
+        Sessions, students and already-marked rows are each checked with one
+        query, all rows are inserted with a single create_many and the summary
+        counters updated in the same transaction - nothing is written unless
+        every record is valid. The created records are returned (in request
+        order) from one follow-up query.
+        """
+        if not attendance_list:
+            return []
+
+        # A student listed twice for the same session keeps the last entry
+        by_key = {(a.sessionId, a.studentId): a for a in attendance_list}
+        session_ids = list({session_id for session_id, _ in by_key})
+        student_ids = list({student_id for _, student_id in by_key})
+
+        async with db.tx() as tx:
+            sessions = await tx.classsession.find_many(
+                where={'id': {'in': session_ids}}
+            )
+            course_by_session = {s.id: s.courseId for s in sessions}
+            if len(course_by_session) != len(session_ids):
+                raise ValueError("Class session not found")
+
+            students = await tx.student.find_many(
+                where={'id': {'in': student_ids}}
+            )
+            missing = set(student_ids) - {s.id for s in students}
+            if missing:
+                raise ValueError(f"Student not found: {', '.join(sorted(missing))}")
+
+            existing = await tx.studentattendance.find_many(
+                where={'sessionId': {'in': session_ids}, 'studentId': {'in': student_ids}}
+            )
+            already_marked = [r.studentId for r in existing if (r.sessionId, r.studentId) in by_key]
+            if already_marked:
+                raise ValueError(
+                    f"Attendance already marked for {len(already_marked)} student(s) in this session"
+                )
+
+            rows = [
+                {
+                    'sessionId': a.sessionId,
+                    'studentId': a.studentId,
+                    'courseId': course_by_session[a.sessionId],
+                    'markedById': marked_by_id,
+                    'status': a.status,
+                    'remarks': a.remarks
+                }
+                for a in by_key.values()
+            ]
+            await tx.studentattendance.create_many(data=rows)
+            await AttendanceSummaryService.apply_student_deltas(
+                tx, [(r['studentId'], r['courseId'], r['status'], 1) for r in rows]
+            )
+
+        return await AttendanceService._fetch_marked_records(list(by_key), db)
+
+    @staticmethod
+    async def _fetch_marked_records(keys: List[tuple], db: Prisma):
+        """Fetch the records for (sessionId, studentId) keys in one query, in key order."""
+        records = await db.studentattendance.find_many(
+            where={
+                'sessionId': {'in': list({session_id for session_id, _ in keys})},
+                'studentId': {'in': list({student_id for _, student_id in keys})}
             },
             include={
                 'student': {
@@ -164,20 +538,131 @@ class AttendanceService:
                 'session': True
             }
         )
-        return attendance_record
+        by_record_key = {(r.sessionId, r.studentId): r for r in records}
+        return [by_record_key[key] for key in keys if key in by_record_key]
 
     @staticmethod
-    async def bulk_mark_attendance(attendance_list: List[StudentAttendanceCreate], marked_by_id: str, db: Prisma):
-        """Mark attendance for multiple students at once."""
-        results = []
-        for attendance in attendance_list:
-            record = await AttendanceService.mark_attendance(attendance, marked_by_id, db)
-            results.append(record)
-        return results
+    async def upsert_attendance(attendance: StudentAttendanceCreate, marked_by_id: str, db: Prisma) -> Dict:
+        """Mark or overwrite one student's attendance for a session; see bulk_upsert_attendance."""
+        result = await AttendanceService.bulk_upsert_attendance([attendance], marked_by_id, db)
+        result['record'] = result.pop('records')[0]
+        return result
+
+    @staticmethod
+    async def bulk_upsert_attendance(attendance_list: List[StudentAttendanceCreate], marked_by_id: str, db: Prisma) -> Dict:
+        """
+        Idempotently mark attendance keyed on (sessionId, studentId).
+
+        New rows are inserted, existing ones get the submitted status (and
+        remarks, when given) written in place, so re-submitting a class
+        register is safe. The affected sessions are locked with SELECT ... FOR
+        UPDATE for the length of the transaction: concurrent submissions for
+        the same session run one after the other, each seeing the other's
+        rows, so counts and summary counters stay exact.
+
+        Returns {'created', 'updated', 'unchanged', 'records'}.
+        """
+        if not attendance_list:
+            return {'created': 0, 'updated': 0, 'unchanged': 0, 'records': []}
+
+        # A student listed twice for the same session keeps the last entry
+        by_key = {(a.sessionId, a.studentId): a for a in attendance_list}
+        session_ids = list({session_id for session_id, _ in by_key})
+        student_ids = list({student_id for _, student_id in by_key})
+
+        async with db.tx() as tx:
+            sessions = await tx.query_raw(
+                """
+                SELECT "id", "courseId" FROM "ClassSession"
+                WHERE "id" IN (SELECT jsonb_array_elements_text($1::jsonb))
+                ORDER BY "id"
+                FOR UPDATE
+                """,
+                json.dumps(session_ids)
+            )
+            course_by_session = {s['id']: s['courseId'] for s in sessions}
+            if len(course_by_session) != len(session_ids):
+                raise ValueError("Class session not found")
+
+            students = await tx.student.find_many(
+                where={'id': {'in': student_ids}}
+            )
+            missing = set(student_ids) - {s.id for s in students}
+            if missing:
+                raise ValueError(f"Student not found: {', '.join(sorted(missing))}")
+
+            existing = await tx.studentattendance.find_many(
+                where={'sessionId': {'in': session_ids}, 'studentId': {'in': student_ids}}
+            )
+            existing_by_key = {
+                (r.sessionId, r.studentId): r for r in existing if (r.sessionId, r.studentId) in by_key
+            }
+
+            to_create, to_update, deltas = [], [], []
+            for key, a in by_key.items():
+                course_id = course_by_session[a.sessionId]
+                current = existing_by_key.get(key)
+                if current is None:
+                    to_create.append({
+                        'sessionId': a.sessionId,
+                        'studentId': a.studentId,
+                        'courseId': course_id,
+                        'markedById': marked_by_id,
+                        'status': a.status,
+                        'remarks': a.remarks
+                    })
+                    deltas.append((a.studentId, course_id, a.status, 1))
+                    continue
+
+                old_status = getattr(current.status, 'value', current.status)
+                remarks = current.remarks if a.remarks is None else a.remarks
+                if old_status == a.status and remarks == current.remarks:
+                    continue
+                to_update.append({'id': current.id, 'status': a.status, 'remarks': remarks})
+                if old_status != a.status:
+                    deltas.append((a.studentId, course_id, old_status, -1))
+                    deltas.append((a.studentId, course_id, a.status, 1))
+
+            if to_create:
+                await tx.studentattendance.create_many(data=to_create)
+            if to_update:
+                await tx.execute_raw(
+                    """
+                    UPDATE "StudentAttendance" a
+                    SET "status" = d."status"::"AttendanceStatus",
+                        "remarks" = d."remarks",
+                        "markedById" = $2,
+                        "updatedAt" = CURRENT_TIMESTAMP
+                    FROM jsonb_to_recordset($1::jsonb) AS d("id" TEXT, "status" TEXT, "remarks" TEXT)
+                    WHERE a."id" = d."id"
+                    """,
+                    json.dumps(to_update),
+                    marked_by_id
+                )
+            await AttendanceSummaryService.apply_student_deltas(tx, deltas)
+
+        return {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'unchanged': len(by_key) - len(to_create) - len(to_update),
+            'records': await AttendanceService._fetch_marked_records(list(by_key), db)
+        }
 
     @staticmethod
-    async def get_attendance_by_id(attendance_id: str, db: Prisma):
-        """Get a specific student attendance record by ID."""
+    def _check_fields(fields: str):
+        if fields not in ATTENDANCE_FIELDS:
+            raise ValueError(f"Fields must be one of: {', '.join(ATTENDANCE_FIELDS)}")
+
+    @staticmethod
+    async def get_attendance_by_id(attendance_id: str, db: Prisma, fields: str = "full"):
+        """Get a specific student attendance record by ID (a flat dict with fields="compact")."""
+        AttendanceService._check_fields(fields)
+        if fields == "compact":
+            rows = await db.query_raw(
+                _STUDENT_ATTENDANCE_COMPACT_SQL.format(where='a."id" = $1'), attendance_id
+            )
+            return rows[0] if rows else None
+
         return await db.studentattendance.find_unique(
             where={'id': attendance_id},
             include={
@@ -197,65 +682,98 @@ class AttendanceService:
         )
 
     @staticmethod
-    async def get_course_attendance(course_id: str, date: Optional[datetime], db: Prisma):
-        """Get attendance records for a course, optionally filtered by session date."""
+    async def _compact_rows(
+        db: Prisma, sql: str, alias: str, where: str, params: list,
+        cursor: Optional[str], limit: Optional[int]
+    ) -> List[Dict]:
+        """
+        Run a compact attendance query for the rows after `cursor` in its
+        (markedAt, id) descending order, taking one extra row to detect a next page.
+        """
+        after, after_id = decode_cursor(cursor) if cursor else (None, None)
+        n = len(params)
+        keyset = (
+            f'(${n + 1}::timestamp IS NULL OR '
+            f'({alias}."markedAt", {alias}."id") < (${n + 1}::timestamp, ${n + 2}::text))'
+        )
+        return await db.query_raw(
+            sql.format(where=f'{where} AND {keyset}') + f'    LIMIT ${n + 3}::int\n',
+            *params, after, after_id, limit + 1 if limit is not None else None
+        )
+
+    @staticmethod
+    async def get_course_attendance(course_id: str, date: Optional[datetime], db: Prisma, fields: str = "full"):
+        """
+        Get attendance records for a course, optionally filtered to the calendar
+        day of `date`. fields="compact" returns flat rows from one query.
+        """
+        return (await AttendanceService.page_course_attendance(course_id, date, db, fields)).items
+
+    @staticmethod
+    async def page_course_attendance(
+        course_id: str,
+        date: Optional[datetime],
+        db: Prisma,
+        fields: str = "full",
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        include_total: bool = False
+    ) -> Page:
+        """One page of get_course_attendance, newest first, keyed on (markedAt, id)."""
+        AttendanceService._check_fields(fields)
         where_clause = {'courseId': course_id}
-        
+        start, end = _day_range(date) if date else (None, None)
         if date:
-            # Find sessions on that date first
-            sessions = await db.classsession.find_many(
-                where={
-                    'courseId': course_id,
-                    'date': date
-                }
+            where_clause['session'] = {'is': {'date': {'gte': start, 'lt': end}}}
+
+        if fields == "full":
+            return await paginate(
+                db.studentattendance, where=where_clause, include=_STUDENT_ATTENDANCE_INCLUDE,
+                cursor=cursor, limit=limit, field='markedAt', descending=True, include_total=include_total
             )
-            session_ids = [s.id for s in sessions]
-            where_clause['sessionId'] = {'in': session_ids}
-        
-        return await db.studentattendance.find_many(
-            where=where_clause,
-            include={
-                'student': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'markedBy': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'session': True
-            },
-            order={'markedAt': 'desc'}
+
+        rows = await AttendanceService._compact_rows(
+            db, _STUDENT_ATTENDANCE_COMPACT_SQL, 'a',
+            'a."courseId" = $1 AND ($2::timestamp IS NULL OR (cs."date" >= $2 AND cs."date" < $3::timestamp))',
+            [course_id, start, end], cursor, limit
         )
+        total = await db.studentattendance.count(where=where_clause) if include_total else None
+        return make_page(rows, limit, 'markedAt', total)
 
     @staticmethod
-    async def get_student_attendance(student_id: str, course_id: Optional[str], db: Prisma):
+    async def get_student_attendance(student_id: str, course_id: Optional[str], db: Prisma, fields: str = "full"):
         """Get attendance records for a student, optionally filtered by course."""
+        return (await AttendanceService.page_student_attendance(student_id, course_id, db, fields)).items
+
+    @staticmethod
+    async def page_student_attendance(
+        student_id: str,
+        course_id: Optional[str],
+        db: Prisma,
+        fields: str = "full",
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        include_total: bool = False
+    ) -> Page:
+        """One page of get_student_attendance, newest first, keyed on (markedAt, id)."""
+        AttendanceService._check_fields(fields)
         where_clause = {'studentId': student_id}
         if course_id:
             where_clause['courseId'] = course_id
-            
-        return await db.studentattendance.find_many(
-            where=where_clause,
-            include={
-                'student': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'markedBy': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'session': True
-            },
-            order={'markedAt': 'desc'}
+
+        if fields == "full":
+            return await paginate(
+                db.studentattendance, where=where_clause, include=_STUDENT_ATTENDANCE_INCLUDE,
+                cursor=cursor, limit=limit, field='markedAt', descending=True, include_total=include_total
+            )
+
+        rows = await AttendanceService._compact_rows(
+            db, _STUDENT_ATTENDANCE_COMPACT_SQL, 'a',
+            'a."studentId" = $1 AND ($2::text IS NULL OR a."courseId" = $2)',
+            [student_id, course_id], cursor, limit
         )
+        total = await db.studentattendance.count(where=where_clause) if include_total else None
+        return make_page(rows, limit, 'markedAt', total)
 
     @staticmethod
     async def update_attendance(attendance_id: str, attendance: StudentAttendanceUpdate, marked_by_id: str, db: Prisma):
@@ -266,119 +784,171 @@ class AttendanceService:
         if attendance.remarks is not None:
             update_data['remarks'] = attendance.remarks
             
-        return await db.studentattendance.update(
-            where={'id': attendance_id},
-            data=update_data,
-            include={
-                'student': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'markedBy': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'session': True
-            }
-        )
+        async with db.tx() as tx:
+            existing = await tx.studentattendance.find_unique(where={'id': attendance_id})
+            record = await tx.studentattendance.update(
+                where={'id': attendance_id},
+                data=update_data,
+                include={
+                    'student': {
+                        'include': {
+                            'user': True
+                        }
+                    },
+                    'course': True,
+                    'markedBy': {
+                        'include': {
+                            'user': True
+                        }
+                    },
+                    'session': True
+                }
+            )
+            if existing and record and existing.status != record.status:
+                await AttendanceSummaryService.apply_student_deltas(tx, [
+                    (existing.studentId, existing.courseId, existing.status, -1),
+                    (record.studentId, record.courseId, record.status, 1),
+                ])
+        return record
 
     @staticmethod
     async def delete_attendance(attendance_id: str, db: Prisma):
         """Delete a student attendance record."""
-        return await db.studentattendance.delete(
-            where={'id': attendance_id}
-        )
+        async with db.tx() as tx:
+            record = await tx.studentattendance.delete(
+                where={'id': attendance_id}
+            )
+            if record:
+                await AttendanceSummaryService.apply_student_deltas(
+                    tx, [(record.studentId, record.courseId, record.status, -1)]
+                )
+        return record
 
     @staticmethod
-    async def get_all_students_attendance(db: Prisma):
-        """Get attendance statistics for all students with course-wise breakdown."""
-        students = await db.student.find_many(
-            include={
-                'user': True,
-                'attendances': {
-                    'include': {
-                        'course': True,
-                        'session': True
-                    }
-                },
-                'enrollments': {
-                    'include': {
-                        'course': True
-                    }
-                }
-            }
+    def _attendance_status(percentage: float) -> str:
+        if percentage >= GOOD_ATTENDANCE_THRESHOLD:
+            return 'Good'
+        return 'Warning' if percentage >= WARNING_ATTENDANCE_THRESHOLD else 'Critical'
+
+    @staticmethod
+    async def get_all_students_attendance(
+        db: Prisma,
+        department: Optional[str] = None,
+        semester: Optional[int] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ):
+        """
+        Get attendance statistics for all students with course-wise breakdown.
+
+        Counts come from AttendanceSummary in a single query (one row per
+        student and enrolled course) over a page of students ordered by student ID.
+        """
+        conditions = []
+        params: list = []
+        if department:
+            params.append(department)
+            conditions.append(f's."department" = ${len(params)}')
+        if semester is not None:
+            params.append(semester)
+            conditions.append(f's."semester" = ${len(params)}')
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.extend([limit, skip])
+
+        rows = await db.query_raw(
+            f"""
+            WITH page AS (
+                SELECT s."id", s."studentId", s."department", s."semester", u."name"
+                FROM "Student" s
+                JOIN "User" u ON u."id" = s."userId"
+                {where}
+                ORDER BY s."studentId"
+                LIMIT ${len(params) - 1} OFFSET ${len(params)}
+            )
+            SELECT
+                p."id", p."studentId", p."department", p."semester", p."name",
+                e."courseId", c."courseCode", c."courseName",
+                COALESCE(sm."total", 0) AS "totalClasses",
+                COALESCE(sm."present" + sm."late", 0) AS "attendedClasses",
+                COALESCE(sm."present", 0) AS "presentCount"
+            FROM page p
+            LEFT JOIN "Enrollment" e ON e."studentId" = p."id"
+            LEFT JOIN "Course" c ON c."id" = e."courseId"
+            LEFT JOIN "AttendanceSummary" sm ON sm."studentId" = p."id" AND sm."courseId" = e."courseId"
+            ORDER BY p."studentId", c."courseCode"
+            """,
+            *params
         )
-        
+
         stats = []
-        for student in students:
-            # Group attendances by course
-            courses_data = {}
-            for enrollment in student.enrollments:
-                course_id = enrollment.courseId
-                course_attendances = [a for a in student.attendances if a.courseId == course_id]
-                
-                total_classes = len(course_attendances)
-                attended_classes = sum(1 for a in course_attendances if a.status in ['PRESENT', 'LATE'])
-                present_count = sum(1 for a in course_attendances if a.status == 'PRESENT')
-                
-                attendance_percentage = (present_count / total_classes * 100) if total_classes > 0 else 0
-                
-                courses_data[course_id] = {
-                    'courseId': course_id,
-                    'courseCode': enrollment.course.courseCode,
-                    'courseName': enrollment.course.courseName,
-                    'totalClasses': total_classes,
-                    'attendedClasses': attended_classes,
-                    'attendancePercentage': round(attendance_percentage, 2),
-                    'status': 'Good' if attendance_percentage >= 75 else 'Warning' if attendance_percentage >= 60 else 'Critical'
+        by_student = {}
+        for row in rows:
+            student = by_student.get(row['id'])
+            if student is None:
+                student = {
+                    'studentId': row['id'],
+                    'studentName': row['name'] or 'Unknown',
+                    'studentIdNumber': row['studentId'],
+                    'department': row['department'],
+                    'semester': row['semester'],
+                    'courses': []
                 }
-            
-            stats.append({
-                'studentId': student.id,
-                'studentName': student.user.name if student.user else 'Unknown',
-                'studentIdNumber': student.studentId,
-                'department': student.department,
-                'semester': student.semester,
-                'courses': list(courses_data.values())
+                by_student[row['id']] = student
+                stats.append(student)
+            if row['courseId'] is None:
+                continue  # student without enrollments
+
+            total_classes = row['totalClasses']
+            attendance_percentage = (row['presentCount'] / total_classes * 100) if total_classes > 0 else 0
+            student['courses'].append({
+                'courseId': row['courseId'],
+                'courseCode': row['courseCode'],
+                'courseName': row['courseName'],
+                'totalClasses': total_classes,
+                'attendedClasses': row['attendedClasses'],
+                'attendancePercentage': round(attendance_percentage, 2),
+                'status': AttendanceService._attendance_status(attendance_percentage)
             })
-        
+
         return stats
 
     # ==================== TEACHER ATTENDANCE METHODS ====================
     
     @staticmethod
+    @invalidates("teacher_attendance")
     async def mark_teacher_attendance(attendance: TeacherAttendanceCreate, marked_by_id: str, db: Prisma):
         """Mark attendance for a teacher in a session."""
-        # Get the session to find the course
-        session = await db.classsession.find_unique(
-            where={'id': attendance.sessionId}
-        )
-        
-        if not session:
-            raise ValueError("Class session not found")
-        
-        attendance_record = await db.teacherattendance.create(
-            data={
-                'session': {'connect': {'id': attendance.sessionId}},
-                'teacher': {'connect': {'id': attendance.teacherId}},
-                'course': {'connect': {'id': session.courseId}},
-                'markedBy': {'connect': {'id': marked_by_id}},
-                'status': attendance.status,
-                'remarks': attendance.remarks
-            },
-            include={
-                'teacher': {
-                    'include': {
-                        'user': True
-                    }
+        async with db.tx() as tx:
+            # Get the session to find the course
+            session = await tx.classsession.find_unique(
+                where={'id': attendance.sessionId}
+            )
+            
+            if not session:
+                raise ValueError("Class session not found")
+            
+            attendance_record = await tx.teacherattendance.create(
+                data={
+                    'session': {'connect': {'id': attendance.sessionId}},
+                    'teacher': {'connect': {'id': attendance.teacherId}},
+                    'course': {'connect': {'id': session.courseId}},
+                    'markedBy': {'connect': {'id': marked_by_id}},
+                    'status': attendance.status,
+                    'remarks': attendance.remarks
                 },
-                'course': True,
-                'session': True
-            }
-        )
+                include={
+                    'teacher': {
+                        'include': {
+                            'user': True
+                        }
+                    },
+                    'course': True,
+                    'session': True
+                }
+            )
+            await AttendanceSummaryService.apply_teacher_deltas(
+                tx, [(attendance_record.teacherId, attendance_record.courseId, attendance_record.status, 1)]
+            )
         return attendance_record
 
     @staticmethod
@@ -398,27 +968,42 @@ class AttendanceService:
         )
 
     @staticmethod
-    async def get_teacher_attendance(teacher_id: str, course_id: Optional[str], db: Prisma):
+    async def get_teacher_attendance(teacher_id: str, course_id: Optional[str], db: Prisma, fields: str = "full"):
         """Get attendance records for a teacher, optionally filtered by course."""
+        return (await AttendanceService.page_teacher_attendance(teacher_id, course_id, db, fields)).items
+
+    @staticmethod
+    async def page_teacher_attendance(
+        teacher_id: str,
+        course_id: Optional[str],
+        db: Prisma,
+        fields: str = "full",
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        include_total: bool = False
+    ) -> Page:
+        """One page of get_teacher_attendance, newest first, keyed on (markedAt, id)."""
+        AttendanceService._check_fields(fields)
         where_clause = {'teacherId': teacher_id}
         if course_id:
             where_clause['courseId'] = course_id
-            
-        return await db.teacherattendance.find_many(
-            where=where_clause,
-            include={
-                'teacher': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'session': True
-            },
-            order={'markedAt': 'desc'}
+
+        if fields == "full":
+            return await paginate(
+                db.teacherattendance, where=where_clause, include=_TEACHER_ATTENDANCE_INCLUDE,
+                cursor=cursor, limit=limit, field='markedAt', descending=True, include_total=include_total
+            )
+
+        rows = await AttendanceService._compact_rows(
+            db, _TEACHER_ATTENDANCE_COMPACT_SQL, 'ta',
+            'ta."teacherId" = $1 AND ($2::text IS NULL OR ta."courseId" = $2)',
+            [teacher_id, course_id], cursor, limit
         )
+        total = await db.teacherattendance.count(where=where_clause) if include_total else None
+        return make_page(rows, limit, 'markedAt', total)
 
     @staticmethod
+    @invalidates("teacher_attendance")
     async def update_teacher_attendance(attendance_id: str, attendance: TeacherAttendanceUpdate, db: Prisma):
         """Update a teacher attendance record."""
         update_data = {}
@@ -427,76 +1012,193 @@ class AttendanceService:
         if attendance.remarks is not None:
             update_data['remarks'] = attendance.remarks
             
-        return await db.teacherattendance.update(
-            where={'id': attendance_id},
-            data=update_data,
-            include={
-                'teacher': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'session': True
-            }
-        )
+        async with db.tx() as tx:
+            existing = await tx.teacherattendance.find_unique(where={'id': attendance_id})
+            record = await tx.teacherattendance.update(
+                where={'id': attendance_id},
+                data=update_data,
+                include={
+                    'teacher': {
+                        'include': {
+                            'user': True
+                        }
+                    },
+                    'course': True,
+                    'session': True
+                }
+            )
+            if existing and record and existing.status != record.status:
+                await AttendanceSummaryService.apply_teacher_deltas(tx, [
+                    (existing.teacherId, existing.courseId, existing.status, -1),
+                    (record.teacherId, record.courseId, record.status, 1),
+                ])
+        return record
 
     @staticmethod
+    @invalidates("teacher_attendance")
     async def delete_teacher_attendance(attendance_id: str, db: Prisma):
         """Delete a teacher attendance record."""
-        return await db.teacherattendance.delete(
-            where={'id': attendance_id}
-        )
+        async with db.tx() as tx:
+            record = await tx.teacherattendance.delete(
+                where={'id': attendance_id}
+            )
+            if record:
+                await AttendanceSummaryService.apply_teacher_deltas(
+                    tx, [(record.teacherId, record.courseId, record.status, -1)]
+                )
+        return record
 
     @staticmethod
+    @cached("teacher_attendance", "teachers", "courses", "enrollments")
     async def get_all_teachers_attendance(db: Prisma):
-        """Get attendance statistics for all teachers with course-wise breakdown."""
-        teachers = await db.teacher.find_many(
-            include={
-                'user': True,
-                'teacherAttendances': {
-                    'include': {
-                        'course': True,
-                        'session': True
-                    }
-                },
-                'coursesTeaching': {
-                    'include': {
-                        'enrollments': True
-                    }
-                }
-            }
+        """
+        Get attendance statistics for all teachers with course-wise breakdown.
+
+        One grouped query: a row per teacher and course taught, with counts from
+        TeacherAttendanceSummary and enrollment counts grouped per course.
+        """
+        rows = await db.query_raw(
+            """
+            SELECT
+                t."id", t."teacherId", t."department", u."name",
+                c."id" AS "courseId", c."courseCode", c."courseName",
+                COALESCE(ts."total", 0) AS "totalClassesConducted",
+                COALESCE(ts."present", 0) AS "presentCount",
+                COALESCE(e."enrolled", 0)::int AS "totalStudentsEnrolled"
+            FROM "Teacher" t
+            LEFT JOIN "User" u ON u."id" = t."userId"
+            LEFT JOIN "Course" c ON c."teacherId" = t."id"
+            LEFT JOIN "TeacherAttendanceSummary" ts ON ts."teacherId" = t."id" AND ts."courseId" = c."id"
+            LEFT JOIN (
+                SELECT "courseId", COUNT(*) AS "enrolled" FROM "Enrollment" GROUP BY "courseId"
+            ) e ON e."courseId" = c."id"
+            ORDER BY t."teacherId", c."courseCode"
+            """
         )
-        
+
         stats = []
-        for teacher in teachers:
-            # Group data by course
-            courses_data = {}
-            for course in teacher.coursesTeaching:
-                course_id = course.id
-                course_attendances = [a for a in teacher.teacherAttendances if a.courseId == course_id]
-                
-                total_classes_conducted = len(course_attendances)
-                total_students_enrolled = len(course.enrollments)
-                present_sessions = sum(1 for a in course_attendances if a.status == 'PRESENT')
-                
-                attendance_percentage = (present_sessions / total_classes_conducted * 100) if total_classes_conducted > 0 else 0
-                
-                courses_data[course_id] = {
-                    'courseId': course_id,
-                    'courseCode': course.courseCode,
-                    'courseName': course.courseName,
-                    'totalClassesConducted': total_classes_conducted,
-                    'totalStudentsEnrolled': total_students_enrolled,
-                    'averageAttendancePercentage': round(attendance_percentage, 2)
+        by_teacher = {}
+        for row in rows:
+            teacher = by_teacher.get(row['id'])
+            if teacher is None:
+                teacher = {
+                    'teacherId': row['id'],
+                    'teacherName': row['name'] or 'Unknown',
+                    'teacherIdNumber': row['teacherId'],
+                    'department': row['department'],
+                    'courses': []
                 }
-            
-            stats.append({
-                'teacherId': teacher.id,
-                'teacherName': teacher.user.name if teacher.user else 'Unknown',
-                'teacherIdNumber': teacher.teacherId,
-                'department': teacher.department,
-                'courses': list(courses_data.values())
+                by_teacher[row['id']] = teacher
+                stats.append(teacher)
+            if row['courseId'] is None:
+                continue  # teacher without courses
+
+            total_classes_conducted = row['totalClassesConducted']
+            attendance_percentage = (row['presentCount'] / total_classes_conducted * 100) if total_classes_conducted > 0 else 0
+            teacher['courses'].append({
+                'courseId': row['courseId'],
+                'courseCode': row['courseCode'],
+                'courseName': row['courseName'],
+                'totalClassesConducted': total_classes_conducted,
+                'totalStudentsEnrolled': row['totalStudentsEnrolled'],
+                'averageAttendancePercentage': round(attendance_percentage, 2)
             })
-        
-        return stats
\ No newline at end of file
+
+        return stats
+
+    @staticmethod
+    @cached("teacher_attendance", "teachers")
+    async def get_teacher_attendance_trends(
+        db: Prisma,
+        period: str = "week",
+        periods: int = 12,
+        teacher_id: Optional[str] = None,
+        department: Optional[str] = None
+    ) -> Dict:
+        """
+        Conducted vs missed sessions per teacher per week or month.
+
+        Covers the last `periods` periods up to today. A session counts as
+        conducted when the teacher was marked present/late (or, unmarked, the
+        session is CONDUCTED) and as missed when marked absent/excused/on
+        leave (or, unmarked, the session was CANCELLED); `scheduled` counts
+        every session in the period.
+        """
+        if period not in TREND_PERIODS:
+            raise ValueError(f"Period must be one of: {', '.join(TREND_PERIODS)}")
+        if periods < 1:
+            raise ValueError("Periods must be at least 1")
+
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if period == "week":
+            current = today - timedelta(days=today.weekday())
+            starts = [current - timedelta(weeks=n) for n in reversed(range(periods))]
+        else:
+            current = today.replace(day=1)
+            starts = []
+            for n in reversed(range(periods)):
+                month = current.month - 1 - n
+                starts.append(current.replace(year=current.year + month // 12, month=month % 12 + 1))
+        end = today + timedelta(days=1)
+
+        rows = await db.query_raw(
+            """
+            SELECT
+                date_trunc($1, cs."date") AS "periodStart",
+                t."id", t."teacherId", t."department", u."name",
+                COUNT(*)::int AS "scheduled",
+                COUNT(*) FILTER (
+                    WHERE ta."status"::text IN ('PRESENT', 'LATE')
+                       OR (ta."status" IS NULL AND cs."status" = 'CONDUCTED')
+                )::int AS "conducted",
+                COUNT(*) FILTER (
+                    WHERE ta."status"::text IN ('ABSENT', 'EXCUSED', 'MEDICAL_LEAVE')
+                       OR (ta."status" IS NULL AND cs."status" = 'CANCELLED')
+                )::int AS "missed"
+            FROM "ClassSession" cs
+            JOIN "Teacher" t ON t."id" = cs."teacherId"
+            LEFT JOIN "User" u ON u."id" = t."userId"
+            LEFT JOIN "TeacherAttendance" ta ON ta."sessionId" = cs."id"
+            WHERE cs."date" >= $2::timestamp AND cs."date" < $3::timestamp
+              AND ($4::text IS NULL OR t."id" = $4)
+              AND ($5::text IS NULL OR t."department" = $5)
+            GROUP BY 1, t."id", t."teacherId", t."department", u."name"
+            ORDER BY t."teacherId", 1
+            """,
+            period, starts[0], end, teacher_id, department
+        )
+
+        def empty(start: datetime) -> Dict:
+            return {'periodStart': start.date().isoformat(), 'scheduled': 0, 'conducted': 0, 'missed': 0}
+
+        index = {start.date(): i for i, start in enumerate(starts)}
+        totals = [empty(start) for start in starts]
+        teachers = []
+        by_teacher = {}
+        for row in rows:
+            teacher = by_teacher.get(row['id'])
+            if teacher is None:
+                teacher = {
+                    'teacherId': row['id'],
+                    'teacherName': row['name'] or 'Unknown',
+                    'teacherIdNumber': row['teacherId'],
+                    'department': row['department'],
+                    'points': [empty(start) for start in starts]
+                }
+                by_teacher[row['id']] = teacher
+                teachers.append(teacher)
+
+            i = index.get(datetime.fromisoformat(str(row['periodStart'])).date())
+            if i is None:
+                continue
+            for key in ('scheduled', 'conducted', 'missed'):
+                teacher['points'][i][key] = row[key]
+                totals[i][key] += row[key]
+
+        return {
+            'period': period,
+            'from': starts[0].date().isoformat(),
+            'to': today.date().isoformat(),
+            'totals': totals,
+            'teachers': teachers
+        }
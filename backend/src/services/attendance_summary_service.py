@@ -0,0 +1,261 @@
+import json
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from prisma import Prisma
+
+# AttendanceStatus value -> summary counter column
+STATUS_COLUMNS = {
+    'PRESENT': 'present',
+    'LATE': 'late',
+    'EXCUSED': 'excused',
+    'ABSENT': 'absent',
+    'MEDICAL_LEAVE': 'medicalLeave',
+}
+COUNTER_COLUMNS = ['total', *STATUS_COLUMNS.values()]
+
+# Attendance percentage (present / total) bands: Good >= 75, Warning >= 60, else Critical
+GOOD_ATTENDANCE_THRESHOLD = 75
+WARNING_ATTENDANCE_THRESHOLD = 60
+
+# Sessions listed in a student's attendance overview by default
+RECENT_SESSIONS = 10
+
+# One row per active enrollment with its counters (zeros before any attendance)
+_STUDENT_COURSES_SQL = f"""
+    SELECT
+        c."id" AS "courseId", c."courseCode", c."courseName", c."credits", c."semester",
+        tu."name" AS "teacherName", d."name" AS "departmentName",
+        {", ".join(f'COALESCE(sm."{c}", 0) AS "{c}"' for c in COUNTER_COLUMNS)}
+    FROM "Enrollment" e
+    JOIN "Course" c ON c."id" = e."courseId"
+    LEFT JOIN "Teacher" t ON t."id" = c."teacherId"
+    LEFT JOIN "User" tu ON tu."id" = t."userId"
+    LEFT JOIN "Department" d ON d."id" = c."departmentId"
+    LEFT JOIN "AttendanceSummary" sm ON sm."studentId" = e."studentId" AND sm."courseId" = e."courseId"
+    WHERE e."studentId" = $1 AND e."status" = 'ACTIVE'
+    ORDER BY e."enrolledAt" DESC
+"""
+
+_RECENT_SESSIONS_SQL = """
+    SELECT
+        a."id" AS "attendanceId", a."courseId", c."courseCode",
+        cs."date", cs."startTime", cs."endTime", cs."topic", a."status"::text AS "status"
+    FROM "StudentAttendance" a
+    JOIN "ClassSession" cs ON cs."id" = a."sessionId"
+    JOIN "Course" c ON c."id" = a."courseId"
+    WHERE a."studentId" = $1
+    ORDER BY cs."date" DESC, a."markedAt" DESC
+    LIMIT $2
+"""
+
+# Attendance recorded in a teacher's sessions, per (owner, course, status); the
+# rows cascade away with the sessions when the teacher is deleted
+_TEACHER_SESSIONS_STUDENT_COUNTS_SQL = """
+    SELECT a."studentId" AS "ownerId", a."courseId", a."status"::text AS "status", COUNT(*)::int AS "n"
+    FROM "StudentAttendance" a
+    JOIN "ClassSession" cs ON cs."id" = a."sessionId"
+    WHERE cs."teacherId" = $1
+    GROUP BY a."studentId", a."courseId", a."status"
+"""
+
+_TEACHER_SESSIONS_TEACHER_COUNTS_SQL = """
+    SELECT ta."teacherId" AS "ownerId", ta."courseId", ta."status"::text AS "status", COUNT(*)::int AS "n"
+    FROM "TeacherAttendance" ta
+    JOIN "ClassSession" cs ON cs."id" = ta."sessionId"
+    WHERE cs."teacherId" = $1 AND ta."teacherId" IS NOT NULL
+    GROUP BY ta."teacherId", ta."courseId", ta."status"
+"""
+
+# (owner id, course id, status, signed count)
+SummaryDelta = Tuple[str, str, str, int]
+
+
+def _status_key(status) -> str:
+    return getattr(status, 'value', status)
+
+
+def _upsert_sql(table: str, owner_column: str) -> str:
+    """
+    Statement adding a JSON batch of counter deltas.
+
+    Existing rows get the raw deltas (negative ones included) through the
+    UPDATE; only keys without a row are inserted, clamped at zero. The
+    ON CONFLICT branch only covers a row inserted concurrently for a new key.
+    """
+    columns = ", ".join(f'"{c}"' for c in COUNTER_COLUMNS)
+    return f"""
+        WITH d AS (
+            SELECT * FROM jsonb_to_recordset($1::jsonb) AS d(
+                "ownerId" TEXT, "courseId" TEXT, {", ".join(f'"{c}" INT' for c in COUNTER_COLUMNS)}
+            )
+        ),
+        updated AS (
+            UPDATE "{table}" sm
+            SET {", ".join(f'"{c}" = sm."{c}" + d."{c}"' for c in COUNTER_COLUMNS)}, "updatedAt" = CURRENT_TIMESTAMP
+            FROM d
+            WHERE sm."{owner_column}" = d."ownerId" AND sm."courseId" = d."courseId"
+            RETURNING sm."{owner_column}" AS "ownerId", sm."courseId"
+        )
+        INSERT INTO "{table}" ("id", "{owner_column}", "courseId", {columns}, "updatedAt")
+        SELECT gen_random_uuid()::text, d."ownerId", d."courseId", {", ".join(f'GREATEST(d."{c}", 0)' for c in COUNTER_COLUMNS)}, CURRENT_TIMESTAMP
+        FROM d
+        WHERE NOT EXISTS (
+            SELECT 1 FROM updated u WHERE u."ownerId" = d."ownerId" AND u."courseId" = d."courseId"
+        )
+        ON CONFLICT ("{owner_column}", "courseId") DO UPDATE
+        SET {", ".join(f'"{c}" = "{table}"."{c}" + EXCLUDED."{c}"' for c in COUNTER_COLUMNS)}, "updatedAt" = CURRENT_TIMESTAMP
+    """
+
+
+def _rebuild_sql(table: str, owner_column: str, source: str) -> str:
+    """INSERT ... SELECT recomputing every counter from raw attendance rows."""
+    counters = ", ".join(
+        f"""(COUNT(*) FILTER (WHERE a."status" = '{status}'))::int""" for status in STATUS_COLUMNS
+    )
+    return f"""
+        INSERT INTO "{table}" ("id", "{owner_column}", "courseId", {", ".join(f'"{c}"' for c in COUNTER_COLUMNS)}, "updatedAt")
+        SELECT gen_random_uuid()::text, a."{owner_column}", a."courseId", COUNT(*)::int, {counters}, CURRENT_TIMESTAMP
+        FROM "{source}" a
+        WHERE a."{owner_column}" IS NOT NULL
+        GROUP BY a."{owner_column}", a."courseId"
+    """
+
+
+class AttendanceSummaryService:
+    """
+    Maintains the per-(student|teacher, course) attendance counters.
+
+    Writers call `apply_student_deltas` / `apply_teacher_deltas` with the
+    transaction client they used for the attendance write, so counters and
+    raw rows commit together. `rebuild` recomputes everything from scratch.
+    """
+
+    @staticmethod
+    def _aggregate(deltas: Iterable[SummaryDelta]) -> List[Dict]:
+        """Collapse deltas into one counter row per (owner, course)."""
+        rows: Dict[Tuple[str, str], Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+        for owner_id, course_id, status, delta in deltas:
+            if not owner_id or not course_id:
+                continue
+            row = rows[(owner_id, course_id)]
+            row['total'] += delta
+            row[STATUS_COLUMNS[_status_key(status)]] += delta
+        return [
+            {'ownerId': owner_id, 'courseId': course_id, **counters}
+            for (owner_id, course_id), counters in rows.items()
+            if any(counters.values())
+        ]
+
+    @staticmethod
+    async def apply_student_deltas(db: Prisma, deltas: Iterable[SummaryDelta]) -> None:
+        """Apply (studentId, courseId, status, delta) changes in one statement."""
+        rows = AttendanceSummaryService._aggregate(deltas)
+        if rows:
+            await db.execute_raw(_upsert_sql("AttendanceSummary", "studentId"), json.dumps(rows))
+
+    @staticmethod
+    async def apply_teacher_deltas(db: Prisma, deltas: Iterable[SummaryDelta]) -> None:
+        """Apply (teacherId, courseId, status, delta) changes in one statement."""
+        rows = AttendanceSummaryService._aggregate(deltas)
+        if rows:
+            await db.execute_raw(_upsert_sql("TeacherAttendanceSummary", "teacherId"), json.dumps(rows))
+
+    @staticmethod
+    async def retract_teacher_sessions(db: Prisma, teacher_id: str) -> None:
+        """
+        Remove the counts of all attendance recorded in the teacher's sessions.
+
+        Call it in the transaction that deletes the teacher, before the
+        delete: the sessions and their attendance rows cascade away with it.
+        """
+        students = await db.query_raw(_TEACHER_SESSIONS_STUDENT_COUNTS_SQL, teacher_id)
+        await AttendanceSummaryService.apply_student_deltas(
+            db, [(r['ownerId'], r['courseId'], r['status'], -r['n']) for r in students]
+        )
+        teachers = await db.query_raw(_TEACHER_SESSIONS_TEACHER_COUNTS_SQL, teacher_id)
+        await AttendanceSummaryService.apply_teacher_deltas(
+            db, [(r['ownerId'], r['courseId'], r['status'], -r['n']) for r in teachers]
+        )
+
+    @staticmethod
+    async def rebuild(db: Prisma) -> Dict[str, int]:
+        """Recompute both summary tables from StudentAttendance / TeacherAttendance."""
+        async with db.tx(timeout=timedelta(minutes=2)) as tx:
+            await tx.execute_raw('DELETE FROM "AttendanceSummary"')
+            students = await tx.execute_raw(_rebuild_sql("AttendanceSummary", "studentId", "StudentAttendance"))
+            await tx.execute_raw('DELETE FROM "TeacherAttendanceSummary"')
+            teachers = await tx.execute_raw(
+                _rebuild_sql("TeacherAttendanceSummary", "teacherId", "TeacherAttendance")
+            )
+        return {'studentSummaries': students, 'teacherSummaries': teachers}
+
+    # ==================== READS ====================
+
+    @staticmethod
+    def _with_percentages(summary) -> Dict:
+        total = summary.total
+        attended = summary.present + summary.late
+        return {
+            'courseId': summary.courseId,
+            'courseCode': summary.course.courseCode if summary.course else None,
+            'courseName': summary.course.courseName if summary.course else None,
+            'total': total,
+            'present': summary.present,
+            'late': summary.late,
+            'excused': summary.excused,
+            'absent': summary.absent,
+            'medicalLeave': summary.medicalLeave,
+            'attended': attended,
+            'attendancePercentage': round(summary.present / total * 100, 2) if total else 0,
+        }
+
+    @staticmethod
+    async def get_student_summary(student_id: str, course_id: Optional[str], db: Prisma) -> List[Dict]:
+        """Per-course counters for a student, optionally for one course."""
+        where = {'studentId': student_id}
+        if course_id:
+            where['courseId'] = course_id
+        summaries = await db.attendancesummary.find_many(where=where, include={'course': True})
+        return sorted(
+            (AttendanceSummaryService._with_percentages(s) for s in summaries),
+            key=lambda s: s['courseCode'] or ''
+        )
+
+    @staticmethod
+    async def get_teacher_summary(teacher_id: str, course_id: Optional[str], db: Prisma) -> List[Dict]:
+        """Per-course counters for a teacher, optionally for one course."""
+        where = {'teacherId': teacher_id}
+        if course_id:
+            where['courseId'] = course_id
+        summaries = await db.teacherattendancesummary.find_many(where=where, include={'course': True})
+        return sorted(
+            (AttendanceSummaryService._with_percentages(s) for s in summaries),
+            key=lambda s: s['courseCode'] or ''
+        )
+
+    @staticmethod
+    async def get_student_overview(student_id: str, db: Prisma, recent: int = RECENT_SESSIONS) -> Dict:
+        """
+        Everything a student's attendance page shows: counters for each active
+        enrollment, overall totals and the `recent` latest marked sessions.
+        """
+        courses = await db.query_raw(_STUDENT_COURSES_SQL, student_id)
+        recent_sessions = await db.query_raw(_RECENT_SESSIONS_SQL, student_id, recent) if recent > 0 else []
+
+        total = attended = present = 0
+        for course in courses:
+            course['attended'] = course['present'] + course['late']
+            course['attendancePercentage'] = round(course['present'] / course['total'] * 100, 2) if course['total'] else 0
+            total += course['total']
+            attended += course['attended']
+            present += course['present']
+
+        return {
+            'studentId': student_id,
+            'total': total,
+            'attended': attended,
+            'attendancePercentage': round(present / total * 100, 2) if total else 0,
+            'courses': courses,
+            'recentSessions': recent_sessions
+        }
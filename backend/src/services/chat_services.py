@@ -31,6 +31,15 @@ class ChatService:
         )
         return messages
 
+    async def get_recent_messages(self, thread_id: str, limit: int = 10) -> List[ChatMessage]:
+        """The latest `limit` messages of a thread, oldest first."""
+        messages = await self.db.chatmessage.find_many(
+            where={'threadId': thread_id},
+            take=limit,
+            order={'createdAt': 'desc'}
+        )
+        return list(reversed(messages))
+
     async def delete_message(self, message_id: str) -> ChatMessage:
         message = await self.db.chatmessage.delete(
             where={'id': message_id}
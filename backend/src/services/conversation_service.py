@@ -73,4 +73,9 @@ class ConversationService:
         await self.db.conversation.delete(
             where={"id": conversation_id}
         )
+
+        # Drop the agent's saved graph state for this conversation's thread
+        if existing.threadId:
+            await self.db.agentcheckpointwrite.delete_many(where={"threadId": existing.threadId})
+            await self.db.agentcheckpoint.delete_many(where={"threadId": existing.threadId})
         return True
@@ -2,6 +2,8 @@ from typing import List, Optional
 from prisma import Prisma
 from prisma.models import Course
 from src.models.schemas import CourseCreate, CourseUpdate, CourseResponse, CourseOut
+from src.utils.cache import invalidates
+from src.utils.pagination import Page, paginate
 
 class CourseService:
     def __init__(self, db: Prisma):
@@ -18,6 +20,21 @@ class CourseService:
         )
         return courses
 
+    async def page_courses(
+        self, cursor: Optional[str] = None, limit: Optional[int] = None, include_total: bool = False
+    ) -> Page:
+        """One page of courses (with teacher and department) in (createdAt, id) order."""
+        return await paginate(
+            self.db.course,
+            include={
+                "teacher": {
+                    "include": {"user": True}
+                },
+                "department": True
+            },
+            cursor=cursor, limit=limit, include_total=include_total
+        )
+
     async def get_course_by_id(self, course_id: str) -> Optional[Course]:
         course = await self.db.course.find_unique(
             where={"id": course_id},
@@ -30,12 +47,14 @@ class CourseService:
         )
         return course
 
+    @invalidates("courses")
     async def create_course(self, course_data: CourseCreate) -> Course:
         course = await self.db.course.create(
             data=course_data.model_dump(by_alias=True, exclude_unset=True)
         )
         return course
 
+    @invalidates("courses")
     async def update_course(self, course_id: str, course_data: CourseUpdate) -> Optional[Course]:
         course = await self.db.course.update(
             where={"id": course_id},
@@ -43,6 +62,7 @@ class CourseService:
         )
         return course
 
+    @invalidates("courses")
     async def delete_course(self, course_id: str) -> Course:
         course = await self.db.course.delete(where={"id": course_id})
         return course
\ No newline at end of file
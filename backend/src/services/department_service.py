@@ -2,10 +2,13 @@ from typing import List, Optional
 from prisma import Prisma
 from src.models.schemas import DepartmentCreate, DepartmentUpdate
 from prisma.models import Department
+from src.utils.cache import invalidates
+from src.utils.pagination import Page, paginate
 class DepartmentService:
     def __init__(self, db: Prisma):
         self.db = db
 
+    @invalidates("departments")
     async def create_department(self, department_data: DepartmentCreate) -> Department:
         department = await self.db.department.create(data=department_data.dict())
         return department
@@ -22,6 +25,7 @@ class DepartmentService:
         department = await self.db.department.find_unique(where={"code": department_code})
         return department
 
+    @invalidates("departments")
     async def update_department(self, department_id: str, department_data: DepartmentUpdate) -> Optional[Department]:
         department = await self.db.department.update(
             where={"id": department_id},
@@ -29,14 +33,22 @@ class DepartmentService:
         )
         return department
 
+    @invalidates("departments")
     async def delete_department(self, department_id: str) -> Optional[Department]:
         department = await self.db.department.delete(where={"id": department_id})
         return department
     
+    @invalidates("departments")
     async def delete_department_by_code(self, department_code: str) -> Optional[Department]:
         department = await self.db.department.delete(where={"code": department_code})
         return department
 
     async def list_departments(self) -> List[Department]:
         departments = await self.db.department.find_many()
-        return departments
\ No newline at end of file
+        return departments
+
+    async def page_departments(
+        self, cursor: Optional[str] = None, limit: Optional[int] = None, include_total: bool = False
+    ) -> Page:
+        """One page of departments in (createdAt, id) order."""
+        return await paginate(self.db.department, cursor=cursor, limit=limit, include_total=include_total)
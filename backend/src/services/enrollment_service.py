@@ -1,12 +1,15 @@
 from typing import List, Optional
 from prisma import Prisma
 from src.models.schemas import EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse, EnrollmentOut
+from src.utils.cache import invalidates
+from src.utils.pagination import Page, paginate
 
 
 class EnrollmentService:
     def __init__(self,db:Prisma):
         self.db=db
 
+    @invalidates("enrollments")
     async def create_enrollment(self,enrollment_data:EnrollmentCreate)->EnrollmentResponse:
         enrollment= await self.db.enrollment.create(data={
             'student':{'connect':{'id':enrollment_data.student_id}},
@@ -22,6 +25,7 @@ class EnrollmentService:
         })
         return EnrollmentResponse.model_validate(enrollment) if enrollment else None
 
+    @invalidates("enrollments")
     async def update_enrollment(self, enrollment_id: str, enrollment_data: EnrollmentUpdate) -> EnrollmentResponse:
         enrollment = await self.db.enrollment.update(
             where={'id': enrollment_id},
@@ -29,6 +33,7 @@ class EnrollmentService:
         )
         return EnrollmentResponse.model_validate(enrollment)
 
+    @invalidates("enrollments")
     async def delete_enrollment(self, enrollment_id: str) -> bool:
         await self.db.enrollment.delete(where={'id': enrollment_id})
         return True
@@ -38,11 +43,21 @@ class EnrollmentService:
         enrollments = await self.db.enrollment.find_many(where=where)
         return [EnrollmentResponse.model_validate(e) for e in enrollments]
     
-    async def list_enrollments_with_details(self, skip: int = 0, limit: int = 100) -> List[EnrollmentOut]:
-        """Get all enrollments with student and course details"""
-        enrollments = await self.db.enrollment.find_many(
+    async def list_enrollments_with_details(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Page:
+        """One page of enrollments with student and course details, newest first"""
+        page = await paginate(
+            self.db.enrollment,
+            cursor=cursor,
+            limit=limit,
             skip=skip,
-            take=limit,
+            descending=True,
+            include_total=include_total,
             include={
                 'student': {
                     'include': {
@@ -59,10 +74,9 @@ class EnrollmentService:
                         'department': True
                     }
                 }
-            },
-            order={'enrolledAt': 'desc'}
+            }
         )
-        return [EnrollmentOut.model_validate(e) for e in enrollments]
+        return page._replace(items=[EnrollmentOut.model_validate(e) for e in page.items])
 
     async def get_student_enrollments_with_courses(self, student_id: str) -> List[EnrollmentOut]:
         """Get all enrollments for a student with full course and teacher details"""
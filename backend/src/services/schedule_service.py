@@ -1,6 +1,8 @@
 from typing import List, Optional, Dict, Any
 from prisma import Prisma
 from src.models.schemas import ScheduleCreate, ScheduleUpdate, ScheduleResponse
+from src.utils.cache import invalidates
+from src.utils.pagination import Page, paginate
 
 class ScheduleService:
     def __init__(self, db: Prisma):
@@ -26,10 +28,31 @@ class ScheduleService:
         )
         return [ScheduleResponse.model_validate(schedule) for schedule in schedules]
 
+    async def page_schedules(
+        self,
+        course_id: Optional[str] = None,
+        teacher_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        include_total: bool = False
+    ) -> Page:
+        """One page of schedules in (createdAt, id) order; get_schedules keeps the timetable order."""
+        filters = {}
+        if course_id:
+            filters['courseId'] = course_id
+        if teacher_id:
+            filters['teacherId'] = teacher_id
+
+        page = await paginate(
+            self.db.schedule, where=filters, cursor=cursor, limit=limit, include_total=include_total
+        )
+        return page._replace(items=[ScheduleResponse.model_validate(schedule) for schedule in page.items])
+
     async def get_schedule(self, schedule_id: str) -> Optional[ScheduleResponse]:
         schedule = await self.db.schedule.find_unique(where={'id': schedule_id})
         return ScheduleResponse.model_validate(schedule) if schedule else None
 
+    @invalidates("schedules")
     async def create_schedule(self, schedule_data: ScheduleCreate) -> ScheduleResponse:
         schedule = await self.db.schedule.create(
             data={
@@ -45,6 +68,7 @@ class ScheduleService:
         )
         return ScheduleResponse.model_validate(schedule)
 
+    @invalidates("schedules")
     async def update_schedule(
         self, 
         schedule_id: str, 
@@ -57,6 +81,7 @@ class ScheduleService:
         )
         return ScheduleResponse.model_validate(schedule)
 
+    @invalidates("schedules")
     async def delete_schedule(self, schedule_id: str) -> bool:
         await self.db.schedule.delete(where={'id': schedule_id})
         return True
@@ -378,6 +403,7 @@ class ScheduleService:
         print(f"Returning {len(subjects_details)} subject details")
         return subjects_details
 
+    @invalidates("schedules")
     async def save_timetable(
         self, 
         semester: int, 
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from prisma import Prisma
+
+from src.services.attendance_service import WEEKDAYS
+from src.utils.cache import invalidates
+
+# Rows per create_many statement
+INSERT_BATCH_SIZE = 1000
+
+
+def _midnight(date: datetime) -> datetime:
+    """Start of the (UTC, naive) day; Prisma returns aware datetimes, requests may send either."""
+    return date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+class SessionGenerationService:
+    """
+    Expands active Schedules into ClassSession rows for a date range.
+
+    Sessions are stored at midnight of their day (like
+    AttendanceService.find_or_create_class_session), so re-running over an
+    overlapping range inserts only the missing (courseId, date, startTime)
+    rows and is safe to repeat.
+    """
+
+    @staticmethod
+    def _is_effective(schedule, day: datetime) -> bool:
+        if schedule.effectiveFrom and _midnight(schedule.effectiveFrom) > day:
+            return False
+        if schedule.effectiveTo and _midnight(schedule.effectiveTo) < day:
+            return False
+        return True
+
+    @staticmethod
+    async def next_start(db: Prisma, course_id: Optional[str] = None) -> datetime:
+        """Day after the last generated session, or today when none exist yet."""
+        where = {'scheduleId': {'not': None}}
+        if course_id:
+            where['courseId'] = course_id
+        last = await db.classsession.find_first(
+            where=where,
+            order={'date': 'desc'}
+        )
+        today = _midnight(datetime.now())
+        if not last:
+            return today
+        return max(today, _midnight(last.date) + timedelta(days=1))
+
+    @staticmethod
+    @invalidates("teacher_attendance")
+    async def materialize(
+        start: datetime,
+        end: datetime,
+        db: Prisma,
+        course_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Create ClassSessions for every active schedule slot from `start` to `end` (inclusive days).
+
+        Returns counts of candidate slots, sessions created, slots that
+        already had a session and slots skipped for lacking a teacher.
+        """
+        start, end = _midnight(start), _midnight(end)
+        if end < start:
+            raise ValueError("End date must not be before start date")
+
+        where = {
+            'isActive': True,
+            'effectiveFrom': {'lte': end + timedelta(days=1)},
+            'OR': [{'effectiveTo': None}, {'effectiveTo': {'gte': start}}]
+        }
+        if course_id:
+            where['courseId'] = course_id
+        schedules = await db.schedule.find_many(where=where, include={'course': True})
+
+        by_weekday: Dict[str, List] = {}
+        for schedule in schedules:
+            by_weekday.setdefault(getattr(schedule.dayOfWeek, 'value', schedule.dayOfWeek), []).append(schedule)
+
+        rows, no_teacher = [], 0
+        day = start
+        while day <= end:
+            for schedule in by_weekday.get(WEEKDAYS[day.weekday()], []):
+                if not SessionGenerationService._is_effective(schedule, day):
+                    continue
+                teacher_id = schedule.teacherId or (schedule.course.teacherId if schedule.course else None)
+                if not teacher_id:
+                    no_teacher += 1
+                    continue
+                rows.append({
+                    'courseId': schedule.courseId,
+                    'scheduleId': schedule.id,
+                    'teacherId': teacher_id,
+                    'date': day,
+                    'startTime': schedule.startTime,
+                    'endTime': schedule.endTime,
+                    'room': schedule.room,
+                    'status': 'SCHEDULED'
+                })
+            day += timedelta(days=1)
+
+        created = 0
+        for i in range(0, len(rows), INSERT_BATCH_SIZE):
+            created += await db.classsession.create_many(
+                data=rows[i:i + INSERT_BATCH_SIZE],
+                skip_duplicates=True
+            )
+
+        print(
+            f"📅 Materialized sessions {start.date()}..{end.date()}: "
+            f"{created} created, {len(rows) - created} existing, {no_teacher} without teacher"
+        )
+        return {
+            'from': start,
+            'to': end,
+            'schedules': len(schedules),
+            'slots': len(rows) + no_teacher,
+            'created': created,
+            'existing': len(rows) - created,
+            'skippedNoTeacher': no_teacher
+        }
+
+    @staticmethod
+    async def extend(
+        db: Prisma,
+        weeks: int = 1,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        course_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Materialize from `start` (default: the day after the last generated
+        session) to `end` (default: `weeks` weeks later).
+        """
+        if start is None:
+            start = await SessionGenerationService.next_start(db, course_id)
+        if end is None:
+            end = _midnight(start) + timedelta(weeks=weeks, days=-1)
+        return await SessionGenerationService.materialize(start, end, db, course_id)
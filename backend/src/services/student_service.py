@@ -2,6 +2,8 @@ from typing import List, Optional
 from prisma import Prisma
 from src.models.schemas import StudentCreate, StudentUpdate
 from prisma.models import Student as StudentModel
+from src.utils.cache import invalidates
+from src.utils.pagination import Page, paginate
 
 class StudentService:
     def __init__(self, db: Prisma):
@@ -31,6 +33,7 @@ class StudentService:
         )
         return student
 
+    @invalidates("students")
     async def create_student(self, student_data: StudentCreate) -> StudentModel:
     
         student = await self.db.student.create(
@@ -39,6 +42,7 @@ class StudentService:
         )
         return student
 
+    @invalidates("students")
     async def update_student(self, student_id: str, student_data: StudentUpdate) -> Optional[StudentModel]:
         student_fields = student_data.dict(exclude_unset=True)
         student_fields.pop("name", None) 
@@ -58,6 +62,8 @@ class StudentService:
             )
         return student
 
+    # Enrollments cascade with the student
+    @invalidates("students", "enrollments")
     async def delete_student(self, id: str) -> Optional[StudentModel]:
         # First get the student to find the userId
         student = await self.db.student.find_unique(
@@ -73,4 +79,13 @@ class StudentService:
 
     async def list_students(self) -> List[StudentModel]:
         students = await self.db.student.find_many(include={"user": True})
-        return students
\ No newline at end of file
+        return students
+
+    async def page_students(
+        self, cursor: Optional[str] = None, limit: Optional[int] = None, skip: int = 0, include_total: bool = False
+    ) -> Page:
+        """One page of students in (createdAt, id) order."""
+        return await paginate(
+            self.db.student, include={"user": True},
+            cursor=cursor, limit=limit, skip=skip, include_total=include_total
+        )
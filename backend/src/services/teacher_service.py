@@ -2,11 +2,15 @@ from typing import List, Optional
 from prisma import Prisma
 from src.models.schemas import TeacherCreate, TeacherUpdate
 from prisma.models import Teacher
+from src.utils.cache import invalidates
+from src.utils.pagination import Page, paginate
+from src.services.attendance_summary_service import AttendanceSummaryService
 
 class TeacherService:
     def __init__(self, db: Prisma):
         self.db = db
 
+    @invalidates("teachers")
     async def create_teacher(self, teacher_data: TeacherCreate) -> Teacher:
         teacher = await self.db.teacher.create(data=teacher_data.dict())
         return teacher
@@ -31,6 +35,7 @@ class TeacherService:
         )
         return teacher
 
+    @invalidates("teachers")
     async def update_teacher(self, teacher_id: str, teacher_data: TeacherUpdate) -> Optional[Teacher]:
         teacher = await self.db.teacher.update(
             where={"id": teacher_id},
@@ -38,6 +43,7 @@ class TeacherService:
         )
         return teacher
 
+    @invalidates("teachers")
     async def delete_teacher(self, teacher_id: str) -> Optional[Teacher]:
         teacher = await self.db.teacher.find_unique(
             where={"id": teacher_id},
@@ -49,9 +55,11 @@ class TeacherService:
         
         # await self.db.schedule.delete_many(where={"teacherId": teacher_id})
 
-        
-        await self.db.teacher.delete(where={"id": teacher_id})
-        await self.db.user.delete(where={"id": teacher.userId})
+        # The teacher's sessions and their attendance cascade with the teacher
+        async with self.db.tx() as tx:
+            await AttendanceSummaryService.retract_teacher_sessions(tx, teacher_id)
+            await tx.teacher.delete(where={"id": teacher_id})
+            await tx.user.delete(where={"id": teacher.userId})
         
         return teacher
 
@@ -59,6 +67,15 @@ class TeacherService:
         teachers = await self.db.teacher.find_many(include={"user": True})
         return teachers
 
+    async def page_teachers(
+        self, cursor: Optional[str] = None, limit: Optional[int] = None, skip: int = 0, include_total: bool = False
+    ) -> Page:
+        """One page of teachers in (createdAt, id) order."""
+        return await paginate(
+            self.db.teacher, include={"user": True},
+            cursor=cursor, limit=limit, skip=skip, include_total=include_total
+        )
+
     async def get_teacher_courses(self, teacher_id: str):
         """Get all courses taught by a specific teacher."""
         courses = await self.db.course.find_many(
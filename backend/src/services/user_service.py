@@ -2,6 +2,9 @@ from typing import List, Optional
 from prisma import Prisma
 from src.models.schemas import UserCreate, UserUpdate, UserOut
 from src.utils.password import hash_password
+from src.utils.cache import invalidates
+from src.utils.pagination import Page, paginate
+from src.services.attendance_summary_service import AttendanceSummaryService
 
 class UserService:
     def __init__(self, db: Prisma):
@@ -37,13 +40,29 @@ class UserService:
         )
         return UserOut.from_orm(user)
 
+    # The student/teacher profile and its enrollments cascade with the user
+    @invalidates("students", "teachers", "enrollments")
     async def delete_user(self, user_id: str) -> bool:
         try:
-            await self.db.user.delete(where={"id": user_id})
+            async with self.db.tx() as tx:
+                # A teacher's sessions and their attendance cascade with the profile
+                teacher = await tx.teacher.find_unique(where={"userId": user_id})
+                if teacher:
+                    await AttendanceSummaryService.retract_teacher_sessions(tx, teacher.id)
+                await tx.user.delete(where={"id": user_id})
             return True
         except Exception:
             return False
 
     async def list_users(self) -> List[UserOut]:
         users = await self.db.user.find_many()
-        return [UserOut.from_orm(user) for user in users]
\ No newline at end of file
+        return [UserOut.from_orm(user) for user in users]
+
+    async def page_users(
+        self, cursor: Optional[str] = None, limit: Optional[int] = None, skip: int = 0, include_total: bool = False
+    ) -> Page:
+        """One page of users in (createdAt, id) order."""
+        page = await paginate(
+            self.db.user, cursor=cursor, limit=limit, skip=skip, include_total=include_total
+        )
+        return page._replace(items=[UserOut.from_orm(user) for user in page.items])
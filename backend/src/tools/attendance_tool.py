@@ -2,6 +2,7 @@ from langchain_core.tools import tool
 from datetime import datetime
 from typing import Optional, List
 from src.services.attendance_service import AttendanceService
+from src.services.at_risk_service import AtRiskService
 from src.models.schemas import (
     ClassSessionCreate,
     ClassSessionUpdate,
@@ -9,11 +10,14 @@ from src.models.schemas import (
     StudentAttendanceCreate,
     StudentAttendanceUpdate,
     StudentAttendanceRead,
+    StudentAttendanceCompact,
     TeacherAttendanceCreate,
     TeacherAttendanceUpdate,
-    TeacherAttendanceRead
+    TeacherAttendanceRead,
+    TeacherAttendanceCompact
 )
 from src.config.database import prisma
+from src.utils.id_index import course_codes, student_ids, teacher_ids
 
 
 # ==================== CLASS SESSION TOOLS ====================
@@ -166,55 +170,47 @@ async def mark_student_attendance(
         
         # Find student by studentId
         print(f"[ATTENDANCE_TOOL] Looking up student by ID: {student_id}")
-        student = await prisma.student.find_first(
-            where={'studentId': {'equals': student_id, 'mode': 'insensitive'}}
-        )
-        if not student:
+        internal_student_id = await student_ids.resolve_one(student_id)
+        if not internal_student_id:
             print(f"[ATTENDANCE_TOOL] ❌ Student not found: {student_id}")
             return {"error": f"Student not found with ID: {student_id}"}
-        print(f"[ATTENDANCE_TOOL] ✅ Found student (internal ID: {student.id})")
+        print(f"[ATTENDANCE_TOOL] ✅ Found student (internal ID: {internal_student_id})")
         
         # Parse date or use today
         date_obj = datetime.fromisoformat(date) if date else datetime.now()
         print(f"[ATTENDANCE_TOOL] Using date: {date_obj}")
         
-        # Find or create session for this course and date
-        print(f"[ATTENDANCE_TOOL] Looking for existing session...")
-        existing_sessions = await AttendanceService.get_course_sessions(course.id, date_obj, prisma)
-        
-        if existing_sessions:
-            session = existing_sessions[0]
-            print(f"[ATTENDANCE_TOOL] ✅ Found existing session: {session.id}")
-        else:
-            print(f"[ATTENDANCE_TOOL] No session found, creating new session...")
-            # Create new session
-            session_data = ClassSessionCreate(
-                courseId=course.id,
-                teacherId=course.teacherId or marked_by_id,
-                date=date_obj,
-                startTime="09:00 AM",
-                endTime="10:00 AM",
-                status="CONDUCTED",
-                topic=f"{course.courseName} - {date_obj.strftime('%Y-%m-%d')}"
-            )
-            session = await AttendanceService.create_class_session(session_data, prisma)
-            print(f"[ATTENDANCE_TOOL] ✅ Created new session: {session.id}")
+        # Find the session held that day, or create one in the course's scheduled slot
+        session = await AttendanceService.resolve_session_for_day(
+            course.id,
+            date_obj,
+            course.teacherId or marked_by_id,
+            prisma,
+            topic=f"{course.courseName} - {date_obj.strftime('%Y-%m-%d')}"
+        )
+        print(f"[ATTENDANCE_TOOL] ✅ Using session: {session.id}")
         
         # Mark attendance
         attendance_data = StudentAttendanceCreate(
             sessionId=session.id,
-            studentId=student.id,
+            studentId=internal_student_id,
             status=status,
             remarks=remarks
         )
         
-        attendance_record = await AttendanceService.mark_attendance(
+        # Upsert so re-marking the same student for the session overwrites the status
+        result = await AttendanceService.upsert_attendance(
             attendance_data, 
             marked_by_id or session.teacherId, 
             prisma
         )
-        print(f"[ATTENDANCE_TOOL] ✅ Marked attendance: {attendance_record.id}")
-        return StudentAttendanceRead.model_validate(attendance_record).model_dump()
+        attendance_record = result['record']
+        action = 'created' if result['created'] else 'updated' if result['updated'] else 'unchanged'
+        print(f"[ATTENDANCE_TOOL] ✅ Marked attendance ({action}): {attendance_record.id}")
+        return {
+            **StudentAttendanceRead.model_validate(attendance_record).model_dump(),
+            "result": action
+        }
     except Exception as e:
         print(f"[ATTENDANCE_TOOL] ❌ Failed to mark attendance: {str(e)}")
         import traceback
@@ -255,72 +251,64 @@ async def bulk_mark_student_attendance(
             return {"error": f"Course not found with code: {course_code}"}
         print(f"[ATTENDANCE_TOOL] ✅ Found course: {course.courseName} (ID: {course.id})")
         
+        # Resolve all studentIds in one query
+        print(f"[ATTENDANCE_TOOL] Resolving {len(student_attendance_list)} student IDs...")
+        student_id_map, unresolved = await student_ids.resolve(
+            item.get('studentId') for item in student_attendance_list
+        )
+        if unresolved:
+            print(f"[ATTENDANCE_TOOL] ⚠️ Students not found, skipping: {unresolved}")
+        if not student_id_map:
+            return {
+                "error": "None of the given student IDs were found",
+                "unresolved_student_ids": unresolved
+            }
+        
         # Parse date or use today
         date_obj = datetime.fromisoformat(date) if date else datetime.now()
         print(f"[ATTENDANCE_TOOL] Using date: {date_obj}")
         
-        # Find or create session for this course and date
-        print(f"[ATTENDANCE_TOOL] Looking for existing session...")
-        existing_sessions = await AttendanceService.get_course_sessions(course.id, date_obj, prisma)
-        
-        if existing_sessions:
-            session = existing_sessions[0]
-            print(f"[ATTENDANCE_TOOL] ✅ Found existing session: {session.id}")
-        else:
-            print(f"[ATTENDANCE_TOOL] No session found, creating new session...")
-            # Create new session
-            session_data = ClassSessionCreate(
-                courseId=course.id,
-                teacherId=course.teacherId or marked_by_id,
-                date=date_obj,
-                startTime="09:00 AM",
-                endTime="10:00 AM",
-                status="CONDUCTED",
-                topic=f"{course.courseName} - {date_obj.strftime('%Y-%m-%d')}"
-            )
-            session = await AttendanceService.create_class_session(session_data, prisma)
-            print(f"[ATTENDANCE_TOOL] ✅ Created new session: {session.id}")
-        
-        # Lookup all student internal IDs
-        print(f"[ATTENDANCE_TOOL] Looking up student internal IDs...")
-        student_id_map = {}  # Map studentId -> internal UUID
-        for item in student_attendance_list:
-            student_id = item['studentId']
-            if student_id not in student_id_map:
-                student = await prisma.student.find_first(
-                    where={'studentId': {'equals': student_id, 'mode': 'insensitive'}}
-                )
-                if not student:
-                    print(f"[ATTENDANCE_TOOL] ⚠️ Student not found: {student_id}, skipping")
-                    continue
-                student_id_map[student_id] = student.id
-                print(f"[ATTENDANCE_TOOL] ✅ Found student {student_id} (internal ID: {student.id})")
+        # Find the session held that day, or create one in the course's scheduled slot
+        session = await AttendanceService.resolve_session_for_day(
+            course.id,
+            date_obj,
+            course.teacherId or marked_by_id,
+            prisma,
+            topic=f"{course.courseName} - {date_obj.strftime('%Y-%m-%d')}"
+        )
+        print(f"[ATTENDANCE_TOOL] ✅ Using session: {session.id}")
         
         # Prepare attendance list with session ID and internal student IDs
-        attendance_list = []
-        for item in student_attendance_list:
-            student_id = item['studentId']
-            if student_id in student_id_map:
-                attendance_list.append(
-                    StudentAttendanceCreate(
-                        sessionId=session.id,
-                        studentId=student_id_map[student_id],
-                        status=item['status'],
-                        remarks=item.get('remarks')
-                    )
-                )
+        attendance_list = [
+            StudentAttendanceCreate(
+                sessionId=session.id,
+                studentId=student_id_map[item['studentId']],
+                status=item['status'],
+                remarks=item.get('remarks')
+            )
+            for item in student_attendance_list
+            if item.get('studentId') in student_id_map
+        ]
         
         print(f"[ATTENDANCE_TOOL] Marking bulk attendance for {len(attendance_list)} students...")
-        records = await AttendanceService.bulk_mark_attendance(
+        result = await AttendanceService.bulk_upsert_attendance(
             attendance_list, 
             marked_by_id or session.teacherId, 
             prisma
         )
-        print(f"[ATTENDANCE_TOOL] ✅ Successfully marked attendance for {len(records)} students")
+        records = result['records']
+        print(
+            f"[ATTENDANCE_TOOL] ✅ Successfully marked attendance for {len(records)} students "
+            f"(created={result['created']}, updated={result['updated']}, unchanged={result['unchanged']})"
+        )
         
         return {
             "message": f"Successfully marked attendance for {len(records)} students",
             "session_id": session.id,
+            "created": result['created'],
+            "updated": result['updated'],
+            "unchanged": result['unchanged'],
+            "unresolved_student_ids": unresolved,
             "records": [StudentAttendanceRead.model_validate(r).model_dump() for r in records]
         }
     except Exception as e:
@@ -331,28 +319,31 @@ async def bulk_mark_student_attendance(
 
 
 @tool
-async def get_student_attendance_record(attendance_id: str):
+async def get_student_attendance_record(attendance_id: str, fields: str = "full"):
     """Get a specific student attendance record by its ID.
     
     Args:
         attendance_id: The unique identifier of the attendance record
+        fields: 'full' (nested student/course/session objects, default) or 'compact' (flat row with names)
     """
     try:
-        record = await AttendanceService.get_attendance_by_id(attendance_id, prisma)
+        record = await AttendanceService.get_attendance_by_id(attendance_id, prisma, fields)
         if not record:
             return {"error": "Attendance record not found"}
-        return StudentAttendanceRead.model_validate(record).model_dump()
+        model = StudentAttendanceCompact if fields == "compact" else StudentAttendanceRead
+        return model.model_validate(record).model_dump()
     except Exception as e:
         return {"error": f"Failed to get attendance record: {str(e)}"}
 
 
 @tool
-async def get_course_attendance_records(course_code: str, date: Optional[str] = None):
+async def get_course_attendance_records(course_code: str, date: Optional[str] = None, fields: str = "compact"):
     """Get all attendance records for a course, optionally filtered by date.
     
     Args:
         course_code: Course code (e.g., 'CS101', 'MATH201')
         date: Optional date filter in ISO format (YYYY-MM-DD)
+        fields: 'compact' (flat rows with names, default) or 'full' (nested student/course/session objects)
     """
     print(f"[ATTENDANCE_TOOL] get_course_attendance_records: course_code={course_code}, date={date}")
     try:
@@ -366,21 +357,23 @@ async def get_course_attendance_records(course_code: str, date: Optional[str] =
         print(f"[ATTENDANCE_TOOL] ✅ Found course: {course.courseName} (ID: {course.id})")
         
         date_obj = datetime.fromisoformat(date) if date else None
-        records = await AttendanceService.get_course_attendance(course.id, date_obj, prisma)
+        records = await AttendanceService.get_course_attendance(course.id, date_obj, prisma, fields)
         print(f"[ATTENDANCE_TOOL] ✅ Found {len(records)} attendance records")
-        return [StudentAttendanceRead.model_validate(r).model_dump() for r in records]
+        model = StudentAttendanceCompact if fields == "compact" else StudentAttendanceRead
+        return [model.model_validate(r).model_dump() for r in records]
     except Exception as e:
         print(f"[ATTENDANCE_TOOL] ❌ Failed: {str(e)}")
         return {"error": f"Failed to get course attendance: {str(e)}"}
 
 
 @tool
-async def get_student_attendance_records(student_id: str, course_code: Optional[str] = None):
+async def get_student_attendance_records(student_id: str, course_code: Optional[str] = None, fields: str = "compact"):
     """Get all attendance records for a student, optionally filtered by course.
     
     Args:
         student_id: Student ID (e.g., 'S001', 'S002')
         course_code: Optional course code (e.g., 'CS101') to filter by specific course
+        fields: 'compact' (flat rows with names, default) or 'full' (nested student/course/session objects)
     """
     print(f"[ATTENDANCE_TOOL] get_student_attendance_records: student_id={student_id}, course_code={course_code}")
     try:
@@ -405,9 +398,10 @@ async def get_student_attendance_records(student_id: str, course_code: Optional[
             course_internal_id = course.id
             print(f"[ATTENDANCE_TOOL] ✅ Found course: {course.courseName} (ID: {course.id})")
         
-        records = await AttendanceService.get_student_attendance(student.id, course_internal_id, prisma)
+        records = await AttendanceService.get_student_attendance(student.id, course_internal_id, prisma, fields)
         print(f"[ATTENDANCE_TOOL] ✅ Found {len(records)} attendance records")
-        return [StudentAttendanceRead.model_validate(r).model_dump() for r in records]
+        model = StudentAttendanceCompact if fields == "compact" else StudentAttendanceRead
+        return [model.model_validate(r).model_dump() for r in records]
     except Exception as e:
         print(f"[ATTENDANCE_TOOL] ❌ Failed: {str(e)}")
         return {"error": f"Failed to get student attendance: {str(e)}"}
@@ -447,19 +441,70 @@ async def delete_student_attendance(attendance_id: str):
 
 
 @tool
-async def get_all_students_attendance_stats():
+async def get_all_students_attendance_stats(
+    department: Optional[str] = None,
+    semester: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 50
+):
     """
     Get comprehensive attendance statistics for all students.
     Returns course-wise breakdown with attendance percentages and status.
     Use this for generating attendance reports or dashboard views.
+
+    Args:
+        department: Optional department to filter students by. (optional)
+        semester: Optional semester to filter students by. (optional)
+        skip: Number of students to skip, for paging through results (default: 0). (optional)
+        limit: Maximum number of students to return (default: 50). (optional)
     """
     try:
-        stats = await AttendanceService.get_all_students_attendance(prisma)
-        return {"students": stats, "count": len(stats)}
+        stats = await AttendanceService.get_all_students_attendance(
+            prisma, department=department, semester=semester, skip=skip, limit=limit
+        )
+        return {"students": stats, "count": len(stats), "skip": skip, "has_more": len(stats) == limit}
     except Exception as e:
         return {"error": f"Failed to get students attendance stats: {str(e)}"}
 
 
+@tool
+async def get_at_risk_students(
+    status: Optional[str] = None,
+    department: Optional[str] = None,
+    course_code: Optional[str] = None,
+    limit: int = 50
+):
+    """
+    List students whose attendance in a course is below 75%, lowest first.
+    Use this for questions about low attendance, defaulters or students at risk.
+
+    Args:
+        status: 'Warning' (60-75%) or 'Critical' (below 60%). (optional)
+        department: Optional department to filter students by. (optional)
+        course_code: Optional course code to filter by (e.g., 'CS101'). (optional)
+        limit: Maximum number of rows to return (default: 50). (optional)
+    """
+    print(f"[ATTENDANCE_TOOL] get_at_risk_students: status={status}, department={department}, course_code={course_code}")
+    try:
+        course_id = None
+        if course_code:
+            course_id = await course_codes.resolve_one(course_code)
+            if not course_id:
+                return {"error": f"Course not found with code: {course_code}"}
+        if status:
+            status = status.capitalize()
+
+        rows = await AtRiskService.list_at_risk(
+            prisma, status=status, department=department, course_id=course_id, limit=limit
+        )
+        for row in rows:
+            row['updatedAt'] = row['updatedAt'].isoformat() if row['updatedAt'] else None
+        return {"students": rows, "count": len(rows), "has_more": len(rows) == limit}
+    except Exception as e:
+        print(f"[ATTENDANCE_TOOL] ❌ Failed: {str(e)}")
+        return {"error": f"Failed to get at-risk students: {str(e)}"}
+
+
 # ==================== TEACHER ATTENDANCE TOOLS ====================
 
 @tool
@@ -500,12 +545,13 @@ async def get_teacher_attendance_record(attendance_id: str):
 
 
 @tool
-async def get_teacher_attendance_records(teacher_id: str, course_code: Optional[str] = None):
+async def get_teacher_attendance_records(teacher_id: str, course_code: Optional[str] = None, fields: str = "compact"):
     """Get all attendance records for a teacher, optionally filtered by course.
     
     Args:
         teacher_id: Teacher ID (e.g., 'T001', 'T002')
         course_code: Optional course code (e.g., 'CS101') to filter by specific course
+        fields: 'compact' (flat rows with names, default) or 'full' (nested teacher/course/session objects)
     """
     print(f"[ATTENDANCE_TOOL] get_teacher_attendance_records: teacher_id={teacher_id}, course_code={course_code}")
     try:
@@ -530,9 +576,10 @@ async def get_teacher_attendance_records(teacher_id: str, course_code: Optional[
             course_internal_id = course.id
             print(f"[ATTENDANCE_TOOL] ✅ Found course: {course.courseName} (ID: {course.id})")
         
-        records = await AttendanceService.get_teacher_attendance(teacher.id, course_internal_id, prisma)
+        records = await AttendanceService.get_teacher_attendance(teacher.id, course_internal_id, prisma, fields)
         print(f"[ATTENDANCE_TOOL] ✅ Found {len(records)} attendance records")
-        return [TeacherAttendanceRead.model_validate(r).model_dump() for r in records]
+        model = TeacherAttendanceCompact if fields == "compact" else TeacherAttendanceRead
+        return [model.model_validate(r).model_dump() for r in records]
     except Exception as e:
         print(f"[ATTENDANCE_TOOL] ❌ Failed: {str(e)}")
         return {"error": f"Failed to get teacher attendance: {str(e)}"}
@@ -582,3 +629,34 @@ async def get_all_teachers_attendance_stats():
         return {"teachers": stats, "count": len(stats)}
     except Exception as e:
         return {"error": f"Failed to get teachers attendance stats: {str(e)}"}
+
+
+@tool
+async def get_teacher_attendance_trends(
+    period: str = "week",
+    periods: int = 12,
+    teacher_id: Optional[str] = None,
+    department: Optional[str] = None
+):
+    """
+    Get conducted vs missed class sessions per teacher, bucketed by week or month.
+    Use this for questions about how teacher attendance changed over time.
+
+    Args:
+        period: 'week' or 'month' (default: 'week'). (optional)
+        periods: Number of periods to cover, ending with the current one (default: 12). (optional)
+        teacher_id: Optional teacher ID to limit the result to (e.g., 'T001'). (optional)
+        department: Optional department to filter teachers by. (optional)
+    """
+    try:
+        resolved_teacher_id = None
+        if teacher_id:
+            resolved_teacher_id = await teacher_ids.resolve_one(teacher_id)
+            if not resolved_teacher_id:
+                return {"error": f"Teacher not found with ID: {teacher_id}"}
+        return await AttendanceService.get_teacher_attendance_trends(
+            prisma, period=period.lower(), periods=periods,
+            teacher_id=resolved_teacher_id, department=department
+        )
+    except Exception as e:
+        return {"error": f"Failed to get teacher attendance trends: {str(e)}"}
@@ -106,6 +106,8 @@ async def get_my_attendance(user_id: str, user_role: str, course_id: Optional[st
     print(f"[CONTEXT_TOOL] get_my_attendance called: user_id={user_id}, role={user_role}, course_id={course_id}")
     try:
         from src.services.attendance_service import AttendanceService
+        from src.services.attendance_summary_service import AttendanceSummaryService
+        from src.models.schemas import StudentAttendanceCompact, TeacherAttendanceCompact
         
         if user_role == "TEACHER":
             print(f"[CONTEXT_TOOL] Looking up teacher profile for user_id={user_id}")
@@ -115,18 +117,23 @@ async def get_my_attendance(user_id: str, user_role: str, course_id: Optional[st
                 print(f"[CONTEXT_TOOL] ❌ Teacher profile not found for user_id={user_id}")
                 return {"error": "Teacher profile not found"}
             
-            print(f"[CONTEXT_TOOL] ✅ Found teacher: id={teacher.id}, fetching attendance records")
-            # Get teacher's attendance
-            records = await AttendanceService.get_teacher_attendance(teacher.id, course_id, prisma)
-            print(f"[CONTEXT_TOOL] ✅ Retrieved {len(records)} attendance records for teacher")
-            return {
+            print(f"[CONTEXT_TOOL] ✅ Found teacher: id={teacher.id}, fetching attendance summary")
+            # Per-course counters; raw records only when a single course is asked for
+            courses = await AttendanceSummaryService.get_teacher_summary(teacher.id, course_id, prisma)
+            total = sum(c["total"] for c in courses)
+            print(f"[CONTEXT_TOOL] ✅ Retrieved summary for {len(courses)} courses ({total} sessions)")
+            result = {
                 "success": True,
                 "role": "TEACHER",
                 "teacher_id": teacher.id,
-                "attendance_records": [r.model_dump() for r in records],
-                "total_sessions": len(records),
-                "message": f"Found {len(records)} attendance records"
+                "courses": courses,
+                "total_sessions": total,
+                "message": f"Found {total} attendance records"
             }
+            if course_id:
+                records = await AttendanceService.get_teacher_attendance(teacher.id, course_id, prisma, fields="compact")
+                result["attendance_records"] = [TeacherAttendanceCompact.model_validate(r).model_dump() for r in records]
+            return result
             
         elif user_role == "STUDENT":
             print(f"[CONTEXT_TOOL] Looking up student profile for user_id={user_id}")
@@ -136,27 +143,30 @@ async def get_my_attendance(user_id: str, user_role: str, course_id: Optional[st
                 print(f"[CONTEXT_TOOL] ❌ Student profile not found for user_id={user_id}")
                 return {"error": "Student profile not found"}
             
-            print(f"[CONTEXT_TOOL] ✅ Found student: id={student.id}, fetching attendance records")
-            # Get student's attendance
-            records = await AttendanceService.get_student_attendance(student.id, course_id, prisma)
-            print(f"[CONTEXT_TOOL] Retrieved {len(records)} attendance records for student")
+            print(f"[CONTEXT_TOOL] ✅ Found student: id={student.id}, fetching attendance summary")
+            # Per-course counters; raw records only when a single course is asked for
+            courses = await AttendanceSummaryService.get_student_summary(student.id, course_id, prisma)
             
             # Calculate attendance percentage
-            total = len(records)
-            present = len([r for r in records if r.status == "PRESENT"])
+            total = sum(c["total"] for c in courses)
+            present = sum(c["present"] for c in courses)
             percentage = (present / total * 100) if total > 0 else 0
             print(f"[CONTEXT_TOOL] Attendance stats: {present}/{total} classes ({percentage:.1f}%)")
             
-            return {
+            result = {
                 "success": True,
                 "role": "STUDENT",
                 "student_id": student.id,
-                "attendance_records": [r.model_dump() for r in records],
+                "courses": courses,
                 "total_classes": total,
                 "attended": present,
                 "attendance_percentage": round(percentage, 2),
                 "message": f"Your attendance: {present}/{total} classes ({percentage:.1f}%)"
             }
+            if course_id:
+                records = await AttendanceService.get_student_attendance(student.id, course_id, prisma, fields="compact")
+                result["attendance_records"] = [StudentAttendanceCompact.model_validate(r).model_dump() for r in records]
+            return result
         else:
             print(f"[CONTEXT_TOOL] ❌ Attendance not available for role={user_role}")
             return {"error": "Attendance not available for admin users"}
@@ -6,12 +6,14 @@ from src.models.schemas import (
     CourseOut
 )
 from src.config.database import prisma
+from src.utils.cache import cached, invalidates
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 @tool
+@cached("courses", "teachers", "departments")
 async def list_all_courses():
     """Get all courses from the database. 
     Use this when user asks to see all courses, list courses, or show available courses.
@@ -154,6 +156,7 @@ async def get_course_by_id(course_id: str = None, course_code: str = None, cours
 
 
 @tool
+@invalidates("courses")
 async def create_new_course(
     course_code: str,
     course_name: str,
@@ -226,6 +229,7 @@ async def create_new_course(
 
 
 @tool
+@invalidates("courses")
 async def update_existing_course(
     course_id: str = None,
     course_code: str = None,
@@ -334,6 +338,7 @@ async def update_existing_course(
 
 
 @tool
+@invalidates("courses")
 async def delete_existing_course(course_id: str = None, course_code: str = None, course_name: str = None):
     """
     Delete a course from the database.
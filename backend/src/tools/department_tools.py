@@ -2,10 +2,12 @@ from langchain_core.tools import tool
 from src.services.department_service import DepartmentService
 from src.models.schemas import DepartmentCreate, DepartmentUpdate,DepartmentSchema
 from src.config.database import prisma
+from src.utils.cache import cached, invalidates
 from fastapi import Depends
 
 
 @tool
+@cached("departments")
 async def list_all_departments():
     """Get all departments from the database. Use this when user asks to see all departments, list departments, or show departments."""
     print("[DEBUG] list_all_departments called")
@@ -31,6 +33,7 @@ async def get_department_by_id(department_id: str):
     return {"id": dept.id, "name": dept.name, "code": dept.code}
 
 @tool
+@invalidates("departments")
 async def create_new_department(name: str,code:str):
     """Create a new department in the database.
     
@@ -47,6 +50,7 @@ async def create_new_department(name: str,code:str):
     return {"id": dept.id, "name": dept.name, "code": dept.code, "message": "Department created successfully"}
 
 @tool
+@invalidates("departments")
 async def update_existing_department(code: str, name: str):
     """Update an existing department's name based on its code.
     
@@ -78,6 +82,7 @@ async def update_existing_department(code: str, name: str):
         return {"error": f"Failed to update department: {str(e)}"}
 
 @tool
+@invalidates("departments")
 async def delete_existing_department(department_code: str):
     """Delete a department from the database. Use this tool when the user has confirmed they want to delete a department.
     This should only be called AFTER the user has explicitly confirmed the deletion (e.g., by saying 'yes', 'confirm', 'proceed', etc.).
@@ -6,6 +6,8 @@ from src.models.schemas import (
     EnrollmentResponse
 )
 from src.config.database import prisma
+from src.utils.cache import invalidates
+from src.utils.id_index import student_ids
 from typing import Optional
 
 
@@ -23,11 +25,9 @@ async def list_all_enrollments(student_id: Optional[str] = None):
     # If student_id provided, try to find student by studentId first
     filter_by_id = None
     if student_id:
-        student = await prisma.student.find_first(
-            where={"studentId": {"equals": student_id, "mode": "insensitive"}}
-        )
-        if student:
-            filter_by_id = student.id
+        internal_id = await student_ids.resolve_one(student_id)
+        if internal_id:
+            filter_by_id = internal_id
             print(f"[ENROLLMENT_TOOL] Found student with studentId: {student_id}")
         else:
             # Fallback to treating it as internal id
@@ -134,6 +134,7 @@ async def get_student_enrollments_with_details(student_id: str):
 
 
 @tool
+@invalidates("enrollments")
 async def create_new_enrollment(
     student_id: str,
     course_code: str = None,
@@ -201,6 +202,7 @@ async def create_new_enrollment(
 
 
 @tool
+@invalidates("enrollments")
 async def update_existing_enrollment(
     enrollment_id: str,
     status: str = None,
@@ -235,6 +237,7 @@ async def update_existing_enrollment(
 
 
 @tool
+@invalidates("enrollments")
 async def delete_existing_enrollment(enrollment_id: str):
     """
     Delete an enrollment from the database.
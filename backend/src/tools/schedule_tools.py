@@ -9,6 +9,8 @@ from src.models.schemas import (
     GenerateTimeTableRequest
 )
 from src.config.database import prisma
+from src.utils.cache import cached, invalidates
+from src.utils.id_index import course_codes, teacher_ids
 from typing import Optional
 
 
@@ -31,12 +33,9 @@ async def list_all_schedules(
     resolved_course_id = None
     if course_code:
         print(f"[SCHEDULE_TOOL] Looking up course by code: {course_code}")
-        course = await prisma.course.find_first(
-            where={"courseCode": {"equals": course_code, "mode": "insensitive"}}
-        )
-        if course:
-            resolved_course_id = course.id
-            print(f"[SCHEDULE_TOOL] Found course: {course.courseName} (ID: {course.id})")
+        resolved_course_id = await course_codes.resolve_one(course_code)
+        if resolved_course_id:
+            print(f"[SCHEDULE_TOOL] Found course (ID: {resolved_course_id})")
         else:
             print(f"[SCHEDULE_TOOL] Course not found with code: {course_code}")
             return {"error": f"Course not found with code: {course_code}"}
@@ -45,12 +44,9 @@ async def list_all_schedules(
     resolved_teacher_id = None
     if teacher_id:
         print(f"[SCHEDULE_TOOL] Looking up teacher by teacherId: {teacher_id}")
-        teacher = await prisma.teacher.find_first(
-            where={"teacherId": {"equals": teacher_id, "mode": "insensitive"}}
-        )
-        if teacher:
-            resolved_teacher_id = teacher.id
-            print(f"[SCHEDULE_TOOL] Found teacher (ID: {teacher.id})")
+        resolved_teacher_id = await teacher_ids.resolve_one(teacher_id)
+        if resolved_teacher_id:
+            print(f"[SCHEDULE_TOOL] Found teacher (ID: {resolved_teacher_id})")
         else:
             print(f"[SCHEDULE_TOOL] Teacher not found with teacherId: {teacher_id}")
             return {"error": f"Teacher not found with teacherId: {teacher_id}"}
@@ -217,6 +213,7 @@ async def get_course_schedule(course_id: str):
 
 
 @tool
+@invalidates("schedules")
 async def create_new_schedule(
     course_code: str,
     teacher_id: str,
@@ -286,6 +283,7 @@ async def create_new_schedule(
 
 
 @tool
+@invalidates("schedules")
 async def update_existing_schedule(
     course_code: str,
     teacher_id: str,
@@ -363,6 +361,7 @@ async def update_existing_schedule(
 
 
 @tool
+@invalidates("schedules")
 async def delete_existing_schedule(
     course_code: str,
     teacher_id: str,
@@ -430,6 +429,7 @@ async def delete_existing_schedule(
 
 
 @tool
+@cached("schedules", "courses", "teachers")
 async def get_full_timetable(department_id: Optional[str] = None):
     """
     Get the complete timetable for all semesters, optionally filtered by department.
@@ -458,6 +458,7 @@ async def get_full_timetable(department_id: Optional[str] = None):
 
 
 @tool
+@cached("schedules", "courses", "teachers")
 async def get_subjects_details():
     """
     Get detailed information about all subjects including teacher names and room codes.
@@ -478,6 +479,7 @@ async def get_subjects_details():
 
 
 @tool
+@invalidates("schedules")
 async def save_timetable(semester: int, timetable_json: str, section: int = 1, department_id: Optional[str] = None):
     """
     Save timetable for a specific semester.
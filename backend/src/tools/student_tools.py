@@ -3,6 +3,7 @@ from src.services.student_service import StudentService
 from src.services.user_service import UserService
 from src.models.schemas import StudentCreate,StudentResponse,StudentBase,StudentUserCreate,UserCreate,StudentUpdate
 from src.config.database import prisma
+from src.utils.cache import invalidates
 import logging
 
 logger = logging.getLogger(__name__)
@@ -59,6 +60,7 @@ async def get_student_by_studentId(student_id:str):
 
 
 @tool
+@invalidates("students")
 async def create_new_student(
     student_id: str,
     name: str,
@@ -158,6 +160,7 @@ async def create_new_student(
 
 
 @tool
+@invalidates("students")
 async def update_existing_student(
     student_id: str,
     name: str = None,
@@ -265,6 +268,7 @@ async def update_existing_student(
     
 
 @tool
+@invalidates("students")
 async def delete_existing_student(student_id: str):
     """
     Delete a student from the database using their studentId.
@@ -9,10 +9,12 @@ from src.models.schemas import (
     UserCreate
 )
 from src.config.database import prisma
+from src.utils.cache import cached, invalidates
 from fastapi import Depends
 
 
 @tool
+@cached("teachers")
 async def list_all_teachers():
     """Get all teachers from the database. Use this when user asks to see all teachers, list teachers, or show teachers."""
     print("[TOOL] list_all_teachers: Fetching all teachers from database")
@@ -54,6 +56,7 @@ async def get_teacher_by_id(teacher_id: str):
 
 
 @tool
+@invalidates("teachers")
 async def create_new_teacher(teacher: TeacherCreateWithUser):
     """
     Create a new teacher in the database.
@@ -103,6 +106,7 @@ async def create_new_teacher(teacher: TeacherCreateWithUser):
 
 
 @tool
+@invalidates("teachers")
 async def update_existing_teacher(teacher_id: str, teacher: TeacherUpdate):
     """Update an existing teacher's information using their Teacher ID (e.g., T001).
     
@@ -155,6 +159,7 @@ async def update_existing_teacher(teacher_id: str, teacher: TeacherUpdate):
 
 
 @tool
+@invalidates("teachers")
 async def delete_existing_teacher(teacher_id: str):
     """Delete a teacher from the database using their Teacher ID (e.g., T001).
 
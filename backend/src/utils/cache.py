@@ -0,0 +1,146 @@
+"""
+Shared TTL + LRU cache for read-only agent tool results.
+
+Entries are keyed by tool name and call arguments and tagged with the entity
+families they were built from ("courses", "teachers", ...). Write paths call
+`invalidate()` (or use the `@invalidates` decorator) for the families they
+touch, which drops every dependent entry. Memory is bounded by
+TOOL_CACHE_MAX_ENTRIES with least-recently-used eviction.
+
+The cache is per worker process; TOOL_CACHE_TTL_SECONDS bounds how stale an
+entry can get when another worker performs the write.
+"""
+
+import functools
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from src.utils import metrics
+
+load_dotenv()
+
+TOOL_CACHE_TTL_SECONDS = float(os.getenv("TOOL_CACHE_TTL_SECONDS", "300"))
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "256"))
+
+
+class ToolResultCache:
+    """In-memory LRU cache with per-entry TTL and family-based invalidation."""
+
+    def __init__(self, max_entries: int = TOOL_CACHE_MAX_ENTRIES, default_ttl: float = TOOL_CACHE_TTL_SECONDS):
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        # key -> (expires_at, families, value)
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, ...], Any]]" = OrderedDict()
+        # Bumped on every invalidation so in-flight reads do not store stale results
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(name: str, args: tuple, kwargs: dict) -> str:
+        return f"{name}:{json.dumps([args, kwargs], sort_keys=True, default=str)}"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value); expired entries count as misses."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[2]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def set(self, key: str, value: Any, families: Iterable[str], ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, tuple(families), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def generation(self, families: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(family, 0) for family in families)
+
+    def invalidate(self, *families: str) -> int:
+        """Drop every entry depending on any of `families`; returns the number removed."""
+        wanted = set(families)
+        for family in wanted:
+            self._generations[family] = self._generations.get(family, 0) + 1
+        stale = [key for key, (_, tags, _) in self._entries.items() if wanted.intersection(tags)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += 1
+        return len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Shared by every tool in this worker
+tool_cache = ToolResultCache()
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+def cached(*families: str, ttl: Optional[float] = None) -> Callable:
+    """
+    Cache an async read-only function's result by name and arguments.
+
+    Place it directly above the function (below `@tool`) so the tool schema
+    still comes from the original signature. Error results are not cached.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = ToolResultCache.make_key(func.__name__, args, kwargs)
+            found, value = tool_cache.get(key)
+            if found:
+                metrics.increment(f"tool_cache.hit.{func.__name__}")
+                return value
+            metrics.increment(f"tool_cache.miss.{func.__name__}")
+
+            generation = tool_cache.generation(families)
+            result = await func(*args, **kwargs)
+            if not _is_error(result) and tool_cache.generation(families) == generation:
+                tool_cache.set(key, result, families, ttl)
+            return result
+        return wrapper
+    return decorator
+
+
+def invalidates(*families: str) -> Callable:
+    """Invalidate cached results for `families` after the wrapped async write runs."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                # Also on failure: a partial write may still have changed rows
+                tool_cache.invalidate(*families)
+        return wrapper
+    return decorator
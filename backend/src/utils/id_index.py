@@ -0,0 +1,88 @@
+"""
+Cached lookup from human-readable IDs ("S001", "T004", "CS101") to internal row IDs.
+
+Tools receive the IDs users type, which are matched case-insensitively. An
+IdIndex resolves any number of them with one `find_many` (`in` +
+`mode: insensitive`) and remembers the mapping, so repeated chat requests
+about the same students/courses skip the lookup entirely.
+
+Entries are dropped when the tool cache invalidates the index's family (every
+create/update/delete of that entity in this worker) and expire after
+TOOL_CACHE_TTL_SECONDS to bound staleness across workers.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config.database import prisma
+from src.utils import metrics
+from src.utils.cache import TOOL_CACHE_TTL_SECONDS, tool_cache
+
+
+class IdIndex:
+    """Case-insensitive human ID -> internal ID index for one model."""
+
+    def __init__(self, model: str, field: str, family: str, ttl: float = TOOL_CACHE_TTL_SECONDS):
+        self.model = model
+        self.field = field
+        self.family = family
+        self.ttl = ttl
+        # lower-cased human ID -> (expires_at, internal ID)
+        self._entries: Dict[str, Tuple[float, str]] = {}
+        self._generation = tool_cache.generation((family,))
+
+    def _sync(self):
+        generation = tool_cache.generation((self.family,))
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    async def resolve(self, human_ids: Iterable[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Resolve `human_ids` in one query.
+
+        Returns ({human ID as given: internal ID}, [unresolved human IDs]).
+        """
+        self._sync()
+        wanted = list(dict.fromkeys(h for h in human_ids if h))
+        now = time.monotonic()
+        resolved: Dict[str, str] = {}
+        missing: List[str] = []
+        for human_id in wanted:
+            entry = self._entries.get(human_id.lower())
+            if entry and entry[0] > now:
+                resolved[human_id] = entry[1]
+            else:
+                missing.append(human_id)
+
+        if missing:
+            metrics.increment(f"id_index.miss.{self.model}", len(missing))
+            generation = self._generation
+            rows = await getattr(prisma, self.model).find_many(
+                where={self.field: {'in': missing, 'mode': 'insensitive'}}
+            )
+            found = {getattr(row, self.field).lower(): row.id for row in rows}
+            expires_at = time.monotonic() + self.ttl
+            for human_id in missing:
+                internal_id = found.get(human_id.lower())
+                if internal_id is None:
+                    continue
+                resolved[human_id] = internal_id
+                if tool_cache.generation((self.family,)) == generation:
+                    self._entries[human_id.lower()] = (expires_at, internal_id)
+        metrics.increment(f"id_index.hit.{self.model}", len(wanted) - len(missing))
+
+        return resolved, [h for h in wanted if h not in resolved]
+
+    async def resolve_one(self, human_id: str) -> Optional[str]:
+        """Internal ID for one human ID, or None."""
+        resolved, _ = await self.resolve([human_id])
+        return resolved.get(human_id)
+
+    def clear(self):
+        self._entries.clear()
+
+
+student_ids = IdIndex("student", "studentId", "students")
+teacher_ids = IdIndex("teacher", "teacherId", "teachers")
+course_codes = IdIndex("course", "courseCode", "courses")
@@ -0,0 +1,104 @@
+"""
+Process-wide limiter for outstanding LLM calls.
+
+At most LLM_MAX_CONCURRENCY model calls run at once per worker. Further calls
+wait in a bounded queue (LLM_MAX_QUEUE); when the queue is full, or a call
+waits longer than LLM_QUEUE_TIMEOUT_SECONDS, LLMOverloadedError is raised so
+the API can shed load with a 503 instead of piling up requests.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from dotenv import load_dotenv
+
+from src.utils.metrics import record_latency
+
+load_dotenv()
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "32"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "30"))
+
+
+class LLMOverloadedError(Exception):
+    """Raised when an LLM call cannot get a slot (queue full or wait timed out)."""
+
+
+class LLMConcurrencyLimiter:
+    """Bounded semaphore plus bounded wait queue, with backpressure counters."""
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_queue: int = LLM_MAX_QUEUE,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one LLM slot for the duration of the block."""
+        queued_at = time.perf_counter()
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise LLMOverloadedError("Too many pending assistant requests, please retry shortly")
+
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise LLMOverloadedError("Timed out waiting for the assistant, please retry shortly")
+            finally:
+                self.waiting -= 1
+        else:
+            # A free slot: acquire() returns without suspending
+            await self._semaphore.acquire()
+        record_latency("llm.queue_wait", (time.perf_counter() - queued_at) * 1000)
+
+        self.in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+            record_latency("llm.call", (time.perf_counter() - started_at) * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+# Shared by every agent in this worker
+llm_limiter = LLMConcurrencyLimiter()
+
+
+async def ainvoke_llm(model, messages):
+    """Invoke a (tool-bound) chat model asynchronously under the global limiter."""
+    async with llm_limiter.slot():
+        return await model.ainvoke(messages)
@@ -0,0 +1,54 @@
+"""
+Tiny in-process metrics registry for latency samples and counters.
+
+Values are per worker process; they are meant for logs and the admin
+metrics endpoint, not as a replacement for a real metrics backend.
+"""
+
+from typing import Dict
+
+
+class LatencyStats:
+    """Running count / mean / max for a named operation, in milliseconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.last_ms = elapsed_ms
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "last_ms": round(self.last_ms, 2),
+        }
+
+
+_latencies: Dict[str, LatencyStats] = {}
+_counters: Dict[str, int] = {}
+
+
+def record_latency(name: str, elapsed_ms: float):
+    """Record one latency sample for `name`."""
+    _latencies.setdefault(name, LatencyStats()).record(elapsed_ms)
+
+
+def increment(name: str, amount: int = 1):
+    """Increment a named counter."""
+    _counters[name] = _counters.get(name, 0) + amount
+
+
+def snapshot() -> Dict[str, Dict]:
+    """Current values of all latencies and counters."""
+    return {
+        "latencies": {name: stats.snapshot() for name, stats in sorted(_latencies.items())},
+        "counters": dict(sorted(_counters.items())),
+    }
@@ -0,0 +1,122 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Rows are ordered by a timestamp column plus "id" as tie-breaker, and a page
+continues strictly after the last row of the previous one: the WHERE clause
+is `(field, id) > (last field, last id)` and the query takes `limit + 1`
+rows to know whether another page follows. Unlike OFFSET, the database
+never reads the rows of earlier pages, so every page costs the same however
+deep the client scrolls and however large the table grows.
+
+Cursors are opaque to clients: base64url of `[field value, id]`.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import Response
+
+# Upper bound for the `limit` query parameter of paginated routes
+MAX_PAGE_SIZE = 500
+
+# Response headers carrying the page metadata; list bodies keep their shape
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def _value(row, key: str):
+    return row[key] if isinstance(row, dict) else getattr(row, key)
+
+
+def encode_cursor(value, row_id: str) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValueError for cursors not issued by it."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        if not isinstance(row_id, str):
+            raise TypeError(row_id)
+        return datetime.fromisoformat(value.replace("Z", "+00:00")), row_id
+    except (binascii.Error, TypeError, ValueError, AttributeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def keyset_where(where: Optional[Dict], cursor: Optional[str], field: str = "createdAt", descending: bool = False) -> Dict:
+    """Prisma `where` restricted to rows after the cursor (in keyset order)."""
+    where = dict(where or {})
+    if not cursor:
+        return where
+    value, row_id = decode_cursor(cursor)
+    op = "lt" if descending else "gt"
+    after = {"OR": [{field: {op: value}}, {field: value, "id": {op: row_id}}]}
+    if not where:
+        return after
+    return {"AND": [where, after]}
+
+
+def keyset_order(field: str = "createdAt", descending: bool = False) -> List[Dict[str, str]]:
+    direction = "desc" if descending else "asc"
+    return [{field: direction}, {"id": direction}]
+
+
+def make_page(rows: List[Any], limit: Optional[int], field: str = "createdAt", total: Optional[int] = None) -> Page:
+    """Build a Page from rows fetched with `take=limit + 1`."""
+    if limit is None or len(rows) <= limit:
+        return Page(rows, None, total)
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor(_value(last, field), _value(last, "id")), total)
+
+
+async def paginate(
+    delegate,
+    where: Optional[Dict] = None,
+    include: Optional[Dict] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    skip: int = 0,
+    field: str = "createdAt",
+    descending: bool = False,
+    include_total: bool = False
+) -> Page:
+    """
+    One page of a Prisma model delegate (e.g. `db.student`) in (field, id) order.
+
+    `limit=None` returns every remaining row. `skip` is applied after the
+    cursor and only kept for offset-style callers. The total is the count
+    of rows matching `where`, computed only when asked for.
+    """
+    kwargs = {
+        "where": keyset_where(where, cursor, field, descending),
+        "order": keyset_order(field, descending),
+        "skip": skip or None,
+        "take": limit + 1 if limit is not None else None,
+    }
+    if include:
+        kwargs["include"] = include
+    rows = await delegate.find_many(**kwargs)
+    total = await delegate.count(where=where or {}) if include_total else None
+    return make_page(rows, limit, field, total)
+
+
+def set_page_headers(response: Response, page: Page):
+    """Expose a page's cursor/total on the response of a list route."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total)
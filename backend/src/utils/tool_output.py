@@ -0,0 +1,196 @@
+"""
+Compact, token-budgeted rendering of tool results for the LLM.
+
+Tool results are Python structures (lists of dicts, nested models). Passing
+`str(result)` to the model wastes tokens on repr syntax, nulls and audit
+timestamps. `compact_tool_output` instead:
+
+  * drops None / empty values and audit timestamps (createdAt, updatedAt, markedAt)
+  * renders uniform lists of records as a pipe-separated table
+    (nested objects are flattened to dotted columns, e.g. teacher.name)
+  * renders everything else as minified JSON
+  * enforces a per-tool token budget, truncating rows with an explicit marker
+    and a hint on how to ask for the remaining data
+
+Token counts are estimated at ~4 characters per token, which is close enough
+for budgeting and for reporting savings.
+"""
+
+import json
+import math
+import os
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+load_dotenv()
+
+# Default token budget for a single tool result
+TOOL_OUTPUT_TOKEN_BUDGET = int(os.getenv("TOOL_OUTPUT_TOKEN_BUDGET", "2000"))
+
+# Tools whose full output is usually needed get a larger budget
+TOOL_TOKEN_BUDGETS: Dict[str, int] = {
+    "get_full_timetable": 6000,
+    "get_teacher_timetable_grid": 3000,
+    "get_student_timetable_grid": 3000,
+    "get_my_schedule": 3000,
+}
+
+DROPPED_KEYS = {"createdAt", "updatedAt", "markedAt", "password", "hashedPassword"}
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.hour == value.minute == value.second == 0 and not value.microsecond:
+            return value.date().isoformat()
+        return value.isoformat(timespec="minutes")
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "value") and not isinstance(value, (str, int, float, bool)):
+        return value.value  # enums
+    return value
+
+
+def prune(value: Any) -> Any:
+    """Drop nulls, empty containers and audit timestamps; normalise scalars."""
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            if key in DROPPED_KEYS:
+                continue
+            item = prune(item)
+            if item is None or item == "" or item == [] or item == {}:
+                continue
+            pruned[key] = item
+        return pruned
+    if isinstance(value, (list, tuple)):
+        return [prune(item) for item in value]
+    return _scalar(value)
+
+
+def _flatten(record: Dict[str, Any], prefix: str = "") -> Optional[Dict[str, Any]]:
+    """Flatten nested dicts to dotted keys; None if the record holds lists."""
+    flat: Dict[str, Any] = {}
+    for key, item in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(item, dict):
+            nested = _flatten(item, f"{name}.")
+            if nested is None:
+                return None
+            flat.update(nested)
+        elif isinstance(item, list):
+            return None
+        else:
+            flat[name] = item
+    return flat
+
+
+def _table_rows(records: List[Any]) -> Optional[Tuple[List[str], List[str]]]:
+    """Header and row lines for a list of flat-able dicts, else None."""
+    if not records or not all(isinstance(r, dict) for r in records):
+        return None
+    flat_records = [_flatten(r) for r in records]
+    if any(r is None for r in flat_records):
+        return None
+    columns: List[str] = []
+    for record in flat_records:
+        for key in record:
+            if key not in columns:
+                columns.append(key)
+    if len(records) < 2 or len(columns) < 2:
+        return None
+
+    def cell(value: Any) -> str:
+        if value is None:
+            return ""
+        return str(value).replace("|", "/").replace("\n", " ")
+
+    rows = [" | ".join(cell(r.get(c)) for c in columns) for r in flat_records]
+    return [" | ".join(columns)], rows
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _truncation_note(shown: int, total: int, label: str = "rows") -> str:
+    return (
+        f"[truncated: showing {shown} of {total} {label}. "
+        f"Ask the user to narrow the request (e.g. by department, course, semester or ID) "
+        f"to see the rest.]"
+    )
+
+
+def _render_list(records: List[Any], budget_chars: int) -> str:
+    if not records:
+        return "No results."
+    table = _table_rows(records)
+    if table:
+        header, rows = table
+        lines = [f"{len(rows)} rows", *header]
+    else:
+        rows = [_json(r) for r in records]
+        lines = [f"{len(rows)} items"]
+    # Leave room for the truncation note
+    used = sum(len(line) + 1 for line in lines) + len(_truncation_note(len(rows), len(rows))) + 1
+    shown = 0
+    for row in rows:
+        if used + len(row) + 1 > budget_chars and shown:
+            break
+        lines.append(row)
+        used += len(row) + 1
+        shown += 1
+    if shown < len(rows):
+        lines.append(_truncation_note(shown, len(rows), "rows" if table else "items"))
+    return "\n".join(lines)
+
+
+def _render(value: Any, budget_chars: int) -> str:
+    if isinstance(value, list):
+        return _render_list(value, budget_chars)
+
+    text = _json(value)
+    if len(text) <= budget_chars or not isinstance(value, dict):
+        return text
+
+    # Over budget: render the largest list field as a (truncated) table
+    list_keys = [k for k, v in value.items() if isinstance(v, list)]
+    if list_keys:
+        key = max(list_keys, key=lambda k: len(_json(value[k])))
+        rest = {k: v for k, v in value.items() if k != key}
+        head = _json(rest) if rest else ""
+        body = _render_list(value[key], budget_chars - len(head) - len(key) - 4)
+        return f"{head}\n{key}:\n{body}" if head else f"{key}:\n{body}"
+    return text
+
+
+def compact_tool_output(tool_name: str, result: Any) -> Tuple[str, int, int]:
+    """
+    Render a tool result for the model.
+
+    Returns (text, raw_tokens, compact_tokens) where raw_tokens is the size
+    the old `str(result)` rendering would have had.
+    """
+    if isinstance(result, str):
+        raw_text = result
+        pruned: Any = result
+    else:
+        raw_text = str(result)
+        pruned = prune(result)
+
+    budget_chars = TOOL_TOKEN_BUDGETS.get(tool_name, TOOL_OUTPUT_TOKEN_BUDGET) * CHARS_PER_TOKEN
+    text = pruned if isinstance(pruned, str) else _render(pruned, budget_chars)
+    if len(text) > budget_chars:
+        cut = text[:budget_chars]
+        text = f"{cut}\n[truncated: output exceeded {budget_chars // CHARS_PER_TOKEN} tokens. Ask for a narrower request.]"
+    return text, estimate_tokens(raw_text), estimate_tokens(text)
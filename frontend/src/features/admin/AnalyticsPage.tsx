@@ -1,3 +1,4 @@
+import { useEffect, useState } from "react";
 import { DashboardLayout } from "@/layout";
 import {
   Card,
@@ -7,6 +8,19 @@ import {
   CardTitle,
 } from "@/components/ui/card";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
+import { Skeleton } from "@/components/ui/skeleton";
+import { Alert, AlertDescription } from "@/components/ui/alert";
+import { Button } from "@/components/ui/button";
+import {
+  Table,
+  TableBody,
+  TableCell,
+  TableHead,
+  TableHeader,
+  TableRow,
+} from "@/components/ui/table";
+import { useAttendanceService } from "@/services/attendanceService";
+import type { TeacherAttendanceTrends } from "@/services/attendanceService";
 import {
   IconTrendingUp,
   IconTrendingDown,
@@ -14,6 +28,7 @@ import {
   IconBook,
   IconClipboardCheck,
   IconChartBar,
+  IconAlertCircle,
 } from "@tabler/icons-react";
 
 export default function AnalyticsPage() {
@@ -163,19 +178,176 @@ export default function AnalyticsPage() {
         </TabsContent>
 
         <TabsContent value="attendance" className="space-y-4">
-          <Card>
-            <CardHeader>
-              <CardTitle>Attendance Analytics</CardTitle>
-              <CardDescription>Attendance trends and patterns</CardDescription>
-            </CardHeader>
-            <CardContent>
-              <p className="text-muted-foreground">
-                Attendance analytics content...
-              </p>
-            </CardContent>
-          </Card>
+          <TeacherAttendanceTrendsCard />
         </TabsContent>
       </Tabs>
     </div>
   );
 }
+
+function TeacherAttendanceTrendsCard() {
+  const [period, setPeriod] = useState<"week" | "month">("week");
+  const [trends, setTrends] = useState<TeacherAttendanceTrends | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
+
+  const attendanceService = useAttendanceService();
+
+  useEffect(() => {
+    loadTrends();
+  }, [period]);
+
+  const loadTrends = async () => {
+    try {
+      setLoading(true);
+      setError(null);
+      const data = await attendanceService.getTeacherAttendanceTrends(period);
+      setTrends(data);
+    } catch (err) {
+      setError("Failed to load teacher attendance trends. Please try again.");
+      console.error("Error loading teacher attendance trends:", err);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const formatPeriod = (periodStart: string) =>
+    new Date(`${periodStart}T00:00:00`).toLocaleDateString(
+      undefined,
+      period === "week"
+        ? { month: "short", day: "numeric" }
+        : { month: "short", year: "numeric" }
+    );
+
+  const conductedRate = (conducted: number, missed: number) =>
+    conducted + missed > 0
+      ? `${Math.round((conducted / (conducted + missed)) * 100)}%`
+      : "-";
+
+  return (
+    <Card>
+      <CardHeader className="flex flex-row items-start justify-between space-y-0">
+        <div className="space-y-1.5">
+          <CardTitle>Teacher Attendance Trends</CardTitle>
+          <CardDescription>
+            Sessions conducted vs missed per {period}
+          </CardDescription>
+        </div>
+        <div className="flex gap-2">
+          <Button
+            size="sm"
+            variant={period === "week" ? "default" : "outline"}
+            onClick={() => setPeriod("week")}
+          >
+            Weekly
+          </Button>
+          <Button
+            size="sm"
+            variant={period === "month" ? "default" : "outline"}
+            onClick={() => setPeriod("month")}
+          >
+            Monthly
+          </Button>
+        </div>
+      </CardHeader>
+      <CardContent>
+        {loading ? (
+          <div className="space-y-2">
+            {[...Array(5)].map((_, i) => (
+              <Skeleton key={i} className="h-8 w-full" />
+            ))}
+          </div>
+        ) : error ? (
+          <Alert variant="destructive">
+            <IconAlertCircle className="h-4 w-4" />
+            <AlertDescription>{error}</AlertDescription>
+          </Alert>
+        ) : trends ? (
+          <div className="space-y-6">
+            <Table>
+              <TableHeader>
+                <TableRow>
+                  <TableHead>Period</TableHead>
+                  <TableHead className="text-right">Scheduled</TableHead>
+                  <TableHead className="text-right">Conducted</TableHead>
+                  <TableHead className="text-right">Missed</TableHead>
+                  <TableHead className="text-right">Conducted %</TableHead>
+                </TableRow>
+              </TableHeader>
+              <TableBody>
+                {trends.totals.map((point) => (
+                  <TableRow key={point.periodStart}>
+                    <TableCell>{formatPeriod(point.periodStart)}</TableCell>
+                    <TableCell className="text-right">
+                      {point.scheduled}
+                    </TableCell>
+                    <TableCell className="text-right">
+                      {point.conducted}
+                    </TableCell>
+                    <TableCell className="text-right">{point.missed}</TableCell>
+                    <TableCell className="text-right">
+                      {conductedRate(point.conducted, point.missed)}
+                    </TableCell>
+                  </TableRow>
+                ))}
+              </TableBody>
+            </Table>
+
+            <Table>
+              <TableHeader>
+                <TableRow>
+                  <TableHead>Teacher</TableHead>
+                  <TableHead>Department</TableHead>
+                  <TableHead className="text-right">Conducted</TableHead>
+                  <TableHead className="text-right">Missed</TableHead>
+                  <TableHead className="text-right">Conducted %</TableHead>
+                </TableRow>
+              </TableHeader>
+              <TableBody>
+                {trends.teachers.length === 0 ? (
+                  <TableRow>
+                    <TableCell
+                      colSpan={5}
+                      className="text-center text-muted-foreground"
+                    >
+                      No sessions in this range
+                    </TableCell>
+                  </TableRow>
+                ) : (
+                  trends.teachers.map((teacher) => {
+                    const conducted = teacher.points.reduce(
+                      (sum, p) => sum + p.conducted,
+                      0
+                    );
+                    const missed = teacher.points.reduce(
+                      (sum, p) => sum + p.missed,
+                      0
+                    );
+                    return (
+                      <TableRow key={teacher.teacherId}>
+                        <TableCell>
+                          <div className="font-medium">
+                            {teacher.teacherName}
+                          </div>
+                          <div className="text-xs text-muted-foreground">
+                            {teacher.teacherIdNumber}
+                          </div>
+                        </TableCell>
+                        <TableCell>{teacher.department}</TableCell>
+                        <TableCell className="text-right">{conducted}</TableCell>
+                        <TableCell className="text-right">{missed}</TableCell>
+                        <TableCell className="text-right">
+                          {conductedRate(conducted, missed)}
+                        </TableCell>
+                      </TableRow>
+                    );
+                  })
+                )}
+              </TableBody>
+            </Table>
+          </div>
+        ) : null}
+      </CardContent>
+    </Card>
+  );
+}
@@ -31,6 +31,7 @@ export default function ChatPage() {
   const [messages, setMessages] = useState<Message[]>([]);
   const [input, setInput] = useState("");
   const [isLoading, setIsLoading] = useState(false);
+  const [toolStatus, setToolStatus] = useState<string | null>(null);
   const [threadId, setThreadId] = useState<string | null>(null);
   const [currentConversationId, setCurrentConversationId] = useState<
     string | null
@@ -224,9 +225,11 @@ export default function ChatPage() {
     setMessages((m) => [...m, userMessg]);
     setInput("");
     setIsLoading(true);
+    setToolStatus(null);
+    const assistantId = Date.now() + 1;
     try {
       const token = localStorage.getItem("token") || "";
-      const res = await fetch("http://localhost:8000/api/agent/query", {
+      const res = await fetch("http://localhost:8000/api/agent/query/stream", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -237,23 +240,71 @@ export default function ChatPage() {
           thread_id: threadId,
         }),
       });
-      const data = await res.json();
-
-      // Save thread_id for conversation continuity
-      if (data.thread_id && !threadId) {
-        setThreadId(data.thread_id);
-        console.log("Started new conversation thread:", data.thread_id);
+      if (!res.ok || !res.body) {
+        throw new Error(`Request failed with status ${res.status}`);
       }
 
-      const assistant: Message = {
-        role: "assistant",
-        query: data.answer || "No response",
-        id: Date.now() + 1,
-      };
-      setMessages((m) => [...m, assistant]);
+      // Append streamed text to the assistant bubble as it arrives
+      const appendToAssistant = (text: string, replace = false) =>
+        setMessages((m) => {
+          const existing = m.find((msg) => msg.id === assistantId);
+          if (!existing) {
+            return [...m, { role: "assistant", query: text, id: assistantId }];
+          }
+          return m.map((msg) =>
+            msg.id === assistantId
+              ? { ...msg, query: replace ? text : msg.query + text }
+              : msg,
+          );
+        });
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let streamed = "";
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Server-sent events are separated by a blank line
+        let boundary = buffer.indexOf("\n\n");
+        while (boundary !== -1) {
+          const rawEvent = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          boundary = buffer.indexOf("\n\n");
+
+          const eventName = rawEvent.match(/^event: (.*)$/m)?.[1];
+          const dataLine = rawEvent.match(/^data: (.*)$/m)?.[1];
+          if (!eventName || !dataLine) continue;
+          const data = JSON.parse(dataLine);
+
+          if (eventName === "thread") {
+            // Save thread_id for conversation continuity
+            if (data.thread_id && !threadId) {
+              setThreadId(data.thread_id);
+              console.log("Started new conversation thread:", data.thread_id);
+            }
+          } else if (eventName === "tool_start") {
+            setToolStatus(`Running ${data.name}...`);
+          } else if (eventName === "tool_end") {
+            setToolStatus(null);
+          } else if (eventName === "token") {
+            streamed += data.content;
+            appendToAssistant(data.content);
+          } else if (eventName === "done") {
+            // The final answer is authoritative (tokens from tool-calling turns may differ)
+            if (data.answer !== streamed) {
+              appendToAssistant(data.answer || "No response", true);
+            }
+          } else if (eventName === "error") {
+            appendToAssistant(`Error: ${data.detail}`, true);
+          }
+        }
+      }
     } catch (err) {
       setMessages((m) => [
-        ...m,
+        ...m.filter((msg) => msg.id !== assistantId),
         {
           role: "assistant",
           query: "Error: failed to fetch",
@@ -262,6 +313,7 @@ export default function ChatPage() {
       ]);
     } finally {
       setIsLoading(false);
+      setToolStatus(null);
     }
   };
 
@@ -393,7 +445,9 @@ export default function ChatPage() {
 
             {isLoading && (
               <div className="max-w-[20%] bg-gray-100 text-gray-800 px-3 py-2 rounded-lg">
-                <div className="animate-pulse">Assistant is typing...</div>
+                <div className="animate-pulse">
+                  {toolStatus || "Assistant is typing..."}
+                </div>
               </div>
             )}
           </div>
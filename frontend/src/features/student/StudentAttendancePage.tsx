@@ -1,8 +1,10 @@
 import { useEffect, useState } from "react";
 import { useAuth } from "@/auth/AuthContext";
-import { useStudentCourseService } from "@/services/studentCourseService";
 import { useStudentAttendanceService } from "@/services/studentAttendanceService";
-import type { Enrollment } from "@/services/studentCourseService";
+import type {
+  RecentSession,
+  StudentCourseCounters,
+} from "@/services/studentAttendanceService";
 import {
   Card,
   CardContent,
@@ -22,22 +24,18 @@ import {
   IconAlertCircle,
 } from "@tabler/icons-react";
 
-interface CourseWithAttendance extends Enrollment {
-  totalSessions: number;
-  attendedSessions: number;
-  absentSessions: number;
-  lateCount: number;
+interface CourseWithAttendance extends StudentCourseCounters {
   attendancePercentage: number;
   status: "EXCELLENT" | "GOOD" | "WARNING" | "CRITICAL";
 }
 
 export default function StudentAttendancePage() {
   const { user } = useAuth();
-  const studentCourseService = useStudentCourseService();
   const attendanceService = useStudentAttendanceService();
   const [coursesWithAttendance, setCoursesWithAttendance] = useState<
     CourseWithAttendance[]
   >([]);
+  const [recentSessions, setRecentSessions] = useState<RecentSession[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [overallStats, setOverallStats] = useState({
@@ -57,83 +55,39 @@ export default function StudentAttendancePage() {
         setLoading(true);
         setError(null);
 
-        // Get student profile
-        const studentProfile = await studentCourseService.getStudentByUserId(
-          user.id
-        );
-
-        // Get enrolled courses
-        const enrollments = await studentCourseService.getEnrolledCourses(
-          studentProfile.id
-        );
-
-        // Get attendance records
-        const attendanceRecords = await attendanceService.getStudentAttendance(
-          studentProfile.id
-        );
-
-        // Map attendance to courses
-        const coursesWithStats = await Promise.all(
-          enrollments.map(async (enrollment) => {
-            // Filter attendance for this course
-            const courseAttendance = attendanceRecords.filter(
-              (record: any) =>
-                record.courseId === enrollment.courseId ||
-                record.session?.courseId === enrollment.courseId
-            );
-
-            const totalSessions = courseAttendance.length;
-            const attendedSessions = courseAttendance.filter(
-              (r: any) => r.status === "PRESENT" || r.status === "LATE"
-            ).length;
-            const absentSessions = courseAttendance.filter(
-              (r: any) => r.status === "ABSENT"
-            ).length;
-            const lateCount = courseAttendance.filter(
-              (r: any) => r.status === "LATE"
-            ).length;
+        // Per-course counters and latest sessions in a single request
+        const overview = await attendanceService.getAttendanceOverview();
 
-            const percentage =
-              totalSessions > 0 ? (attendedSessions / totalSessions) * 100 : 0;
+        const coursesWithStats = overview.courses.map((course) => {
+          // Late arrivals count as attended
+          const percentage =
+            course.total > 0 ? (course.attended / course.total) * 100 : 0;
 
-            let status: "EXCELLENT" | "GOOD" | "WARNING" | "CRITICAL";
-            if (percentage >= 90) {
-              status = "EXCELLENT";
-            } else if (percentage >= 75) {
-              status = "GOOD";
-            } else if (percentage >= 60) {
-              status = "WARNING";
-            } else {
-              status = "CRITICAL";
-            }
+          let status: "EXCELLENT" | "GOOD" | "WARNING" | "CRITICAL";
+          if (percentage >= 90) {
+            status = "EXCELLENT";
+          } else if (percentage >= 75) {
+            status = "GOOD";
+          } else if (percentage >= 60) {
+            status = "WARNING";
+          } else {
+            status = "CRITICAL";
+          }
 
-            return {
-              ...enrollment,
-              totalSessions,
-              attendedSessions,
-              absentSessions,
-              lateCount,
-              attendancePercentage: percentage,
-              status,
-            };
-          })
-        );
+          return {
+            ...course,
+            attendancePercentage: percentage,
+            status,
+          };
+        });
 
         setCoursesWithAttendance(coursesWithStats);
-
-        // Calculate overall stats
-        const totalSessions = coursesWithStats.reduce(
-          (sum, c) => sum + c.totalSessions,
-          0
-        );
-        const attended = coursesWithStats.reduce(
-          (sum, c) => sum + c.attendedSessions,
-          0
-        );
+        setRecentSessions(overview.recentSessions);
         setOverallStats({
-          totalSessions,
-          attended,
-          percentage: totalSessions > 0 ? (attended / totalSessions) * 100 : 0,
+          totalSessions: overview.total,
+          attended: overview.attended,
+          percentage:
+            overview.total > 0 ? (overview.attended / overview.total) * 100 : 0,
         });
       } catch (err: any) {
         console.error("Error fetching attendance data:", err);
@@ -252,16 +206,17 @@ export default function StudentAttendancePage() {
       ) : (
         <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-3">
           {coursesWithAttendance.map((course) => (
-            <Card key={course.id} className="hover:shadow-lg transition-shadow">
+            <Card
+              key={course.courseId}
+              className="hover:shadow-lg transition-shadow"
+            >
               <CardHeader>
                 <div className="flex items-start justify-between">
                   <div className="space-y-1 flex-1">
                     <CardTitle className="text-lg">
-                      {course.course.courseName}
+                      {course.courseName}
                     </CardTitle>
-                    <CardDescription>
-                      {course.course.courseCode}
-                    </CardDescription>
+                    <CardDescription>{course.courseCode}</CardDescription>
                   </div>
                   <Badge
                     className={getStatusColor(course.status)}
@@ -274,18 +229,18 @@ export default function StudentAttendancePage() {
 
               <CardContent className="space-y-4">
                 {/* Teacher Info */}
-                {course.course.teacher?.user && (
+                {course.teacherName && (
                   <div className="flex items-center gap-2 text-sm text-muted-foreground">
                     <IconUser className="h-4 w-4" />
-                    <span>{course.course.teacher.user.name}</span>
+                    <span>{course.teacherName}</span>
                   </div>
                 )}
 
                 {/* Department Info */}
-                {course.course.department && (
+                {course.departmentName && (
                   <div className="flex items-center gap-2 text-sm text-muted-foreground">
                     <IconBook className="h-4 w-4" />
-                    <span>{course.course.department.name}</span>
+                    <span>{course.departmentName}</span>
                   </div>
                 )}
 
@@ -308,28 +263,22 @@ export default function StudentAttendancePage() {
                   <div className="flex items-center gap-2 text-sm">
                     <IconCheck className="h-4 w-4 text-green-600" />
                     <span className="text-muted-foreground">Present:</span>
-                    <span className="font-semibold">
-                      {course.attendedSessions}
-                    </span>
+                    <span className="font-semibold">{course.attended}</span>
                   </div>
                   <div className="flex items-center gap-2 text-sm">
                     <IconX className="h-4 w-4 text-red-600" />
                     <span className="text-muted-foreground">Absent:</span>
-                    <span className="font-semibold">
-                      {course.absentSessions}
-                    </span>
+                    <span className="font-semibold">{course.absent}</span>
                   </div>
                   <div className="flex items-center gap-2 text-sm">
                     <IconClock className="h-4 w-4 text-yellow-600" />
                     <span className="text-muted-foreground">Late:</span>
-                    <span className="font-semibold">{course.lateCount}</span>
+                    <span className="font-semibold">{course.late}</span>
                   </div>
                   <div className="flex items-center gap-2 text-sm">
                     <IconCalendar className="h-4 w-4 text-blue-600" />
                     <span className="text-muted-foreground">Total:</span>
-                    <span className="font-semibold">
-                      {course.totalSessions}
-                    </span>
+                    <span className="font-semibold">{course.total}</span>
                   </div>
                 </div>
 
@@ -349,6 +298,50 @@ export default function StudentAttendancePage() {
           ))}
         </div>
       )}
+
+      {/* Recent Sessions */}
+      {recentSessions.length > 0 && (
+        <Card>
+          <CardHeader>
+            <CardTitle className="flex items-center gap-2">
+              <IconClock className="h-5 w-5" />
+              Recent Sessions
+            </CardTitle>
+            <CardDescription>Your latest marked classes</CardDescription>
+          </CardHeader>
+          <CardContent className="space-y-2">
+            {recentSessions.map((session) => (
+              <div
+                key={session.attendanceId}
+                className="flex items-center justify-between border-b pb-2 last:border-b-0 last:pb-0 text-sm"
+              >
+                <div>
+                  <span className="font-medium">{session.courseCode}</span>
+                  <span className="text-muted-foreground">
+                    {" "}
+                    · {new Date(session.date).toLocaleDateString()} ·{" "}
+                    {session.startTime}
+                  </span>
+                  {session.topic && (
+                    <p className="text-xs text-muted-foreground">
+                      {session.topic}
+                    </p>
+                  )}
+                </div>
+                <Badge
+                  variant={
+                    session.status === "PRESENT" || session.status === "LATE"
+                      ? "default"
+                      : "destructive"
+                  }
+                >
+                  {session.status}
+                </Badge>
+              </div>
+            ))}
+          </CardContent>
+        </Card>
+      )}
     </div>
   );
 }
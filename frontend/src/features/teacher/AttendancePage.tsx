@@ -162,6 +162,31 @@ export default function TeacherAttendancePage() {
     fetchStudents();
   }, [selectedCourse]);
 
+  // Attendance history: one row per session that has marked attendance
+  const loadAttendanceHistory = async () => {
+    const courseSessions = await attendanceService.getTeacherSessions(teacherId);
+    return courseSessions
+      .flatMap((course) =>
+        course.sessions
+          .filter((session) => session.total > 0)
+          .map((session) => ({
+            sessionId: session.id,
+            date: session.date,
+            courseId: course.courseId,
+            courseName: course.courseName,
+            present: session.present,
+            absent: session.absent,
+            late: session.late,
+            total: session.total,
+            percentage: (
+              ((session.present + session.late) / session.total) *
+              100
+            ).toFixed(1),
+          })),
+      )
+      .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime());
+  };
+
   // Fetch attendance history for teacher's courses
   useEffect(() => {
     const fetchAttendanceHistory = async () => {
@@ -169,63 +194,7 @@ export default function TeacherAttendancePage() {
 
       try {
         setHistoryLoading(true);
-
-        // Get all class sessions for teacher's courses
-        const sessionsPromises = courses.map(async (course) => {
-          const sessions = await attendanceService.getCourseAttendance(
-            course.id,
-          );
-          return sessions;
-        });
-
-        const allSessions = (await Promise.all(sessionsPromises)).flat();
-
-        // Group sessions by date and calculate statistics
-        const sessionMap = new Map();
-
-        allSessions.forEach((record: any) => {
-          const sessionDate = new Date(record.session?.date || record.markedAt)
-            .toISOString()
-            .split("T")[0];
-          const courseId = record.courseId;
-          const key = `${sessionDate}-${courseId}`;
-
-          if (!sessionMap.has(key)) {
-            sessionMap.set(key, {
-              date: sessionDate,
-              courseId: courseId,
-              courseName: record.course?.courseName || "Unknown",
-              present: 0,
-              absent: 0,
-              late: 0,
-              total: 0,
-            });
-          }
-
-          const stats = sessionMap.get(key);
-          stats.total++;
-
-          if (record.status === "PRESENT") stats.present++;
-          else if (record.status === "ABSENT") stats.absent++;
-          else if (record.status === "LATE") stats.late++;
-        });
-
-        // Convert to array and sort by date descending
-        const historyData = Array.from(sessionMap.values())
-          .map((stats) => ({
-            ...stats,
-            percentage:
-              stats.total > 0
-                ? (((stats.present + stats.late) / stats.total) * 100).toFixed(
-                    1,
-                  )
-                : "0",
-          }))
-          .sort(
-            (a, b) => new Date(b.date).getTime() - new Date(a.date).getTime(),
-          );
-
-        setAttendanceHistory(historyData);
+        setAttendanceHistory(await loadAttendanceHistory());
       } catch (err) {
         console.error("Failed to fetch attendance history:", err);
       } finally {
@@ -283,7 +252,7 @@ export default function TeacherAttendancePage() {
       const startTime = `${todayDateString}T${todaysSchedule.startTime}`;
       const endTime = `${todayDateString}T${todaysSchedule.endTime}`;
 
-      // Step 5: Create class session based on the schedule
+      // Step 5: Get (or create) today's class session for this schedule slot
       const selectedCourseData = courses.find((c) => c.id === selectedCourse);
       const sessionData = {
         courseId: selectedCourse,
@@ -297,7 +266,8 @@ export default function TeacherAttendancePage() {
         topic: selectedCourseData?.courseName || "Class Session",
       };
 
-      const session = await attendanceService.createClassSession(sessionData);
+      const session =
+        await attendanceService.findOrCreateClassSession(sessionData);
 
       // Step 6: Prepare bulk attendance data
       const attendanceList = students.map((student) => ({
@@ -308,14 +278,16 @@ export default function TeacherAttendancePage() {
           | "ABSENT",
       }));
 
-      // Step 7: Mark bulk attendance
-      await attendanceService.markBulkAttendance(attendanceList);
+      // Step 7: Mark bulk attendance (upsert, so re-saving overwrites)
+      const result = await attendanceService.markBulkAttendance(attendanceList);
 
       const presentCount = Object.values(attendance).filter(Boolean).length;
       toast.success(`Attendance saved successfully`, {
         description: `${presentCount} present, ${
           students.length - presentCount
-        } absent out of ${students.length} students`,
+        } absent out of ${students.length} students (${result.created} new, ${
+          result.updated
+        } updated)`,
       });
 
       // Reset selection
@@ -324,53 +296,7 @@ export default function TeacherAttendancePage() {
       setAttendance({});
 
       // Refresh attendance history after saving
-      if (courses.length > 0) {
-        const sessionsPromises = courses.map(async (course) => {
-          const sessions = await attendanceService.getCourseAttendance(
-            course.id,
-          );
-          return sessions;
-        });
-        const allSessions = (await Promise.all(sessionsPromises)).flat();
-        const sessionMap = new Map();
-        allSessions.forEach((record: any) => {
-          const sessionDate = new Date(record.session?.date || record.markedAt)
-            .toISOString()
-            .split("T")[0];
-          const courseId = record.courseId;
-          const key = `${sessionDate}-${courseId}`;
-          if (!sessionMap.has(key)) {
-            sessionMap.set(key, {
-              date: sessionDate,
-              courseId: courseId,
-              courseName: record.course?.courseName || "Unknown",
-              present: 0,
-              absent: 0,
-              late: 0,
-              total: 0,
-            });
-          }
-          const stats = sessionMap.get(key);
-          stats.total++;
-          if (record.status === "PRESENT") stats.present++;
-          else if (record.status === "ABSENT") stats.absent++;
-          else if (record.status === "LATE") stats.late++;
-        });
-        const historyData = Array.from(sessionMap.values())
-          .map((stats) => ({
-            ...stats,
-            percentage:
-              stats.total > 0
-                ? (((stats.present + stats.late) / stats.total) * 100).toFixed(
-                    1,
-                  )
-                : "0",
-          }))
-          .sort(
-            (a, b) => new Date(b.date).getTime() - new Date(a.date).getTime(),
-          );
-        setAttendanceHistory(historyData);
-      }
+      setAttendanceHistory(await loadAttendanceHistory());
     } catch (err: any) {
       console.error("Failed to save attendance:", err);
       toast.error("Failed to save attendance", {
@@ -393,24 +319,20 @@ export default function TeacherAttendancePage() {
     setDetailsLoading(true);
 
     try {
-      // Fetch detailed attendance for the specific course and date
+      // Fetch detailed attendance for the session's course
       const courseAttendance = await attendanceService.getCourseAttendance(
         record.courseId,
       );
 
-      // Filter records for the specific date
-      const recordDate = new Date(record.date).toISOString().split("T")[0];
-      const detailedRecords = courseAttendance.filter((att: any) => {
-        const attDate = new Date(att.session?.date || att.markedAt)
-          .toISOString()
-          .split("T")[0];
-        return attDate === recordDate;
-      });
+      // Keep the records of the selected session
+      const detailedRecords = courseAttendance.filter(
+        (att: any) => att.sessionId === record.sessionId,
+      );
 
       // Format the data for display
       const formattedDetails = detailedRecords.map((att: any) => ({
-        studentId: att.student?.studentId || "N/A",
-        studentName: att.student?.user?.name || "Unknown",
+        studentId: att.studentIdNumber || "N/A",
+        studentName: att.studentName || "Unknown",
         status: att.status,
         markedAt: att.markedAt,
       }));
@@ -576,8 +498,8 @@ export default function TeacherAttendancePage() {
                   </TableRow>
                 </TableHeader>
                 <TableBody>
-                  {attendanceHistory.map((record, index) => (
-                    <TableRow key={index}>
+                  {attendanceHistory.map((record) => (
+                    <TableRow key={record.sessionId}>
                       <TableCell className="font-medium">
                         <div className="flex items-center gap-2">
                           <IconCalendar className="h-4 w-4 text-muted-foreground" />
@@ -36,6 +36,27 @@ export interface TeacherCourseAttendance {
   averageAttendancePercentage: number;
 }
 
+export interface TeacherTrendPoint {
+  periodStart: string;
+  scheduled: number;
+  conducted: number;
+  missed: number;
+}
+
+export interface TeacherAttendanceTrends {
+  period: "week" | "month";
+  from: string;
+  to: string;
+  totals: TeacherTrendPoint[];
+  teachers: {
+    teacherId: string;
+    teacherName: string;
+    teacherIdNumber: string;
+    department: string;
+    points: TeacherTrendPoint[];
+  }[];
+}
+
 export interface ClassSessionCreate {
   courseId: string;
   scheduleId?: string;
@@ -56,6 +77,13 @@ export interface StudentAttendanceInput {
   remarks?: string;
 }
 
+export interface BulkAttendanceResult {
+  created: number;
+  updated: number;
+  unchanged: number;
+  records: any[];
+}
+
 export interface ClassSession {
   id: string;
   courseId: string;
@@ -70,6 +98,29 @@ export interface ClassSession {
   notes?: string;
 }
 
+export interface TeacherSessionSummary {
+  id: string;
+  date: string;
+  startTime: string;
+  endTime: string;
+  room?: string;
+  topic?: string;
+  status: ClassSession["status"];
+  total: number;
+  present: number;
+  late: number;
+  excused: number;
+  absent: number;
+  medicalLeave: number;
+}
+
+export interface TeacherCourseSessions {
+  courseId: string;
+  courseCode: string;
+  courseName: string;
+  sessions: TeacherSessionSummary[];
+}
+
 export interface Schedule {
   id: string;
   courseId: string;
@@ -104,6 +155,16 @@ export const useAttendanceService = () => {
       return api.get("/attendance/statistics/teachers");
     },
 
+    // Conducted vs missed sessions per teacher, by week or month
+    getTeacherAttendanceTrends: async (
+      period: "week" | "month" = "week",
+      periods = 12
+    ): Promise<TeacherAttendanceTrends> => {
+      return api.get(
+        `/attendance/statistics/teachers/trends?period=${period}&periods=${periods}`
+      );
+    },
+
     // Get attendance stats for a specific teacher
     getTeacherAttendance: async (
       teacherId: string
@@ -111,6 +172,21 @@ export const useAttendanceService = () => {
       return api.get(`/attendance/teacher/${teacherId}`);
     },
 
+    // Sessions of all of a teacher's courses with attendance counts, grouped by course
+    getTeacherSessions: async (
+      teacherId: string,
+      filters: { dateFrom?: string; dateTo?: string; status?: string } = {}
+    ): Promise<TeacherCourseSessions[]> => {
+      const params = new URLSearchParams();
+      if (filters.dateFrom) params.set("date_from", filters.dateFrom);
+      if (filters.dateTo) params.set("date_to", filters.dateTo);
+      if (filters.status) params.set("status", filters.status);
+      const query = params.toString();
+      return api.get(
+        `/attendance/sessions/teacher/${teacherId}${query ? `?${query}` : ""}`
+      );
+    },
+
     // Get detailed attendance records for a specific course
     getCourseAttendance: async (courseId: string) => {
       return api.get(`/attendance/course/${courseId}`);
@@ -128,11 +204,18 @@ export const useAttendanceService = () => {
       return api.post("/attendance/sessions", session);
     },
 
-    // Mark bulk attendance for multiple students
+    // Get the session for that course, day and start time, creating it if needed
+    findOrCreateClassSession: async (
+      session: ClassSessionCreate
+    ): Promise<ClassSession> => {
+      return api.put("/attendance/sessions", session);
+    },
+
+    // Mark or overwrite attendance for multiple students (safe to re-submit)
     markBulkAttendance: async (
       attendanceList: StudentAttendanceInput[]
-    ): Promise<any[]> => {
-      return api.post("/attendance/bulk", attendanceList);
+    ): Promise<BulkAttendanceResult> => {
+      return api.put("/attendance/bulk", attendanceList);
     },
   };
 };
@@ -11,6 +11,15 @@ export interface AttendanceRecord {
   markedAt: string;
   markedById: string;
   updatedAt: string;
+  // Flat fields of the default compact view
+  studentIdNumber?: string;
+  studentName?: string;
+  courseCode?: string;
+  courseName?: string;
+  sessionDate?: string;
+  startTime?: string;
+  endTime?: string;
+  // Nested objects, only with fields=full
   student?: any;
   course?: any;
   markedBy?: any;
@@ -69,6 +78,44 @@ export interface StudentAttendanceDetails {
   overallAttendancePercentage: number;
 }
 
+export interface StudentCourseCounters {
+  courseId: string;
+  courseCode: string;
+  courseName: string;
+  credits: number;
+  semester: number;
+  teacherName?: string;
+  departmentName?: string;
+  total: number;
+  present: number;
+  late: number;
+  excused: number;
+  absent: number;
+  medicalLeave: number;
+  attended: number;
+  attendancePercentage: number;
+}
+
+export interface RecentSession {
+  attendanceId: string;
+  courseId: string;
+  courseCode: string;
+  date: string;
+  startTime: string;
+  endTime: string;
+  topic?: string;
+  status: AttendanceRecord["status"] | "MEDICAL_LEAVE";
+}
+
+export interface StudentAttendanceOverview {
+  studentId: string;
+  total: number;
+  attended: number;
+  attendancePercentage: number;
+  courses: StudentCourseCounters[];
+  recentSessions: RecentSession[];
+}
+
 export interface AttendanceStatistics {
   totalCourses: number;
   totalSessions: number;
@@ -101,6 +148,20 @@ export const useStudentAttendanceService = () => {
       return apiClient.get(url);
     },
 
+    /**
+     * Per-course counters and latest sessions in one request
+     * ("me" = the signed-in student). The server sends an ETag, so repeat
+     * loads are revalidated with a 304 instead of a full payload.
+     */
+    getAttendanceOverview: async (
+      studentId = "me",
+      recent = 10
+    ): Promise<StudentAttendanceOverview> => {
+      return apiClient.get(
+        `/attendance/student/${studentId}/summary?recent=${recent}`
+      );
+    },
+
     /**
      * Get attendance summary for all enrolled courses
      */
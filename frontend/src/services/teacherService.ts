@@ -41,8 +41,10 @@ export const useTeacherService = () => {
   const apiClient = useApiClient();
 
   return {
-    getAll: async (skip = 0, limit = 100): Promise<Teacher[]> =>
-      apiClient.get(`/teachers?skip=${skip}&limit=${limit}`),
+    getAll: async (skip = 0, limit?: number): Promise<Teacher[]> =>
+      apiClient.get(
+        `/teachers?skip=${skip}${limit ? `&limit=${limit}` : ""}`
+      ),
 
     getById: async (id: string): Promise<Teacher> =>
       apiClient.get(`/teachers/${id}`),